@@ -14,10 +14,13 @@ import logging
 # Ajouter le path pour importer le toolkit
 sys.path.insert(0, '/opt/airflow/my_ml_toolkit')
 
-from data_loader.binary import BinaryLoader
-from feature_extraction.binary_features import BinaryFeatureExtractor
-from preprocessing.numeric_prep import NumericPreprocessor
-from modeling.auto_trainer import AutoTrainer
+from my_ml_toolkit.data_loader.binary import BinaryLoader
+from my_ml_toolkit.data_loader.corpus import CorpusManifest, CorpusScanner
+from my_ml_toolkit.data_loader.tabular import TabularLoader
+from my_ml_toolkit.feature_extraction.binary_features import BinaryFeatureExtractor
+from my_ml_toolkit.feature_extraction.feature_cache import FeatureCache
+from my_ml_toolkit.preprocessing.numeric_prep import NumericPreprocessor
+from my_ml_toolkit.modeling.auto_trainer import AutoTrainer
 import pandas as pd
 import pickle
 import json
@@ -27,6 +30,11 @@ DATA_DIR = '/opt/airflow/data'
 MODELS_DIR = '/opt/airflow/models'
 MALWARE_DIR = f'{DATA_DIR}/malware_samples'
 BENIGN_DIR = f'{DATA_DIR}/benign_samples'
+# Manifeste du corpus et cache de features conservés d'une exécution à l'autre
+MANIFEST_PATH = f'{DATA_DIR}/corpus_manifest.sqlite'
+FEATURE_CACHE_PATH = f'{DATA_DIR}/feature_cache.sqlite'
+# Colonnes d'identification, jamais utilisées comme features
+ID_COLUMNS = ('md5', 'sha256', 'fast_hash', 'filename')
 
 default_args = {
     'owner': 'tatiana',
@@ -102,33 +110,30 @@ def extract_features(**context):
     """Extraire les features de tous les fichiers"""
     logging.info("🔍 Extraction des features...")
     
-    loader = BinaryLoader()
-    extractor = BinaryFeatureExtractor()
-    
-    all_features = []
-    
-    # Charger et extraire features des malwares
-    logging.info("   Traitement des malwares...")
-    malware_files = loader.load_directory(MALWARE_DIR)
-    for filename, data in malware_files:
-        features = extractor.extract_all_features(data)
-        features['label'] = 1  # Malware
-        features['filename'] = filename
-        all_features.append(features)
-    
-    # Charger et extraire features des fichiers légitimes
-    logging.info("   Traitement des fichiers légitimes...")
-    benign_files = loader.load_directory(BENIGN_DIR)
-    for filename, data in benign_files:
-        features = extractor.extract_all_features(data)
-        features['label'] = 0  # Légitime
-        features['filename'] = filename
-        all_features.append(features)
-    
-    # Sauvegarder les features
-    df = pd.DataFrame(all_features)
-    features_path = f'{DATA_DIR}/features.csv'
-    df.to_csv(features_path, index=False)
+    cache = FeatureCache(FEATURE_CACHE_PATH)
+    manifest = CorpusManifest(MANIFEST_PATH)
+    extractor = BinaryFeatureExtractor(cache=cache, include_pe_sections=True)
+    scanner = CorpusScanner(manifest, loader=BinaryLoader())
+    
+    def log_error(filepath, error):
+        logging.warning(f"   Fichier ignoré {filepath}: {error}")
+    
+    # Fichiers inchangés reconnus par le manifeste (sans lecture) ; chaque contenu
+    # distinct est extrait une fois, en parallèle, puis reporté sur tous ses chemins
+    entries = scanner.scan([
+        (1, MALWARE_DIR),   # Malware
+        (0, BENIGN_DIR),    # Légitime
+    ], on_error=log_error)
+    df = scanner.extract_frame(extractor, entries, n_jobs=-1, on_error=log_error,
+                               identifiers='binary')
+    logging.info(f"   Corpus: {scanner.stats}")
+    
+    manifest.close()
+    cache.close()
+    
+    # Sauvegarder les features (Parquet : dtypes compacts conservés, lecture par colonnes)
+    features_path = f'{DATA_DIR}/features.parquet'
+    TabularLoader().save_parquet(df, features_path)
     
     logging.info(f"✅ Features extraites: {len(df)} fichiers, {df.shape[1]} features")
     
@@ -143,16 +148,20 @@ def train_model(**context):
     # Récupérer le chemin des features
     features_path = context['ti'].xcom_pull(task_ids='extract_features', key='features_path')
     
-    # Charger les features
-    df = pd.read_csv(features_path)
+    # Charger les features sans les colonnes d'identification (projection)
+    loader = TabularLoader()
+    columns = [c for c in loader.columns(features_path) if c not in ID_COLUMNS]
+    df = loader.load(features_path, columns=columns)
     
     # Préparer les données
-    X = df.drop(columns=['label', 'md5', 'sha256', 'filename'], errors='ignore')
+    X = df.drop(columns=['label'])
     y = df['label']
     
     # Prétraiter
     preprocessor = NumericPreprocessor(scaling_method='standard')
-    X_processed = preprocessor.scale_features(X)
+    X_processed, _ = preprocessor.preprocess_full(X, handle_missing=False, encode_cat=False)
+    # État figé pour le service : colonnes et statistiques réutilisées sans recalcul
+    preprocessing = preprocessor.freeze(X.columns, handle_missing=False, encode_cat=False)
     
     # Entraîner
     trainer = AutoTrainer(task_type='classification', random_state=42)
@@ -172,9 +181,10 @@ def train_model(**context):
     # Sauvegarder le modèle
     model_path = f'{MODELS_DIR}/malware_detector.pkl'
     with open(model_path, 'wb') as f:
-        pickle.dump(  # nosec B301{
+        pickle.dump({  # nosec B301
             'model': best_model,
             'preprocessor': preprocessor,
+            'preprocessing': preprocessing,
             'feature_columns': list(X.columns),
             'info': model_info
         }, f)
@@ -6,17 +6,49 @@ import bentoml
 from bentoml.io import File, JSON
 import numpy as np
 import pickle
+import sqlite3
 import sys
 import os
+import tempfile
 
 # Ajouter le path
 sys.path.insert(0, '/app/my_ml_toolkit')
 
-from feature_extraction.binary_features import BinaryFeatureExtractor
+from my_ml_toolkit.feature_extraction.binary_features import BinaryFeatureExtractor
+from my_ml_toolkit.feature_extraction.feature_cache import FeatureCache
 
 # Charger le modèle
 MODEL_PATH = os.getenv('MODEL_PATH', '/app/models/malware_detector.pkl')
 
+# Cache de features par SHA-256 (désactivé si la variable est vide) ; repli dans
+# le répertoire temporaire si l'emplacement n'est pas accessible en écriture
+FEATURE_CACHE_PATH = os.getenv('FEATURE_CACHE_PATH', '/app/models/feature_cache.sqlite')
+FEATURE_CACHE_FALLBACK_PATH = os.path.join(tempfile.gettempdir(), 'feature_cache.sqlite')
+FEATURE_CACHE_MAX_ENTRIES = int(os.getenv('FEATURE_CACHE_MAX_ENTRIES', '100000'))
+
+
+def open_feature_cache(config_key: str):
+    """
+    Ouvre le cache de features au premier emplacement accessible en écriture
+    
+    Returns:
+        FeatureCache lié à config_key, ou None (cache désactivé ou aucun
+        emplacement utilisable : le service fonctionne sans cache)
+    """
+    if not FEATURE_CACHE_PATH:
+        return None
+    for path in dict.fromkeys((FEATURE_CACHE_PATH, FEATURE_CACHE_FALLBACK_PATH)):
+        cache = FeatureCache(path, max_entries=FEATURE_CACHE_MAX_ENTRIES)
+        try:
+            # bind écrit dans la base : échoue si l'emplacement est en lecture seule
+            cache.bind(config_key)
+            return cache
+        except (sqlite3.Error, OSError) as e:
+            print(f"Cache de features indisponible ({path}): {e}")
+            cache.close()
+    return None
+
+
 class MalwareDetectorRunnable(bentoml.Runnable):
     """Runnable personnalisé pour la détection de malwares"""
     
@@ -26,13 +58,16 @@ class MalwareDetectorRunnable(bentoml.Runnable):
     def __init__(self):
         # Charger le modèle et les métadonnées
         with open(MODEL_PATH, 'rb') as f:
-            data = pickle.load(  # nosec B301f)
+            data = pickle.load(f)  # nosec B301
             self.model = data['model']
             self.preprocessor = data['preprocessor']
             self.feature_columns = data['feature_columns']
+            # Prétraitement figé (absent des modèles sauvegardés avant son ajout)
+            self.preprocessing = data.get('preprocessing')
             self.info = data['info']
         
-        self.extractor = BinaryFeatureExtractor()
+        self.extractor = BinaryFeatureExtractor(include_pe_sections=True)
+        self.extractor.cache = open_feature_cache(self.extractor.config_key)
     
     @bentoml.Runnable.method(batchable=False)
     def predict(self, file_data: bytes) -> dict:
@@ -45,11 +80,11 @@ class MalwareDetectorRunnable(bentoml.Runnable):
         import pandas as pd
         df = pd.DataFrame([features])
         
-        # Garder seulement les colonnes utilisées pour l'entraînement
-        X = df[self.feature_columns]
-        
-        # Prétraiter
-        X_processed = self.preprocessor.scaler.transform(X)
+        # Prétraiter : colonnes et statistiques figées à l'entraînement
+        if self.preprocessing is not None:
+            X_processed = self.preprocessing.transform(df)
+        else:
+            X_processed = self.preprocessor.scaler.transform(df[self.feature_columns])
         
         # Prédire
         prediction = self.model.predict(X_processed)[0]
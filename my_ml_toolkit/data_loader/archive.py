@@ -0,0 +1,177 @@
+"""
+Lecture des membres d'archives zip / tar sans extraction sur disque
+Chaque membre est lu par morceaux (mémoire bornée) et les bytes réellement
+décompressés sont comptés pour arrêter les bombes de décompression
+"""
+
+import tarfile
+import zipfile
+from typing import Callable, Iterator, NamedTuple, Tuple
+
+
+# Extensions reconnues par is_archive (le format est ensuite détecté sur le contenu)
+ARCHIVE_EXTENSIONS = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+
+# En dessous de ce volume décompressé le taux de compression n'est pas vérifié
+# (quelques Ko de zéros se compressent légitimement très fort)
+RATIO_CHECK_MIN_BYTES = 1 << 20
+
+
+class ArchiveLimitError(ValueError):
+    """Membre ou archive qui dépasse les limites de décompression"""
+
+
+class ArchiveLimits(NamedTuple):
+    """
+    Limites appliquées aux bytes réellement décompressés
+
+    Les tailles déclarées dans les en-têtes ne sont pas fiables : seules
+    les données lues sont comptées.
+    """
+    max_member_size: int = 256 << 20      # bytes décompressés par membre
+    max_total_size: int = 4 << 30         # bytes décompressés par archive
+    max_ratio: float = 200.0              # décompressé / compressé
+    max_members: int = 100_000            # fichiers par archive
+
+
+class ArchiveMember(NamedTuple):
+    """Fichier contenu dans une archive"""
+    archive: str
+    name: str
+    size: int       # taille déclarée par l'archive
+
+    @property
+    def path(self) -> str:
+        """Chemin d'affichage '<archive>/<membre>' (convention zipimport)"""
+        return f"{self.archive}/{self.name}"
+
+
+def is_archive(path: str) -> bool:
+    """True si l'extension du fichier est celle d'une archive zip / tar"""
+    return path.lower().endswith(ARCHIVE_EXTENSIONS)
+
+
+class ArchiveReader:
+    """
+    Parcourt les fichiers d'une archive zip ou tar(.gz/.bz2/.xz)
+
+    Les archives tar sont lues en flux ('r|*') : aucun retour en arrière,
+    le fichier compressé n'est parcouru qu'une fois. Chaque membre est
+    produit avec un itérateur de morceaux qui doit être consommé (ou
+    abandonné) avant de passer au membre suivant.
+
+    Un membre trop gros est signalé par ArchiveLimitError pendant sa lecture
+    et le parcours continue ; le dépassement d'une limite d'archive (volume
+    total, taux de compression du flux tar, nombre de membres) arrête le
+    parcours.
+    """
+
+    def __init__(self, path: str, limits: ArchiveLimits = None, chunk_size: int = 1 << 20,
+                 max_bytes: int = None, matches: Callable[[str], bool] = None):
+        """
+        Args:
+            path: Chemin de l'archive
+            limits: Limites de décompression (None = ArchiveLimits())
+            chunk_size: Taille des morceaux lus
+            max_bytes: Nombre maximum de bytes lus par membre (troncature, pas une erreur)
+            matches: Filtre sur le nom de base des membres (None = tous)
+        """
+        self.path = path
+        self.limits = limits or ArchiveLimits()
+        self.chunk_size = chunk_size
+        self.max_bytes = max_bytes
+        self.matches = matches
+
+        self.total_size = 0
+        self.num_members = 0
+        self._aborted = False
+
+    def __iter__(self) -> Iterator[Tuple[ArchiveMember, Iterator[bytes]]]:
+        """
+        Yields:
+            (ArchiveMember, itérateur des morceaux du membre)
+
+        Raises:
+            zipfile.BadZipFile / tarfile.ReadError: Si le fichier n'est pas une archive lisible
+            ArchiveLimitError: Si l'archive contient trop de membres
+        """
+        if zipfile.is_zipfile(self.path):
+            return self._iter_zip()
+        return self._iter_tar()
+
+    def _iter_zip(self):
+        with zipfile.ZipFile(self.path) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not self._selected(info.filename):
+                    continue
+                member = ArchiveMember(self.path, info.filename, info.file_size)
+                # Taux de compression propre au membre
+                compression = (lambda read, info=info: (read, info.compress_size))
+                with archive.open(info) as stream:
+                    yield member, self._read(stream, member, compression, archive_level=False)
+                if self._aborted:
+                    return
+
+    def _iter_tar(self):
+        with open(self.path, 'rb') as raw, tarfile.open(fileobj=raw, mode='r|*') as archive:
+            # Flux compressé unique : taux mesuré sur toute l'archive
+            compression = (lambda read: (self.total_size, raw.tell()))
+            for info in archive:
+                # Liens, répertoires et fichiers spéciaux ignorés
+                if not info.isfile() or not self._selected(info.name):
+                    continue
+                member = ArchiveMember(self.path, info.name, info.size)
+                stream = archive.extractfile(info)
+                yield member, self._read(stream, member, compression, archive_level=True)
+                if self._aborted:
+                    return
+
+    def _selected(self, name: str) -> bool:
+        """Compte le membre (filtré ou non) et applique le filtre de noms"""
+        self.num_members += 1
+        if self.num_members > self.limits.max_members:
+            raise ArchiveLimitError(
+                f"{self.path}: plus de {self.limits.max_members} membres"
+            )
+        return self.matches is None or self.matches(name.rsplit('/', 1)[-1])
+
+    def _read(self, stream, member: ArchiveMember,
+              compression: Callable[[int], Tuple[int, int]], archive_level: bool
+              ) -> Iterator[bytes]:
+        """Morceaux d'un membre, limites vérifiées après chaque lecture"""
+        limits = self.limits
+        read = 0
+        while True:
+            size = self.chunk_size
+            if self.max_bytes:
+                size = min(size, self.max_bytes - read)
+                if size <= 0:
+                    break
+            chunk = stream.read(size)
+            if not chunk:
+                break
+
+            read += len(chunk)
+            self.total_size += len(chunk)
+
+            if self.total_size > limits.max_total_size:
+                self._aborted = True
+                raise ArchiveLimitError(
+                    f"{self.path}: plus de {limits.max_total_size} bytes décompressés"
+                )
+            if read > limits.max_member_size:
+                raise ArchiveLimitError(
+                    f"{member.path}: plus de {limits.max_member_size} bytes décompressés"
+                )
+            decompressed, compressed = compression(read)
+            if (decompressed > RATIO_CHECK_MIN_BYTES
+                    and decompressed > limits.max_ratio * max(compressed, 1)):
+                if archive_level:
+                    self._aborted = True
+                source = self.path if archive_level else member.path
+                raise ArchiveLimitError(
+                    f"{source}: taux de compression supérieur à {limits.max_ratio:g}"
+                )
+
+            yield chunk
+
@@ -3,36 +3,144 @@ Module pour charger des données binaires (fichiers exécutables, pcap, etc.)
 """
 
 import os
+import mmap as mmap_lib
 import numpy as np
 from pathlib import Path
-from typing import List, Union, Tuple
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Union, Tuple
+
+from .archive import ArchiveLimits, ArchiveMember, ArchiveReader
+
+
+class BinaryEntry(NamedTuple):
+    """Fichier repéré par iter_directory(read=False), lu plus tard"""
+    filename: str
+    path: str
+    size: int
+
+
+class MappedBinary:
+    """
+    Fichier binaire projeté en mémoire (lecture seule, sans copie)
+    
+    `buffer` est une memoryview utilisable directement par np.frombuffer,
+    hashlib et BinaryFeatureExtractor. Les pages restent dans le cache
+    système et sont partagées entre processus qui lisent le même fichier.
+    Le descripteur est toujours fermé par close() ; la projection ne l'est
+    qu'une fois détruits les arrays créés sur `buffer`.
+    """
+    
+    def __init__(self, filepath: str, max_bytes: int = None):
+        """
+        Args:
+            filepath: Chemin vers le fichier
+            max_bytes: Longueur maximale de la vue (None = fichier entier)
+        """
+        self.filepath = filepath
+        self._file = open(filepath, 'rb')
+        self._mmap = None
+        
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            length = min(size, max_bytes) if max_bytes else size
+            
+            if length == 0:
+                # mmap refuse les projections de longueur nulle
+                self.buffer = memoryview(b'')
+            else:
+                self._mmap = mmap_lib.mmap(self._file.fileno(), length, access=mmap_lib.ACCESS_READ)
+                self.buffer = memoryview(self._mmap)
+        except Exception:
+            self._file.close()
+            raise
+    
+    def __len__(self) -> int:
+        return len(self.buffer)
+    
+    def __enter__(self) -> 'MappedBinary':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def to_array(self) -> np.ndarray:
+        """Vue numpy uint8 sur la projection (sans copie)"""
+        return np.frombuffer(self.buffer, dtype=np.uint8)
+    
+    def close(self):
+        """
+        Libère la vue, la projection et le descripteur de fichier
+        
+        Si des arrays créés sur `buffer` sont encore vivants, la projection
+        ne peut pas être fermée : elle est libérée à la destruction du
+        dernier d'entre eux (aucune erreur n'est levée).
+        """
+        try:
+            self.buffer.release()
+            if self._mmap is not None:
+                self._mmap.close()
+        except BufferError:
+            # Projection encore exportée : les arrays en gardent seuls la référence
+            pass
+        finally:
+            self.buffer = memoryview(b'')
+            self._mmap = None
+            self._file.close()
 
 
 class BinaryLoader:
     """Charge des fichiers binaires pour analyse"""
     
-    def __init__(self, max_bytes: int = None):
+    def __init__(self, max_bytes: int = None, archive_limits: ArchiveLimits = None):
         """
         Args:
             max_bytes: Nombre maximum de bytes à lire (None = tout lire)
+            archive_limits: Limites de décompression des archives (None = ArchiveLimits())
         """
         self.max_bytes = max_bytes
+        self.archive_limits = archive_limits or ArchiveLimits()
         
-    def load_file(self, filepath: str) -> bytes:
+    def load_file(self, filepath: str, mmap: bool = False) -> Union[bytes, MappedBinary]:
         """
         Charge un fichier binaire
         
         Args:
             filepath: Chemin vers le fichier
+            mmap: Si True, projette le fichier en mémoire au lieu de le copier
             
         Returns:
-            Contenu binaire du fichier
+            Contenu binaire du fichier, ou MappedBinary si mmap=True
+            (à fermer après usage, idéalement via `with`)
         """
+        if mmap:
+            return MappedBinary(filepath, max_bytes=self.max_bytes)
+        
         with open(filepath, 'rb') as f:
             if self.max_bytes:
                 return f.read(self.max_bytes)
             return f.read()
     
+    def iter_chunks(self, filepath: str, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+        """
+        Lit un fichier par morceaux de taille fixe (mémoire bornée)
+        
+        Args:
+            filepath: Chemin vers le fichier
+            chunk_size: Taille des morceaux en bytes
+            
+        Yields:
+            Morceaux successifs du fichier (max_bytes respecté)
+        """
+        remaining = self.max_bytes or None
+        with open(filepath, 'rb') as f:
+            while remaining is None or remaining > 0:
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                chunk = f.read(size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+    
     def load_directory(self, dirpath: str, extensions: List[str] = None) -> List[Tuple[str, bytes]]:
         """
         Charge tous les fichiers binaires d'un répertoire
@@ -44,23 +152,146 @@ class BinaryLoader:
         Returns:
             Liste de tuples (nom_fichier, contenu_binaire)
         """
-        files_data = []
+        return list(self.iter_directory(dirpath, extensions=extensions))
+    
+    def iter_directory(self, dirpath: str, extensions: Iterable[str] = None, read: bool = True,
+                       on_error: Callable[[str, Exception], None] = None
+                       ) -> Iterator[Union[Tuple[str, bytes], BinaryEntry]]:
+        """
+        Parcourt un répertoire et produit les fichiers un par un
+        
+        Args:
+            dirpath: Chemin vers le répertoire
+            extensions: Extensions à conserver (ex: ['.exe', '.dll'])
+            read: Si True, produit (nom_fichier, contenu) ; sinon BinaryEntry
+                  (nom, chemin, taille) sans lire le fichier
+            on_error: Appelé avec (chemin, exception) pour chaque fichier illisible
+                      (None = message affiché, comme load_directory)
+            
+        Yields:
+            (nom_fichier, contenu_binaire) ou BinaryEntry
+        """
+        matches = self._extension_matcher(extensions)
         
         for root, dirs, files in os.walk(dirpath):
             for filename in files:
-                # Filtrer par extension si spécifié
-                if extensions:
-                    if not any(filename.lower().endswith(ext) for ext in extensions):
-                        continue
+                if matches is not None and not matches(filename):
+                    continue
                 
                 filepath = os.path.join(root, filename)
                 try:
-                    data = self.load_file(filepath)
-                    files_data.append((filename, data))
+                    if read:
+                        entry = (filename, self.load_file(filepath))
+                    else:
+                        entry = BinaryEntry(filename, filepath, os.path.getsize(filepath))
                 except Exception as e:
-                    print(f"Erreur lors du chargement de {filename}: {e}")
+                    if on_error is None:
+                        print(f"Erreur lors du chargement de {filename}: {e}")
+                    else:
+                        on_error(filepath, e)
+                    continue
+                
+                yield entry
+    
+    def open_archive(self, archive_path: str, extensions: Iterable[str] = None,
+                     chunk_size: int = 1 << 20) -> ArchiveReader:
+        """
+        Ouvre une archive zip / tar(.gz) pour en lire les membres en flux
+        
+        Args:
+            archive_path: Chemin de l'archive
+            extensions: Extensions des membres à conserver (ex: ['.exe', '.dll'])
+            chunk_size: Taille des morceaux lus
+            
+        Returns:
+            ArchiveReader produisant (ArchiveMember, itérateur de morceaux) ;
+            max_bytes et archive_limits s'appliquent à chaque membre
+        """
+        return ArchiveReader(archive_path, limits=self.archive_limits, chunk_size=chunk_size,
+                             max_bytes=self.max_bytes, matches=self._extension_matcher(extensions))
+    
+    def iter_archive(self, archive_path: str, extensions: Iterable[str] = None, read: bool = True,
+                     chunk_size: int = 1 << 20, on_error: Callable[[str, Exception], None] = None
+                     ) -> Iterator[Union[Tuple[str, bytes], Tuple[ArchiveMember, Iterator[bytes]]]]:
+        """
+        Parcourt les fichiers d'une archive sans l'extraire sur disque
+        
+        Args:
+            archive_path: Chemin de l'archive (.zip, .tar, .tar.gz, .tgz, ...)
+            extensions: Extensions des membres à conserver
+            read: Si True, produit (nom_membre, contenu) ; sinon (ArchiveMember,
+                  itérateur de morceaux) à consommer avant le membre suivant
+                  (ex: BinaryFeatureExtractor.extract_stream)
+            chunk_size: Taille des morceaux lus
+            on_error: Appelé avec (chemin, exception) pour chaque membre ou archive
+                      illisible (None = message affiché) ; en mode read=False les
+                      erreurs de lecture des membres remontent à l'appelant
+            
+        Yields:
+            (nom_membre, contenu_binaire) ou (ArchiveMember, morceaux)
+        """
+        reader = self.open_archive(archive_path, extensions=extensions, chunk_size=chunk_size)
+        members = iter(reader)
+        
+        while True:
+            try:
+                member, chunks = next(members)
+            except StopIteration:
+                return
+            except Exception as e:
+                # Archive illisible ou trop de membres : fin du parcours
+                self._report_error(archive_path, e, on_error)
+                return
+            
+            if not read:
+                yield member, chunks
+                continue
+            
+            try:
+                entry = (member.name, b''.join(chunks))
+            except Exception as e:
+                self._report_error(member.path, e, on_error)
+                continue
+            yield entry
+    
+    def load_archive(self, archive_path: str, extensions: List[str] = None) -> List[Tuple[str, bytes]]:
+        """
+        Charge tous les fichiers d'une archive (équivalent de load_directory)
+        
+        Returns:
+            Liste de tuples (nom_membre, contenu_binaire)
+        """
+        return list(self.iter_archive(archive_path, extensions=extensions))
+    
+    @staticmethod
+    def _report_error(path: str, error: Exception, on_error: Callable[[str, Exception], None] = None):
+        if on_error is None:
+            print(f"Erreur lors du chargement de {path}: {error}")
+        else:
+            on_error(path, error)
+    
+    @staticmethod
+    def _extension_matcher(extensions: Iterable[str] = None) -> Optional[Callable[[str], bool]]:
+        """
+        Prépare le filtre d'extensions une seule fois pour tout le parcours
+        
+        Les extensions simples ('.exe') sont testées par lookup dans un set ;
+        les autres ('.tar.gz', 'exe') gardent la sémantique endswith.
+        """
+        if not extensions:
+            return None
+        
+        lowered = [ext.lower() for ext in extensions]
+        simple = {ext for ext in lowered if ext.startswith('.') and ext.count('.') == 1}
+        compound = tuple(ext for ext in lowered if ext not in simple)
+        
+        def matches(filename: str) -> bool:
+            name = filename.lower()
+            if os.path.splitext(name)[1] in simple:
+                return True
+            return bool(compound) and name.endswith(compound)
         
-        return files_data
+        return matches
     
     def bytes_to_array(self, data: bytes) -> np.ndarray:
         """
@@ -0,0 +1,327 @@
+"""
+Parcours incrémental et dédoublonné d'un corpus d'échantillons
+Un manifeste (chemin, taille, mtime, inode, sha256) permet de reconnaître
+les fichiers inchangés sans les relire ; chaque contenu distinct n'est
+extrait qu'une fois, puis ses features sont reportées sur tous ses chemins
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import warnings
+from collections import defaultdict
+from typing import Callable, Iterable, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from ..feature_extraction.batch import collect_batch
+from ..feature_extraction.hashing import hash_file
+from .binary import BinaryLoader
+
+
+# Statut d'un fichier par rapport au manifeste
+STATUS_UNCHANGED = 'unchanged'   # même chemin, taille, mtime et inode
+STATUS_MOVED = 'moved'           # même inode, taille et mtime sous un autre chemin
+STATUS_NEW = 'new'               # absent du manifeste ou modifié
+
+
+class CorpusEntry(NamedTuple):
+    """Fichier du corpus et son empreinte (None tant que le contenu n'a pas été lu)"""
+    path: str
+    label: object
+    size: int
+    mtime_ns: int
+    inode: int
+    device: int
+    sha256: Optional[str]
+    status: str
+
+
+class CorpusManifest:
+    """
+    Manifeste SQLite des fichiers déjà vus : chemin -> (taille, mtime, inode, sha256)
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Fichier SQLite (créé si absent, ':memory:' pour un manifeste volatil)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def get(self, path: str) -> Optional[Tuple[int, int, int, int, str]]:
+        """(taille, mtime_ns, inode, device, sha256) enregistrés pour un chemin, ou None"""
+        with self._lock:
+            return self._connection().execute(
+                "SELECT size, mtime_ns, inode, device, sha256 FROM files WHERE path = ?", (path,)
+            ).fetchone()
+
+    def find_inode(self, device: int, inode: int, size: int, mtime_ns: int) -> Optional[str]:
+        """sha256 d'un fichier identique (même inode, taille, mtime) enregistré sous un autre chemin"""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT sha256 FROM files WHERE device = ? AND inode = ? AND size = ? AND mtime_ns = ?",
+                (device, inode, size, mtime_ns),
+            ).fetchone()
+        return row[0] if row else None
+
+    def update(self, entries: Iterable[CorpusEntry]):
+        """Enregistre les fichiers dont l'empreinte est connue"""
+        now = time.time()
+        rows = [
+            (e.path, e.size, e.mtime_ns, e.inode, e.device, e.sha256, now)
+            for e in entries if e.sha256 is not None
+        ]
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO files (path, size, mtime_ns, inode, device, sha256, scanned_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.commit()
+
+    def prune(self, keep: Iterable[str]) -> int:
+        """
+        Supprime les chemins absents de `keep` (fichiers disparus du corpus)
+
+        Returns:
+            Nombre d'entrées supprimées
+        """
+        with self._lock:
+            conn = self._connection()
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS keep (path TEXT PRIMARY KEY)")
+            conn.execute("DELETE FROM keep")
+            conn.executemany("INSERT OR IGNORE INTO keep (path) VALUES (?)", ((p,) for p in keep))
+            removed = conn.execute(
+                "DELETE FROM files WHERE path NOT IN (SELECT path FROM keep)"
+            ).rowcount
+            conn.execute("DELETE FROM keep")
+            conn.commit()
+        return removed
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def close(self):
+        """Ferme la connexion SQLite"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, "
+                "inode INTEGER NOT NULL, device INTEGER NOT NULL, sha256 TEXT NOT NULL, "
+                "scanned_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_files_inode ON files (device, inode)"
+            )
+            self._conn.commit()
+        return self._conn
+
+
+class CorpusScanner:
+    """
+    Parcourt des répertoires étiquetés et extrait chaque contenu distinct une seule fois
+
+    scan() ne lit que les métadonnées (stat) des fichiers connus du
+    manifeste. Les nouveaux fichiers ne sont hachés d'avance que si un autre
+    fichier du corpus a la même taille (doublon possible) ; les autres
+    obtiennent leur sha256 de l'extraction elle-même (une seule lecture).
+
+    extract_frame() consulte le cache de l'extracteur (FeatureCache) avec
+    les sha256 connus avant toute lecture : un fichier inchangé dont les
+    features sont en cache n'est pas relu. Le manifeste ne conserve pas les
+    features : sans cache, chaque contenu distinct est ré-extrait à chaque
+    appel (les doublons restent extraits une seule fois).
+    """
+
+    def __init__(self, manifest: CorpusManifest, loader: BinaryLoader = None):
+        """
+        Args:
+            manifest: Manifeste persistant entre deux parcours
+            loader: BinaryLoader utilisé pour lister les répertoires
+        """
+        self.manifest = manifest
+        self.loader = loader or BinaryLoader()
+        self.stats = {}
+
+    def scan(self, sources: Iterable[Tuple[object, str]], extensions: Iterable[str] = None,
+             on_error: Callable[[str, Exception], None] = None) -> List[CorpusEntry]:
+        """
+        Liste les fichiers des répertoires et les compare au manifeste
+
+        Args:
+            sources: Paires (étiquette, répertoire)
+            extensions: Extensions à conserver (ex: ['.exe', '.dll'])
+            on_error: Appelé avec (chemin, exception) pour chaque fichier illisible
+
+        Returns:
+            Une CorpusEntry par (fichier, étiquette), dans l'ordre du parcours
+        """
+        entries = []
+        for label, directory in sources:
+            for found in self.loader.iter_directory(directory, extensions=extensions, read=False,
+                                                    on_error=on_error):
+                try:
+                    entries.append(self._describe(found.path, label))
+                except OSError as e:
+                    _report(found.path, e, on_error)
+
+        # Doublons possibles seulement entre fichiers de même taille
+        sizes = defaultdict(int)
+        for entry in entries:
+            sizes[entry.size] += 1
+
+        hashed = 0
+        for index, entry in enumerate(entries):
+            if entry.sha256 is None and sizes[entry.size] > 1:
+                try:
+                    sha256 = hash_file(entry.path)['sha256']
+                except OSError as e:
+                    _report(entry.path, e, on_error)
+                    continue
+                entries[index] = entry._replace(sha256=sha256)
+                hashed += 1
+
+        self.stats = {
+            'files': len(entries),
+            'unchanged': sum(e.status == STATUS_UNCHANGED for e in entries),
+            'moved': sum(e.status == STATUS_MOVED for e in entries),
+            'new': sum(e.status == STATUS_NEW for e in entries),
+            'hashed': hashed,
+        }
+        return entries
+
+    def extract_frame(self, extractor, entries: List[CorpusEntry], n_jobs: int = 1,
+                      on_error: Callable[[str, str], None] = None, prune: bool = True,
+                      identifiers: str = 'hex') -> pd.DataFrame:
+        """
+        Features de tous les fichiers, chaque contenu distinct n'étant extrait qu'une fois
+
+        Seul le cache de l'extracteur (FeatureCache) évite de relire les
+        fichiers inchangés ; sans cache, un avertissement est émis dès que
+        des fichiers déjà vus vont être relus.
+
+        Args:
+            extractor: BinaryFeatureExtractor (son cache évite de relire
+                       les contenus déjà extraits)
+            entries: Résultat de scan()
+            n_jobs: Nombre de processus pour les contenus à extraire
+            on_error: Appelé avec (chemin, message) pour chaque fichier absent du
+                      résultat (illisible, ou extraction en échec) ; un fichier
+                      modifié depuis scan() est extrait avec son nouveau contenu
+            prune: Retirer du manifeste les chemins absents de `entries`
+            identifiers: Export des empreintes ('hex', 'binary' ou 'drop')
+
+        Returns:
+            DataFrame (une ligne par entrée extraite, colonnes 'filename' et 'label' en dernier)
+        """
+        features_by_sha = {}
+        cache = getattr(extractor, 'cache', None)
+        config_key = extractor.config_key if cache is not None else None
+        if cache is None and any(e.status != STATUS_NEW for e in entries):
+            warnings.warn(
+                "Extracteur sans FeatureCache : les fichiers inchangés depuis le dernier "
+                "parcours sont relus et ré-extraits",
+                RuntimeWarning, stacklevel=2,
+            )
+
+        # Un représentant par contenu connu ; les contenus inconnus sont tous lus
+        to_extract = []
+        pending = set()
+        for entry in entries:
+            if entry.sha256 is None:
+                to_extract.append(entry.path)
+            elif entry.sha256 not in features_by_sha and entry.sha256 not in pending:
+                cached = cache.get(entry.sha256, config_key) if cache is not None else None
+                if cached is not None:
+                    features_by_sha[entry.sha256] = cached
+                else:
+                    to_extract.append(entry.path)
+                    pending.add(entry.sha256)
+
+        cache_hits = len(features_by_sha)
+        sha_by_path = {}
+        reported = set()
+
+        def extraction_error(path, message):
+            reported.add(path)
+            _report(path, message, on_error)
+
+        def extract(paths):
+            for path, features in extractor.iter_batch(paths, n_jobs=n_jobs, on_error=extraction_error):
+                features_by_sha[features['sha256']] = features
+                sha_by_path[path] = features['sha256']
+
+        extract(to_extract)
+        # Représentant modifié depuis scan() : ses doublons sont extraits à leur tour
+        orphans = [
+            e.path for e in entries
+            if e.sha256 not in features_by_sha and e.path not in sha_by_path and e.path not in reported
+        ]
+        if orphans:
+            extract(orphans)
+
+        # Empreintes obtenues à l'extraction (le contenu lu fait foi s'il a changé
+        # depuis scan()), puis report sur tous les chemins
+        resolved = []
+        rows = []
+        for entry in entries:
+            if entry.path in sha_by_path:
+                entry = entry._replace(sha256=sha_by_path[entry.path])
+            resolved.append(entry)
+            if entry.path in reported:
+                continue
+            if entry.sha256 in features_by_sha:
+                rows.append(entry)
+            else:
+                _report(entry.path, "contenu modifié pendant l'extraction", on_error)
+
+        results = ((e.path, features_by_sha[e.sha256]) for e in rows)
+        frame = collect_batch(results, extractor.feature_schema(), capacity=len(rows)).to_frame(
+            identifiers=identifiers
+        )
+        frame['label'] = [e.label for e in rows]
+
+        self.manifest.update(resolved)
+        if prune:
+            self.manifest.prune(e.path for e in resolved)
+
+        self.stats.update({
+            'distinct_contents': len({e.sha256 for e in rows}),
+            'extracted': len(sha_by_path),
+            'cache_hits': cache_hits,
+            'rows': len(rows),
+        })
+        return frame
+
+    def _describe(self, path: str, label) -> CorpusEntry:
+        """Métadonnées d'un fichier et empreinte connue du manifeste (sans lecture)"""
+        st = os.stat(path)
+        key = (st.st_size, st.st_mtime_ns, st.st_ino, st.st_dev)
+
+        known = self.manifest.get(path)
+        if known is not None and tuple(known[:4]) == key:
+            sha256, status = known[4], STATUS_UNCHANGED
+        else:
+            sha256 = self.manifest.find_inode(st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+            status = STATUS_MOVED if sha256 is not None else STATUS_NEW
+
+        return CorpusEntry(path, label, st.st_size, st.st_mtime_ns, st.st_ino, st.st_dev, sha256, status)
+
+
+def _report(path: str, error, on_error):
+    if on_error is None:
+        print(f"Erreur lors du chargement de {path}: {error}")
+    else:
+        on_error(path, error)
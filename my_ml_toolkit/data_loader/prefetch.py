@@ -0,0 +1,289 @@
+"""
+Lecture anticipée de fichiers binaires sur un pool de threads
+Plusieurs lectures restent en cours pendant que l'appelant traite les
+fichiers déjà lus ; le volume de bytes lus et pas encore libérés est borné
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, Tuple, Union
+
+from .binary import BinaryEntry, BinaryLoader
+
+
+# Fin du flux de lectures (placé dans la file par le thread producteur)
+_DONE = object()
+
+
+class IngestionStats:
+    """
+    Compteurs de débit et de profondeur de file, mis à jour par tous les threads
+
+    Les valeurs courantes (in_flight : lectures en cours, queue_depth :
+    fichiers lus en attente, buffered_bytes : bytes réservés, extracting :
+    extractions en cours) sont accompagnées de leur maximum observé.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.files_read = 0
+        self.bytes_read = 0
+        self.read_errors = 0
+        self.read_seconds = 0.0
+        self.files_extracted = 0
+        self.extracting = 0
+        self.max_extracting = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.buffered_bytes = 0
+        self.max_buffered_bytes = 0
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def bytes_per_second(self) -> float:
+        elapsed = self.elapsed
+        return self.bytes_read / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        elapsed = self.elapsed
+        return self.files_read / elapsed if elapsed > 0 else 0.0
+
+    def add(self, **deltas):
+        """Incrémente des compteurs (et met à jour le maximum des jauges)"""
+        with self._lock:
+            for name, delta in deltas.items():
+                value = getattr(self, name) + delta
+                setattr(self, name, value)
+                peak = f'max_{name}'
+                if hasattr(self, peak) and value > getattr(self, peak):
+                    setattr(self, peak, value)
+
+    def snapshot(self) -> Dict:
+        """Copie des compteurs, débits compris"""
+        with self._lock:
+            values = {name: value for name, value in vars(self).items() if not name.startswith('_')}
+        values.pop('started')
+        values['elapsed'] = self.elapsed
+        values['bytes_per_second'] = self.bytes_per_second
+        values['files_per_second'] = self.files_per_second
+        return values
+
+
+class ByteBudget:
+    """
+    Nombre de bytes lus et pas encore libérés, borné par `capacity`
+
+    Un fichier plus gros que la capacité est accepté quand rien d'autre
+    n'est retenu (sinon il bloquerait indéfiniment).
+    """
+
+    def __init__(self, capacity: int, stats: IngestionStats = None):
+        self.capacity = capacity
+        self.stats = stats
+        self.used = 0
+        self.closed = False
+        self._condition = threading.Condition()
+
+    def acquire(self, size: int) -> bool:
+        """Réserve `size` bytes (bloquant) ; False si le budget a été fermé"""
+        with self._condition:
+            while not self.closed and self.used > 0 and self.used + size > self.capacity:
+                self._condition.wait()
+            if self.closed:
+                return False
+            self.used += size
+        if self.stats is not None:
+            self.stats.add(buffered_bytes=size)
+        return True
+
+    def release(self, size: int):
+        """Rend `size` bytes réservés par acquire()"""
+        with self._condition:
+            self.used -= size
+            self._condition.notify_all()
+        if self.stats is not None:
+            self.stats.add(buffered_bytes=-size)
+
+    def close(self):
+        """Débloque les acquire() en attente (arrêt anticipé)"""
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+
+class PrefetchReader:
+    """
+    Lectures de fichiers en avance sur un pool de threads (stockage réseau)
+
+    Un thread producteur réserve la taille de chaque fichier dans un
+    ByteBudget puis confie la lecture au pool ; les fichiers sont rendus dans
+    l'ordre des chemins. La réservation est rendue par la fonction `release`
+    produite avec chaque fichier, une fois les bytes traités.
+    """
+
+    def __init__(self, loader: BinaryLoader = None, max_in_flight: int = 8,
+                 max_buffered_bytes: int = 256 << 20):
+        """
+        Args:
+            loader: BinaryLoader utilisé pour les lectures (max_bytes respecté)
+            max_in_flight: Nombre de lectures simultanées (threads)
+            max_buffered_bytes: Bytes lus et pas encore libérés au maximum
+        """
+        self.loader = loader or BinaryLoader()
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_buffered_bytes = max_buffered_bytes
+        self.stats = IngestionStats()
+
+    def iter_files(self, items: Iterable[Union[str, BinaryEntry]],
+                   on_error: Callable[[str, Exception], None] = None) -> Iterator[Tuple[str, bytes]]:
+        """
+        Lit les fichiers en avance et les produit dans l'ordre
+
+        La réservation d'un fichier est rendue quand le suivant est demandé.
+
+        Args:
+            items: Chemins, ou BinaryEntry de iter_directory(read=False) (taille déjà connue)
+            on_error: Appelé avec (chemin, exception) pour chaque fichier illisible
+                      (None = message affiché)
+
+        Yields:
+            (chemin, contenu_binaire)
+        """
+        for path, data, release in self.iter_reads(items, on_error=on_error):
+            try:
+                yield path, data
+            finally:
+                release()
+
+    def iter_reads(self, items: Iterable[Union[str, BinaryEntry]],
+                   on_error: Callable[[str, Exception], None] = None
+                   ) -> Iterator[Tuple[str, bytes, Callable[[], None]]]:
+        """
+        Comme iter_files, mais la réservation est rendue par l'appelant
+
+        Yields:
+            (chemin, contenu_binaire, release) ; release() doit être appelé
+            une fois les bytes traités (éventuellement depuis un autre thread)
+        """
+        budget = ByteBudget(self.max_buffered_bytes, stats=self.stats)
+        reads = queue.Queue(maxsize=4 * self.max_in_flight)
+        stop = threading.Event()
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight,
+                                thread_name_prefix='prefetch') as executor:
+            producer = threading.Thread(
+                target=self._produce, args=(items, reads, budget, executor, stop),
+                name='prefetch-producer', daemon=True,
+            )
+            producer.start()
+            try:
+                while True:
+                    entry = reads.get()
+                    if entry is _DONE:
+                        break
+                    if isinstance(entry, BaseException):
+                        raise entry
+
+                    path, size, future = entry
+                    self.stats.add(queue_depth=-1)
+                    try:
+                        data = future.result()
+                    except Exception as e:
+                        budget.release(size)
+                        self.stats.add(read_errors=1)
+                        if on_error is None:
+                            print(f"Erreur lors du chargement de {path}: {e}")
+                        else:
+                            on_error(path, e)
+                        continue
+
+                    yield path, data, _release_once(budget, size)
+            finally:
+                stop.set()
+                budget.close()
+                _drain(reads)
+                producer.join()
+                _drain(reads)
+
+    def _produce(self, items, reads: queue.Queue, budget: ByteBudget,
+                 executor: ThreadPoolExecutor, stop: threading.Event):
+        """Thread producteur : réserve le budget puis lance la lecture"""
+        try:
+            for item in items:
+                if stop.is_set():
+                    return
+                path, size = self._describe(item)
+                if not budget.acquire(size):
+                    return
+                self.stats.add(queue_depth=1)
+                future = executor.submit(self._read, path)
+                if not _put(reads, (path, size, future), stop):
+                    return
+        except Exception as e:
+            _put(reads, e, stop)
+        finally:
+            _put(reads, _DONE, stop)
+
+    def _describe(self, item: Union[str, BinaryEntry]) -> Tuple[str, int]:
+        """Chemin et taille à réserver (stat seulement si la taille est inconnue)"""
+        if isinstance(item, BinaryEntry):
+            path, size = item.path, item.size
+        else:
+            path = item
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                # L'erreur sera signalée par la lecture
+                size = 0
+        max_bytes = self.loader.max_bytes
+        return path, min(size, max_bytes) if max_bytes else size
+
+    def _read(self, path: str) -> bytes:
+        self.stats.add(in_flight=1)
+        start = time.perf_counter()
+        try:
+            data = self.loader.load_file(path)
+        finally:
+            self.stats.add(in_flight=-1, read_seconds=time.perf_counter() - start)
+        self.stats.add(files_read=1, bytes_read=len(data))
+        return data
+
+
+def _release_once(budget: ByteBudget, size: int) -> Callable[[], None]:
+    """Fonction qui rend la réservation (les appels suivants sont ignorés)"""
+    once = threading.Lock()
+
+    def release():
+        if once.acquire(blocking=False):
+            budget.release(size)
+
+    return release
+
+
+def _put(reads: queue.Queue, entry, stop: threading.Event) -> bool:
+    """put() bloquant qui abandonne si l'appelant a arrêté la lecture"""
+    while not stop.is_set():
+        try:
+            reads.put(entry, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _drain(reads: queue.Queue):
+    while True:
+        try:
+            reads.get_nowait()
+        except queue.Empty:
+            return
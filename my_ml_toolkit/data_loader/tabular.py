@@ -2,21 +2,46 @@
 Module pour charger des données tabulaires (CSV, Excel, etc.)
 """
 
+import numpy as np
 import pandas as pd
-from typing import Union, List
+from pandas.api.types import union_categoricals
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from ..precision import cast_float_columns, resolve_float_dtype
+
+
+# Marqueur de dtype pour les colonnes de chaînes à faible cardinalité
+CATEGORY = 'category'
+
+# Extensions des formats colonnaires
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+ARROW_EXTENSIONS = ('.feather', '.arrow', '.ipc')
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.feather
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("pyarrow non installé. Installer avec: pip install pyarrow")
+    return pyarrow
 
 
 class TabularLoader:
     """Charge des données tabulaires"""
     
-    def __init__(self, separator: str = ',', encoding: str = 'utf-8'):
+    def __init__(self, separator: str = ',', encoding: str = 'utf-8', dtype: str = 'float64'):
         """
         Args:
             separator: Séparateur pour CSV (virgule par défaut)
             encoding: Encodage du fichier
+            dtype: Précision des colonnes flottantes chargées ('float64' = telles
+                   que lues, 'float32' = converties en float32)
         """
         self.separator = separator
         self.encoding = encoding
+        self.dtype = resolve_float_dtype(dtype)
     
     def load_csv(self, filepath: str, **kwargs) -> pd.DataFrame:
         """
@@ -29,12 +54,137 @@ class TabularLoader:
         Returns:
             DataFrame pandas
         """
-        return pd.read_csv(
+        return self._apply_precision(pd.read_csv(
             filepath, 
             sep=self.separator, 
             encoding=self.encoding,
             **kwargs
+        ))
+    
+    def infer_csv_dtypes(self, filepath: str, usecols: List[str] = None, sample_rows: int = 10_000,
+                         category_max_unique: int = 1000, category_max_ratio: float = 0.5,
+                         **kwargs) -> Dict[str, object]:
+        """
+        Déduit des dtypes compacts à partir des premières lignes d'un CSV
+        
+        Args:
+            filepath: Chemin vers le fichier CSV
+            usecols: Colonnes à lire (None = toutes)
+            sample_rows: Nombre de lignes de l'échantillon
+            category_max_unique: Nombre max de valeurs distinctes d'une colonne catégorielle
+            category_max_ratio: Part max de valeurs distinctes dans l'échantillon
+            **kwargs: Arguments supplémentaires pour pd.read_csv
+            
+        Returns:
+            {colonne: dtype} : entiers réduits au plus petit type couvrant
+            l'échantillon, flottants en float32, chaînes peu variées en
+            'category' ; les autres colonnes ne sont pas listées
+        """
+        sample = pd.read_csv(filepath, sep=self.separator, encoding=self.encoding,
+                             usecols=usecols, nrows=sample_rows, **kwargs)
+        
+        dtypes = {}
+        for name in sample.columns:
+            column = sample[name]
+            if pd.api.types.is_bool_dtype(column):
+                continue
+            if pd.api.types.is_integer_dtype(column):
+                dtypes[name] = _smallest_int_dtype(column)
+            elif pd.api.types.is_float_dtype(column):
+                dtypes[name] = np.dtype(np.float32)
+            elif pd.api.types.is_string_dtype(column) or column.dtype == object:
+                n_unique = column.nunique(dropna=True)
+                if n_unique <= category_max_unique and n_unique <= category_max_ratio * max(len(column), 1):
+                    dtypes[name] = CATEGORY
+        return dtypes
+    
+    def iter_csv(self, filepath: str, chunksize: int = 100_000, usecols: List[str] = None,
+                 dtypes: Union[str, Dict[str, object], None] = 'infer', sample_rows: int = 10_000,
+                 engine: str = 'c', **kwargs) -> Iterator[pd.DataFrame]:
+        """
+        Lit un CSV par blocs de lignes (mémoire bornée par chunksize)
+        
+        Les dtypes sont figés une fois pour toutes (déduits de l'échantillon ou
+        fournis), puis seulement élargis : un entier qui dépasse le type retenu
+        l'élargit pour les blocs suivants, un entier qui reçoit des NaN passe
+        au type entier nullable de pandas (Int64, UInt32...) et un entier qui
+        reçoit des décimales passe en float64 ; les blocs déjà produits gardent
+        leur type (concat_chunks aligne tout sur le dernier). Les catégories
+        s'enrichissent au fil des blocs (les blocs suivants connaissent toutes
+        les valeurs déjà vues).
+        
+        Args:
+            filepath: Chemin vers le fichier CSV
+            chunksize: Nombre de lignes par bloc
+            usecols: Colonnes à lire (projection : les autres ne sont pas converties)
+            dtypes: 'infer' (échantillon), dictionnaire {colonne: dtype ou 'category'},
+                    ou None (types de pandas)
+            sample_rows: Taille de l'échantillon si dtypes='infer'
+            engine: 'c' (pd.read_csv) ou 'pyarrow' (pyarrow.csv.open_csv, analyse multithread)
+            **kwargs: Arguments supplémentaires pour pd.read_csv (engine 'c'
+                      uniquement) ou infer_csv_dtypes
+            
+        Yields:
+            DataFrames d'au plus chunksize lignes
+        """
+        if dtypes == 'infer':
+            dtypes = self.infer_csv_dtypes(filepath, usecols=usecols, sample_rows=sample_rows, **kwargs)
+        pinned = _PinnedDtypes(dtypes or {})
+        
+        if engine == 'pyarrow':
+            chunks = self._iter_csv_arrow(filepath, chunksize, usecols, pinned)
+        elif engine == 'c':
+            # Colonnes catégorielles lues en chaînes (pas de catégories propres à chaque bloc)
+            text_columns = {name: object for name, dtype in pinned.dtypes.items() if dtype == CATEGORY}
+            chunks = pd.read_csv(filepath, sep=self.separator, encoding=self.encoding,
+                                 usecols=usecols, chunksize=chunksize,
+                                 dtype=text_columns or None, **kwargs)
+        else:
+            raise ValueError(f"Moteur inconnu: {engine} (utiliser 'c' ou 'pyarrow')")
+        
+        for chunk in chunks:
+            yield self._apply_precision(pinned.apply(chunk))
+    
+    def load_csv_chunked(self, filepath: str, chunksize: int = 100_000, usecols: List[str] = None,
+                         dtypes: Union[str, Dict[str, object], None] = 'infer',
+                         engine: str = 'c', **kwargs) -> pd.DataFrame:
+        """
+        Charge un CSV complet via iter_csv (dtypes compacts, pic mémoire réduit)
+        
+        Returns:
+            DataFrame unique ; les colonnes catégorielles gardent leur dtype
+        """
+        return concat_chunks(self.iter_csv(filepath, chunksize=chunksize, usecols=usecols,
+                                           dtypes=dtypes, engine=engine, **kwargs))
+    
+    def _iter_csv_arrow(self, filepath: str, chunksize: int, usecols: Optional[List[str]],
+                        pinned: '_PinnedDtypes') -> Iterator[pd.DataFrame]:
+        try:
+            import pyarrow as pa
+            from pyarrow import csv as pa_csv
+        except ImportError:
+            raise ImportError("pyarrow non installé. Installer avec: pip install pyarrow")
+        
+        text_columns = {name: pa.string() for name, dtype in pinned.dtypes.items() if dtype == CATEGORY}
+        reader = pa_csv.open_csv(
+            filepath,
+            read_options=pa_csv.ReadOptions(encoding=self.encoding, use_threads=True),
+            parse_options=pa_csv.ParseOptions(delimiter=self.separator),
+            convert_options=pa_csv.ConvertOptions(include_columns=usecols, column_types=text_columns),
         )
+        
+        # Les blocs Arrow ont une taille en bytes : regroupés en blocs de chunksize lignes
+        pending, pending_rows = [], 0
+        for batch in reader:
+            pending.append(batch)
+            pending_rows += batch.num_rows
+            while pending_rows >= chunksize:
+                table = pa.Table.from_batches(pending)
+                yield table.slice(0, chunksize).to_pandas()
+                rest = table.slice(chunksize)
+                pending, pending_rows = rest.to_batches(), rest.num_rows
+        if pending_rows:
+            yield pa.Table.from_batches(pending).to_pandas()
     
     def load_excel(self, filepath: str, sheet_name: Union[str, int] = 0, **kwargs) -> pd.DataFrame:
         """
@@ -48,7 +198,168 @@ class TabularLoader:
         Returns:
             DataFrame pandas
         """
-        return pd.read_excel(filepath, sheet_name=sheet_name, **kwargs)
+        return self._apply_precision(pd.read_excel(filepath, sheet_name=sheet_name, **kwargs))
+    
+    def load_parquet(self, filepath: str, columns: List[str] = None, filters: List = None,
+                     row_groups: List[int] = None) -> pd.DataFrame:
+        """
+        Charge un fichier Parquet
+        
+        Args:
+            filepath: Chemin vers le fichier Parquet
+            columns: Colonnes à lire (projection : les autres ne sont pas décodées)
+            filters: Filtre de lignes au format pyarrow, ex: [('label', '==', 1)] ;
+                     les row groups exclus par leurs statistiques min/max ne sont pas lus
+            row_groups: Indices des row groups à lire (None = tous)
+            
+        Returns:
+            DataFrame pandas
+        """
+        pa = _import_pyarrow()
+        if row_groups is not None:
+            table = pa.parquet.ParquetFile(filepath).read_row_groups(row_groups, columns=columns)
+            if filters:
+                table = table.filter(pa.parquet.filters_to_expression(filters))
+        else:
+            table = pa.parquet.read_table(filepath, columns=columns, filters=filters)
+        return self._arrow_to_pandas(table)
+    
+    def load_arrow_table(self, filepath: str, columns: List[str] = None, filters: List = None):
+        """
+        Table Arrow d'un fichier Feather v2 / Arrow IPC, projetée en mémoire
+        
+        Sans compression, les colonnes sont des vues sur la projection (mmap) :
+        rien n'est copié tant qu'elles ne sont pas converties.
+        
+        Args:
+            filepath: Chemin vers le fichier (.feather, .arrow, .ipc)
+            columns: Colonnes à lire
+            filters: Filtre de lignes au format pyarrow (appliqué après projection)
+            
+        Returns:
+            pyarrow.Table
+        """
+        pa = _import_pyarrow()
+        # Lecteur IPC sur la projection : feather.read_table recopie les colonnes
+        with pa.memory_map(filepath) as source:
+            table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select(columns)
+        if filters:
+            table = table.filter(pa.parquet.filters_to_expression(filters))
+        return table
+    
+    def load_feather(self, filepath: str, columns: List[str] = None, filters: List = None) -> pd.DataFrame:
+        """
+        Charge un fichier Feather v2 / Arrow IPC (lecture par mmap)
+        
+        Args:
+            filepath: Chemin vers le fichier (.feather, .arrow, .ipc)
+            columns: Colonnes à lire
+            filters: Filtre de lignes au format pyarrow, ex: [('label', '==', 1)]
+            
+        Returns:
+            DataFrame pandas
+        """
+        return self._arrow_to_pandas(self.load_arrow_table(filepath, columns=columns, filters=filters))
+    
+    def _apply_precision(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Colonnes float64 converties en float32 en mode float32 (inchangées sinon)"""
+        if self.dtype == np.float32:
+            return cast_float_columns(df, np.float32)
+        return df
+    
+    def _arrow_to_pandas(self, table) -> pd.DataFrame:
+        """Conversion d'une table Arrow, les flottants convertis avant de quitter Arrow"""
+        if self.dtype == np.float32:
+            pa = _import_pyarrow()
+            fields = [
+                field.with_type(pa.float32()) if field.type == pa.float64() else field
+                for field in table.schema
+            ]
+            table = table.cast(pa.schema(fields, metadata=table.schema.metadata))
+        return table.to_pandas()
+    
+    def save_parquet(self, df: pd.DataFrame, filepath: str, row_group_size: int = 100_000,
+                     compression: str = 'snappy'):
+        """
+        Écrit un DataFrame en Parquet
+        
+        Args:
+            df: Données
+            filepath: Chemin de sortie
+            row_group_size: Lignes par row group (granularité des filtres à la lecture)
+            compression: Codec Parquet ('snappy', 'zstd', 'gzip', None)
+        """
+        pa = _import_pyarrow()
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pa.parquet.write_table(table, filepath, row_group_size=row_group_size, compression=compression)
+    
+    def save_feather(self, df: pd.DataFrame, filepath: str, compression: str = 'uncompressed'):
+        """
+        Écrit un DataFrame en Feather v2 / Arrow IPC
+        
+        Args:
+            df: Données
+            filepath: Chemin de sortie
+            compression: 'uncompressed' (lecture mmap sans copie), 'lz4' ou 'zstd'
+        """
+        pa = _import_pyarrow()
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pa.feather.write_feather(table, filepath, compression=compression)
+    
+    def load(self, filepath: str, columns: List[str] = None, **kwargs) -> pd.DataFrame:
+        """
+        Charge un fichier selon son extension (.csv, .parquet, .feather/.arrow/.ipc, .xlsx)
+        
+        Args:
+            filepath: Chemin vers le fichier
+            columns: Colonnes à lire (usecols pour CSV / Excel)
+            **kwargs: Arguments de la méthode de lecture correspondante
+            
+        Returns:
+            DataFrame pandas
+            
+        Raises:
+            ValueError: Si l'extension n'est pas prise en charge
+        """
+        name = filepath.lower()
+        if name.endswith(PARQUET_EXTENSIONS):
+            return self.load_parquet(filepath, columns=columns, **kwargs)
+        if name.endswith(ARROW_EXTENSIONS):
+            return self.load_feather(filepath, columns=columns, **kwargs)
+        if columns is not None:
+            kwargs['usecols'] = columns
+        if name.endswith('.csv'):
+            return self.load_csv(filepath, **kwargs)
+        if name.endswith(('.xlsx', '.xls')):
+            return self.load_excel(filepath, **kwargs)
+        raise ValueError("Format non supporté. Utilisez .csv, .parquet, .feather, .arrow ou .xlsx")
+    
+    def save(self, df: pd.DataFrame, filepath: str, **kwargs):
+        """
+        Écrit un DataFrame selon l'extension (.parquet, .feather/.arrow/.ipc, .csv)
+        
+        Raises:
+            ValueError: Si l'extension n'est pas prise en charge
+        """
+        name = filepath.lower()
+        if name.endswith(PARQUET_EXTENSIONS):
+            self.save_parquet(df, filepath, **kwargs)
+        elif name.endswith(ARROW_EXTENSIONS):
+            self.save_feather(df, filepath, **kwargs)
+        elif name.endswith('.csv'):
+            df.to_csv(filepath, sep=self.separator, encoding=self.encoding, index=False, **kwargs)
+        else:
+            raise ValueError("Format non supporté. Utilisez .parquet, .feather, .arrow ou .csv")
+    
+    def columns(self, filepath: str) -> List[str]:
+        """Noms des colonnes d'un fichier Parquet / Arrow, lus dans le schéma seul"""
+        pa = _import_pyarrow()
+        if filepath.lower().endswith(PARQUET_EXTENSIONS):
+            return pa.parquet.read_schema(filepath).names
+        with pa.memory_map(filepath) as source:
+            return pa.ipc.open_file(source).schema.names
     
     def load_json(self, filepath: str, **kwargs) -> pd.DataFrame:
         """Charge un fichier JSON"""
@@ -65,6 +376,101 @@ class TabularLoader:
         }
 
 
+class _PinnedDtypes:
+    """Dtypes figés appliqués à chaque bloc, élargis si un bloc ne tient pas"""
+    
+    def __init__(self, dtypes: Dict[str, object]):
+        self.dtypes = {name: dtype if dtype == CATEGORY else np.dtype(dtype)
+                       for name, dtype in dtypes.items()}
+        self.categories = {name: [] for name, dtype in self.dtypes.items() if dtype == CATEGORY}
+    
+    def apply(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        for name, dtype in self.dtypes.items():
+            if name not in chunk.columns:
+                continue
+            if dtype == CATEGORY:
+                chunk[name] = self._categorical(name, chunk[name])
+            elif dtype.kind in 'iu':
+                chunk[name] = self._integer(name, chunk[name])
+            else:
+                chunk[name] = chunk[name].astype(dtype)
+        return chunk
+    
+    def _integer(self, name: str, column: pd.Series) -> pd.Series:
+        dtype = self.dtypes[name]
+        values = column.dropna()
+        if not pd.api.types.is_integer_dtype(column) and (values != np.trunc(values)).any():
+            # Décimales dans ce bloc : float64 pour la suite (exact jusqu'à 2**53,
+            # float32 arrondirait les grands entiers déjà lus)
+            self.dtypes[name] = np.dtype(np.float64)
+            return column.astype(np.float64)
+        
+        nullable = isinstance(dtype, pd.api.extensions.ExtensionDtype)
+        numpy_dtype = np.dtype(dtype.numpy_dtype) if nullable else dtype
+        if len(values):
+            info = np.iinfo(numpy_dtype)
+            if values.min() < info.min or values.max() > info.max:
+                numpy_dtype = np.promote_types(numpy_dtype, _smallest_int_dtype(values))
+        if nullable or len(values) < len(column):
+            # Valeurs manquantes : entier nullable de même largeur (valeurs exactes)
+            dtype = _nullable_int_dtype(numpy_dtype)
+        else:
+            dtype = numpy_dtype
+        self.dtypes[name] = dtype
+        return column.astype(dtype)
+    
+    def _categorical(self, name: str, column: pd.Series) -> pd.Series:
+        known = self.categories[name]
+        seen = set(known)
+        new = [value for value in pd.unique(column.dropna()) if value not in seen]
+        known.extend(new)
+        return pd.Categorical(column, categories=list(known))
+
+
+def _smallest_int_dtype(column: pd.Series) -> np.dtype:
+    """Plus petit type entier (non signé si possible) couvrant les valeurs"""
+    if len(column) == 0:
+        return np.dtype(np.int64)
+    low, high = int(column.min()), int(column.max())
+    candidates = (np.uint8, np.uint16, np.uint32, np.uint64) if low >= 0 else (np.int8, np.int16, np.int32, np.int64)
+    for candidate in candidates:
+        info = np.iinfo(candidate)
+        if info.min <= low and high <= info.max:
+            return np.dtype(candidate)
+    return np.dtype(np.int64)
+
+
+def _nullable_int_dtype(dtype: np.dtype) -> pd.api.extensions.ExtensionDtype:
+    """Type entier nullable de pandas (Int64, UInt32...) de même largeur que dtype"""
+    prefix = 'UInt' if dtype.kind == 'u' else 'Int'
+    return pd.api.types.pandas_dtype(f"{prefix}{dtype.itemsize * 8}")
+
+
+def concat_chunks(chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatène des blocs de iter_csv en conservant les colonnes catégorielles
+    
+    Chaque bloc reçoit l'union des catégories avant concaténation, au lieu
+    d'un repli sur le type object. Une colonne élargie en cours de lecture
+    prend dans tous les blocs le type du dernier (le plus large).
+    """
+    chunks = list(chunks)
+    if not chunks:
+        return pd.DataFrame()
+    
+    for name in chunks[0].columns:
+        if not isinstance(chunks[0][name].dtype, pd.CategoricalDtype):
+            final = chunks[-1][name].dtype
+            for chunk in chunks[:-1]:
+                if chunk[name].dtype != final:
+                    chunk[name] = chunk[name].astype(final)
+            continue
+        categories = union_categoricals([chunk[name] for chunk in chunks]).categories
+        for chunk in chunks:
+            chunk[name] = chunk[name].cat.set_categories(categories)
+    return pd.concat(chunks, ignore_index=True)
+
+
 if __name__ == "__main__":
     loader = TabularLoader()
     print("TabularLoader créé avec succès!")
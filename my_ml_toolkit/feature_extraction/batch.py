@@ -0,0 +1,355 @@
+"""
+Extraction de features binaires en parallèle sur un pool de processus
+Les workers lisent eux-mêmes les fichiers : seuls les chemins et les
+dictionnaires de features transitent entre processus
+"""
+
+import os
+from collections import deque
+from multiprocessing.util import Finalize
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from ..data_loader.archive import ArchiveMember
+from ..data_loader.binary import BinaryLoader, MappedBinary
+from ..data_loader.prefetch import PrefetchReader
+from .columnar import ColumnarBatch, FeatureSchema
+
+
+# Extracteur propre à chaque worker (installé une fois par _init_worker)
+_worker_extractor = None
+_worker_max_bytes = None
+
+
+def resolve_n_jobs(n_jobs: Optional[int]) -> int:
+    """Convertit n_jobs (None, -1, k) en nombre de processus effectif"""
+    if n_jobs is None or n_jobs == 0:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return n_jobs
+
+
+def _init_worker(extractor, max_bytes: Optional[int]):
+    global _worker_extractor, _worker_max_bytes
+    _worker_extractor = extractor
+    _worker_max_bytes = max_bytes
+    cache = getattr(extractor, 'cache', None)
+    if cache is not None:
+        # Dates d'accès en attente écrites à l'arrêt du worker
+        Finalize(cache, cache.flush, exitpriority=10)
+
+
+def _extract_path(path: str) -> Tuple[str, Optional[Dict], Optional[str], Optional[Dict]]:
+    """Point d'entrée des workers (extracteur installé par _init_worker)"""
+    before = _cache_counters(_worker_extractor)
+    result = _extract_path_with(_worker_extractor, _worker_max_bytes, path)
+    return result + (_cache_delta(_worker_extractor, before),)
+
+
+def _cache_counters(extractor) -> Optional[Dict]:
+    cache = getattr(extractor, 'cache', None)
+    return cache.counters() if cache is not None else None
+
+
+def _cache_delta(extractor, before: Optional[Dict]) -> Optional[Dict]:
+    """Variation des compteurs du cache du worker depuis `before`"""
+    if before is None:
+        return None
+    after = extractor.cache.counters()
+    return {name: after[name] - before[name] for name in after}
+
+
+def _merge_cache_counters(extractor, results) -> Iterator[Tuple]:
+    """Reporte les compteurs de cache des workers sur le cache du processus parent"""
+    cache = getattr(extractor, 'cache', None)
+    for *result, delta in results:
+        if cache is not None and delta is not None:
+            cache.add_counters(delta)
+        yield tuple(result)
+
+
+def _extract_path_with(extractor, max_bytes: Optional[int],
+                       path: str) -> Tuple[str, Optional[Dict], Optional[str]]:
+    """Lit (mmap) et extrait un fichier ; les erreurs sont renvoyées, pas levées"""
+    try:
+        with MappedBinary(path, max_bytes=max_bytes) as mapped:
+            return path, extractor.extract_all_features(mapped.buffer), None
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}"
+
+
+def iter_batch_features(extractor, paths: List[str], n_jobs: int = 1, ordered: bool = True,
+                        max_bytes: int = None, chunksize: int = None,
+                        on_error: Callable[[str, str], None] = None) -> Iterator[Tuple[str, Dict]]:
+    """
+    Extrait les features d'une liste de fichiers, en parallèle si n_jobs > 1
+
+    Args:
+        extractor: BinaryFeatureExtractor (copié une fois dans chaque worker)
+        paths: Chemins des fichiers
+        n_jobs: Nombre de processus (-1 = tous les coeurs)
+        ordered: True = résultats dans l'ordre de paths, False = dès qu'ils sont prêts
+        max_bytes: Nombre maximum de bytes lus par fichier
+        chunksize: Nombre de chemins envoyés par tâche (None = automatique)
+        on_error: Appelé avec (chemin, message) pour chaque fichier en échec
+
+    Yields:
+        (chemin, features)
+    """
+    paths = list(paths)
+    n_jobs = min(resolve_n_jobs(n_jobs), max(len(paths), 1))
+
+    if n_jobs == 1:
+        results = (_extract_path_with(extractor, max_bytes, path) for path in paths)
+        yield from _filter_errors(results, on_error)
+        return
+
+    if chunksize is None:
+        # Quelques tâches par worker : équilibre de charge sans surcoût d'IPC
+        chunksize = max(1, min(64, len(paths) // (n_jobs * 4)))
+
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                             initargs=(extractor, max_bytes)) as executor:
+        if ordered:
+            results = executor.map(_extract_path, paths, chunksize=chunksize)
+        else:
+            futures = [executor.submit(_extract_batch, paths[i:i + chunksize])
+                       for i in range(0, len(paths), chunksize)]
+            results = (result for future in as_completed(futures) for result in future.result())
+        yield from _filter_errors(_merge_cache_counters(extractor, results), on_error)
+
+
+def _extract_archive_with(extractor, loader: BinaryLoader, archive_path: str,
+                          extensions: Optional[List[str]], chunk_size: int
+                          ) -> Iterator[Tuple[ArchiveMember, Optional[Dict], Optional[str]]]:
+    """Extrait chaque membre d'une archive en flux ; les erreurs sont renvoyées, pas levées"""
+    errors = []
+
+    def record(path, error):
+        errors.append((ArchiveMember(archive_path, '', 0), f"{type(error).__name__}: {error}"))
+
+    members = loader.iter_archive(archive_path, extensions=extensions, read=False,
+                                  chunk_size=chunk_size, on_error=record)
+    for member, chunks in members:
+        try:
+            yield member, extractor.extract_stream(chunks), None
+        except Exception as e:
+            yield member, None, f"{type(e).__name__}: {e}"
+
+    # Archive illisible ou interrompue (trop de membres) : une erreur par archive
+    for member, error in errors:
+        yield member, None, error
+
+
+def _extract_archive(archive_path: str, loader: BinaryLoader, extensions: Optional[List[str]], chunk_size: int
+                     ) -> List[Tuple[ArchiveMember, Optional[Dict], Optional[str], Optional[Dict]]]:
+    """Point d'entrée des workers : une archive complète par tâche, compteurs du cache par membre"""
+    results = []
+    before = _cache_counters(_worker_extractor)
+    for result in _extract_archive_with(_worker_extractor, loader, archive_path, extensions, chunk_size):
+        results.append(result + (_cache_delta(_worker_extractor, before),))
+        before = _cache_counters(_worker_extractor)
+    return results
+
+
+def iter_archive_features(extractor, archive_paths: List[str], loader: BinaryLoader = None,
+                          n_jobs: int = 1, ordered: bool = True, extensions: List[str] = None,
+                          chunk_size: int = 1 << 20, on_error: Callable[[str, str], None] = None
+                          ) -> Iterator[Tuple[ArchiveMember, Dict]]:
+    """
+    Extrait les features des fichiers contenus dans des archives zip / tar
+
+    Les membres sont lus en flux (extract_stream) : mémoire bornée par
+    chunk_size, rien n'est écrit sur disque. En parallèle, chaque worker
+    traite des archives entières (un flux tar ne se découpe pas). Le cache
+    de l'extracteur est alimenté mais pas consulté (empreinte connue en fin
+    de flux) ; les compteurs des workers sont reportés sur le parent.
+
+    Args:
+        extractor: BinaryFeatureExtractor (copié une fois dans chaque worker)
+        archive_paths: Chemins des archives
+        loader: BinaryLoader portant max_bytes et les limites de décompression
+        n_jobs: Nombre de processus (-1 = tous les coeurs)
+        ordered: True = ordre des archives, False = dès qu'une archive est traitée
+        extensions: Extensions des membres à conserver
+        chunk_size: Taille des morceaux lus
+        on_error: Appelé avec (chemin, message) pour chaque membre ou archive en échec
+
+    Yields:
+        (ArchiveMember, features)
+    """
+    archive_paths = list(archive_paths)
+    loader = loader or BinaryLoader()
+    extensions = list(extensions) if extensions else None
+    n_jobs = min(resolve_n_jobs(n_jobs), max(len(archive_paths), 1))
+
+    if n_jobs == 1:
+        for archive_path in archive_paths:
+            results = _extract_archive_with(extractor, loader, archive_path, extensions, chunk_size)
+            yield from _filter_member_errors(results, on_error)
+        return
+
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                             initargs=(extractor, loader.max_bytes)) as executor:
+        futures = [executor.submit(_extract_archive, archive_path, loader, extensions, chunk_size)
+                   for archive_path in archive_paths]
+        done = futures if ordered else as_completed(futures)
+        for future in done:
+            yield from _filter_member_errors(_merge_cache_counters(extractor, future.result()), on_error)
+
+
+def _extract_data(data: bytes) -> Tuple[Optional[Dict], Optional[str], Optional[Dict]]:
+    """Point d'entrée des workers pour des bytes déjà lus"""
+    before = _cache_counters(_worker_extractor)
+    result = _extract_data_with(_worker_extractor, data)
+    return result + (_cache_delta(_worker_extractor, before),)
+
+
+def _extract_data_with(extractor, data: bytes) -> Tuple[Optional[Dict], Optional[str]]:
+    try:
+        return extractor.extract_all_features(data), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def iter_prefetched_features(extractor, paths, reader: PrefetchReader = None, n_jobs: int = 1,
+                             on_error: Callable[[str, str], None] = None
+                             ) -> Iterator[Tuple[str, Dict]]:
+    """
+    Extrait les features de fichiers lus en avance par un PrefetchReader
+
+    Pour les stockages à forte latence (NFS) : les lectures (threads) se
+    recouvrent avec l'extraction (ce processus si n_jobs == 1, sinon un pool
+    de processus qui reçoit les bytes). La réservation de chaque fichier
+    n'est rendue qu'après son extraction : reader.max_buffered_bytes borne
+    aussi les bytes en transit vers les workers.
+
+    Args:
+        extractor: BinaryFeatureExtractor
+        paths: Chemins ou BinaryEntry (iter_directory(read=False))
+        reader: PrefetchReader (lectures simultanées, budget mémoire, compteurs
+                dans reader.stats) ; None = PrefetchReader()
+        n_jobs: Nombre de processus d'extraction (-1 = tous les coeurs)
+        on_error: Appelé avec (chemin, message) pour chaque fichier en échec
+
+    Yields:
+        (chemin, features) dans l'ordre des chemins
+    """
+    reader = reader or PrefetchReader()
+    stats = reader.stats
+    n_jobs = resolve_n_jobs(n_jobs)
+
+    def read_error(path, error):
+        _report(path, f"{type(error).__name__}: {error}", on_error)
+
+    reads = reader.iter_reads(paths, on_error=read_error)
+
+    def finish(path, result):
+        stats.add(extracting=-1, files_extracted=1)
+        features, error = result
+        if error is not None:
+            _report(path, error, on_error)
+            return []
+        return [(path, features)]
+
+    if n_jobs == 1:
+        try:
+            for path, data, release in reads:
+                stats.add(extracting=1)
+                try:
+                    result = _extract_data_with(extractor, data)
+                finally:
+                    release()
+                yield from finish(path, result)
+        finally:
+            reads.close()
+        return
+
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                             initargs=(extractor, None)) as executor:
+        try:
+            for path, data, release in reads:
+                stats.add(extracting=1)
+                future = executor.submit(_extract_data, data)
+                future.add_done_callback(lambda _, release=release: release())
+                pending.append((path, future))
+                # Résultats rendus dans l'ordre, dès que la tête de file est prête
+                while pending and pending[0][1].done():
+                    path, future = pending.popleft()
+                    yield from finish(path, *_merge_cache_counters(extractor, [future.result()]))
+            while pending:
+                path, future = pending.popleft()
+                yield from finish(path, *_merge_cache_counters(extractor, [future.result()]))
+        finally:
+            reads.close()
+
+
+def collect_archive_batch(results: Iterator[Tuple[ArchiveMember, Dict]], schema: FeatureSchema,
+                          capacity: int = 1024) -> ColumnarBatch:
+    """
+    Comme collect_batch pour des membres d'archives
+
+    Returns:
+        ColumnarBatch avec les colonnes 'archive' (nom de base) et 'filename'
+        (nom du membre dans l'archive) en dernier
+    """
+    batch = ColumnarBatch(schema.with_columns([('archive', object), ('filename', object)]),
+                          capacity=capacity)
+    for member, features in results:
+        batch.append({**features, 'archive': os.path.basename(member.archive), 'filename': member.name})
+    return batch
+
+
+def collect_batch(results: Iterator[Tuple[str, Dict]], schema: FeatureSchema,
+                  capacity: int = 1024) -> ColumnarBatch:
+    """
+    Écrit les résultats dans un lot colonnaire (sans liste de dictionnaires)
+
+    Args:
+        results: Itérateur de (chemin, features)
+        schema: Schéma des features (la colonne 'filename' est ajoutée en dernier)
+        capacity: Nombre de lignes préallouées
+
+    Returns:
+        ColumnarBatch
+    """
+    batch = ColumnarBatch(schema.with_columns([('filename', object)]), capacity=capacity)
+    for path, features in results:
+        batch.append({**features, 'filename': os.path.basename(path)})
+    return batch
+
+
+def _extract_batch(paths: List[str]) -> List[Tuple[str, Optional[Dict], Optional[str], Optional[Dict]]]:
+    return [_extract_path(path) for path in paths]
+
+
+def _report(path: str, error: str, on_error):
+    if on_error is None:
+        print(f"Erreur lors de l'extraction de {path}: {error}")
+    else:
+        on_error(path, error)
+
+
+def _filter_member_errors(results, on_error) -> Iterator[Tuple[ArchiveMember, Dict]]:
+    for member, features, error in results:
+        if error is not None:
+            path = member.path if member.name else member.archive
+            if on_error is None:
+                print(f"Erreur lors de l'extraction de {path}: {error}")
+            else:
+                on_error(path, error)
+            continue
+        yield member, features
+
+
+def _filter_errors(results, on_error) -> Iterator[Tuple[str, Dict]]:
+    for path, features, error in results:
+        if error is not None:
+            if on_error is None:
+                print(f"Erreur lors de l'extraction de {path}: {error}")
+            else:
+                on_error(path, error)
+            continue
+        yield path, features
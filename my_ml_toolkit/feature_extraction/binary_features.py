@@ -4,151 +4,484 @@ Spécialisé pour cybersécurité et analyse de malwares
 """
 
 import numpy as np
+import pandas as pd
 from scipy import stats
-from collections import Counter
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
 import hashlib
+import json
+import time
+import warnings
+
+from .batch import (
+    collect_archive_batch, collect_batch, iter_archive_features, iter_batch_features,
+    iter_prefetched_features,
+)
+from .columnar import ColumnarBatch, FeatureSchema
+from .entropy_profile import EntropyProfiler
+from .feature_cache import FeatureCache
+from .feature_registry import DEFAULT_REGISTRY
+from .hashing import FAST_HASH_NAME, hash_bytes
+from .histogram import byte_histogram
+from .ngram_histogram import ByteNgramCounter
+from .pe_header import PEHeaderReader
+from .pe_sections import PESectionAccumulator
+from .repeated_sequences import RepeatedSequenceCounter
+from .streaming import BinaryFeatureStream
+
+
+# Valeurs des 256 bytes possibles, pour les moments calculés sur l'histogramme
+_BYTE_VALUES = np.arange(256, dtype=np.int64)
 
 
 class BinaryFeatureExtractor:
     """Extrait des features statistiques et structurelles de fichiers binaires"""
     
-    def __init__(self, ngram_size: int = 2):
+    # À incrémenter à chaque changement des features produites (invalide les caches)
+    FEATURE_SET_VERSION = 2
+    
+    def __init__(self, ngram_size: int = 2, entropy_window: int = 256, entropy_step: int = None,
+                 entropy_threshold: float = 7.5, ngram_buckets: int = 64, include_ngrams: bool = True,
+                 cache: FeatureCache = None, fast_hash: bool = False,
+                 sequence_lengths: Tuple[int, ...] = (4,), sequence_aligned: bool = True,
+                 include_pe_sections: bool = False):
         """
         Args:
             ngram_size: Taille des n-grams à extraire (2 = bigrams, 3 = trigrams)
+            entropy_window: Taille des fenêtres du profil d'entropie
+            entropy_step: Pas entre fenêtres (None = fenêtres disjointes)
+            entropy_threshold: Seuil des sections à haute entropie
+            ngram_buckets: Nombre de colonnes fixes pour l'histogramme de n-grams
+            include_ngrams: Inclure les features n-grams dans extract_all_features
+            cache: Cache de features par SHA-256 consulté avant chaque extraction
+            fast_hash: Ajouter une empreinte rapide non cryptographique ('fast_hash')
+            sequence_lengths: Longueurs des séquences répétées recherchées
+            sequence_aligned: Séquences alignées (blocs disjoints) ou à toutes les positions
+            include_pe_sections: Ajouter les features par section PE (valeurs nulles
+                                 pour les fichiers qui ne sont pas des PE)
         """
         self.ngram_size = ngram_size
+        self.include_ngrams = include_ngrams
+        self.fast_hash = fast_hash
+        self.include_pe_sections = include_pe_sections
+        self.pe_extractor = PEFileFeatureExtractor() if include_pe_sections else None
+        self.ngram_counter = ByteNgramCounter(n=ngram_size, num_buckets=ngram_buckets)
+        self.entropy_profiler = EntropyProfiler(
+            window_size=entropy_window,
+            step=entropy_step,
+            threshold=entropy_threshold,
+        )
+        self.sequence_counter = RepeatedSequenceCounter(
+            lengths=sequence_lengths,
+            aligned=sequence_aligned,
+        )
+        
+        self._schema = None
+        
+        self.cache = cache
+        if cache is not None:
+            cache.bind(self.config_key)
+    
+    @property
+    def config_key(self) -> str:
+        """Empreinte du jeu de features (version + paramètres), clé des caches"""
+        config = {
+            'version': self.FEATURE_SET_VERSION,
+            'ngram_size': self.ngram_size,
+            'ngram_buckets': self.ngram_counter.num_buckets,
+            'include_ngrams': self.include_ngrams,
+            'entropy_window': self.entropy_profiler.window_size,
+            'entropy_step': self.entropy_profiler.step,
+            'entropy_threshold': self.entropy_profiler.threshold,
+            'fast_hash': FAST_HASH_NAME if self.fast_hash else None,
+            'sequence_lengths': list(self.sequence_counter.lengths),
+            'sequence_aligned': self.sequence_counter.aligned,
+            'include_pe_sections': self.include_pe_sections,
+        }
+        return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()[:16]
     
     def extract_all_features(self, data: bytes) -> Dict:
         """
         Extrait toutes les features d'un fichier binaire
         
+        Si un cache est configuré, il est consulté (clé SHA-256 du contenu)
+        avant toute extraction.
+        
         Args:
             data: Données binaires
             
         Returns:
             Dictionnaire de features
         """
+        if self.cache is None:
+            return self._extract_all_features(data)
+        
+        digests = hash_bytes(data, fast=self.fast_hash)
+        cached = self.cache.get(digests['sha256'], self.config_key)
+        if cached is not None:
+            return cached
+        
+        features = self._extract_all_features(data, digests=digests)
+        self.cache.put(digests['sha256'], self.config_key, features)
+        return features
+    
+    def _extract_all_features(self, data: bytes, digests: Dict[str, str] = None) -> Dict:
+        """Extraction complète, sans cache"""
         features = {}
         
+        # Conversion unique en array numpy, partagée par tous les blocs
+        byte_array = np.frombuffer(data, dtype=np.uint8)
+        
         # Features de base
-        features.update(self.extract_basic_features(data))
+        features.update(self.extract_basic_features(data, digests=digests))
         
-        # Features statistiques
-        features.update(self.extract_statistical_features(data))
+        # Features statistiques : un seul passage (histogramme 256 bins)
+        statistical = self.extract_statistical_features(
+            data,
+            byte_array=byte_array,
+            histogram=byte_histogram(byte_array),
+        )
+        features.update(statistical)
         
-        # Features de structure
-        features.update(self.extract_structural_features(data))
+        # Features de structure (le ratio imprimable est déjà calculé ci-dessus)
+        features.update(self.extract_structural_features(
+            data,
+            byte_array=byte_array,
+            printable_ratio=statistical['printable_bytes_ratio'],
+        ))
         
-        # N-grams (optionnel, peut être lourd)
-        # features.update(self.extract_ngram_features(data))
+        # N-grams (histogramme vectorisé, colonnes fixes)
+        if self.include_ngrams:
+            features.update(self.extract_ngram_features(data, byte_array=byte_array))
+        
+        # Sections PE (vues sur le même array, sans copie)
+        if self.include_pe_sections:
+            features.update(self.pe_extractor.extract_section_features(data, byte_array=byte_array))
         
         return features
     
-    def extract_basic_features(self, data: bytes) -> Dict:
-        """Features de base du fichier"""
-        return {
-            'file_size': len(data),
-            'md5': hashlib.md5(data, usedforsecurity=False).hexdigest(),
-            'sha256': hashlib.sha256(data).hexdigest()
-        }
+    def extract_stream(self, chunks: Iterable[bytes]) -> Dict:
+        """
+        Extrait toutes les features à partir de morceaux successifs d'un fichier
+        
+        Produit le même dictionnaire que extract_all_features sans jamais
+        matérialiser le fichier complet en mémoire. Le SHA-256 n'étant connu
+        qu'une fois le flux lu, le cache n'est pas consulté mais alimenté :
+        les extractions suivantes du même contenu (fichier, bytes) le trouvent.
+        
+        Args:
+            chunks: Itérable de morceaux (ex: BinaryLoader.iter_chunks)
+            
+        Returns:
+            Dictionnaire de features
+        """
+        stream = BinaryFeatureStream(self)
+        for chunk in chunks:
+            stream.update(chunk)
+        features = stream.finalize()
+        if self.cache is not None:
+            self.cache.put(features['sha256'], self.config_key, features)
+        return features
     
-    def extract_statistical_features(self, data: bytes) -> Dict:
-        """Features statistiques sur la distribution des bytes"""
-        byte_array = np.frombuffer(data, dtype=np.uint8)
+    def iter_batch(self, paths: Iterable[str], n_jobs: int = 1, ordered: bool = True,
+                   max_bytes: int = None, on_error: Callable[[str, str], None] = None
+                   ) -> Iterator[Tuple[str, Dict]]:
+        """
+        Extrait les features d'une liste de fichiers sur un pool de processus
         
-        features = {
-            # Entropie de Shannon (mesure de randomness)
-            'entropy': self._calculate_entropy(byte_array),
+        Chaque worker lit ses fichiers lui-même (mmap) : les bytes ne sont
+        jamais sérialisés entre processus.
+        
+        Args:
+            paths: Chemins des fichiers
+            n_jobs: Nombre de processus (-1 = tous les coeurs, 1 = séquentiel)
+            ordered: True = ordre de paths, False = au fil de l'eau
+            max_bytes: Nombre maximum de bytes lus par fichier
+            on_error: Appelé avec (chemin, message) pour chaque fichier en échec
             
-            # Statistiques descriptives
-            'mean_byte_value': float(np.mean(byte_array)),
-            'std_byte_value': float(np.std(byte_array)),
-            'min_byte_value': int(np.min(byte_array)),
-            'max_byte_value': int(np.max(byte_array)),
+        Yields:
+            (chemin, features)
+        """
+        return iter_batch_features(self, paths, n_jobs=n_jobs, ordered=ordered,
+                                   max_bytes=max_bytes, on_error=on_error)
+    
+    def iter_prefetch_batch(self, paths: Iterable, n_jobs: int = 1, reader=None,
+                            on_error: Callable[[str, str], None] = None) -> Iterator[Tuple[str, Dict]]:
+        """
+        Extrait les features de fichiers lus en avance par un pool de threads
+        
+        Pour les stockages à forte latence : les lectures se recouvrent avec
+        l'extraction, avec un volume de bytes en mémoire borné.
+        
+        Args:
+            paths: Chemins ou BinaryEntry (iter_directory(read=False))
+            n_jobs: Nombre de processus d'extraction (-1 = tous les coeurs, 1 = ce processus)
+            reader: PrefetchReader (lectures simultanées, budget mémoire, compteurs
+                    dans reader.stats) ; None = réglages par défaut
+            on_error: Appelé avec (chemin, message) pour chaque fichier en échec
             
-            # Distribution
-            'unique_bytes_count': len(np.unique(byte_array)),
-            'unique_bytes_ratio': len(np.unique(byte_array)) / 256.0,
-        }
+        Yields:
+            (chemin, features) dans l'ordre des chemins
+        """
+        return iter_prefetched_features(self, paths, reader=reader, n_jobs=n_jobs, on_error=on_error)
+    
+    def extract_batch(self, paths: Iterable[str], n_jobs: int = 1, ordered: bool = True,
+                      max_bytes: int = None, on_error: Callable[[str, str], None] = None,
+                      identifiers: str = 'hex') -> pd.DataFrame:
+        """
+        Comme iter_batch, mais assemble directement un DataFrame colonne par colonne
         
-        # Distribution par plages de bytes
-        features.update(self._byte_distribution(byte_array))
+        Args:
+            identifiers: Export des empreintes : 'hex', 'binary' (bytes bruts)
+                         ou 'drop' (matrice d'entraînement sans empreintes)
+        
+        Returns:
+            DataFrame (une ligne par fichier lisible, colonne 'filename' en dernier)
+        """
+        batch = self.extract_batch_columnar(paths, n_jobs=n_jobs, ordered=ordered,
+                                            max_bytes=max_bytes, on_error=on_error)
+        return batch.to_frame(identifiers=identifiers)
+    
+    def extract_batch_columnar(self, paths: Iterable[str], n_jobs: int = 1, ordered: bool = True,
+                               max_bytes: int = None, on_error: Callable[[str, str], None] = None
+                               ) -> ColumnarBatch:
+        """
+        Comme iter_batch, mais écrit les features dans des arrays typés préalloués
+        
+        Returns:
+            ColumnarBatch (to_frame() / to_arrow()), colonne 'filename' en dernier
+        """
+        paths = list(paths)
+        results = self.iter_batch(paths, n_jobs=n_jobs, ordered=ordered,
+                                  max_bytes=max_bytes, on_error=on_error)
+        return collect_batch(results, self.feature_schema(), capacity=len(paths))
+    
+    def iter_archive_batch(self, archive_paths: Iterable[str], n_jobs: int = 1, ordered: bool = True,
+                           loader=None, extensions: Iterable[str] = None, chunk_size: int = 1 << 20,
+                           on_error: Callable[[str, str], None] = None) -> Iterator[Tuple]:
+        """
+        Extrait les features des fichiers contenus dans des archives zip / tar
         
+        Les membres sont lus en flux sans extraction sur disque ; en parallèle,
+        chaque worker traite des archives entières. Comme extract_stream, le
+        cache est alimenté mais pas consulté.
+        
+        Args:
+            archive_paths: Chemins des archives
+            n_jobs: Nombre de processus (-1 = tous les coeurs, 1 = séquentiel)
+            ordered: True = ordre des archives, False = au fil de l'eau
+            loader: BinaryLoader (max_bytes, limites de décompression)
+            extensions: Extensions des membres à conserver
+            chunk_size: Taille des morceaux lus
+            on_error: Appelé avec (chemin, message) pour chaque membre ou archive en échec
+            
+        Yields:
+            (ArchiveMember, features)
+        """
+        return iter_archive_features(self, archive_paths, loader=loader, n_jobs=n_jobs,
+                                     ordered=ordered, extensions=extensions,
+                                     chunk_size=chunk_size, on_error=on_error)
+    
+    def extract_archive_batch(self, archive_paths: Iterable[str], n_jobs: int = 1, ordered: bool = True,
+                              loader=None, extensions: Iterable[str] = None, chunk_size: int = 1 << 20,
+                              on_error: Callable[[str, str], None] = None,
+                              identifiers: str = 'hex') -> pd.DataFrame:
+        """
+        Comme iter_archive_batch, assemblé colonne par colonne
+        
+        Returns:
+            DataFrame (une ligne par membre lisible, colonnes 'archive' et 'filename' en dernier)
+        """
+        results = self.iter_archive_batch(archive_paths, n_jobs=n_jobs, ordered=ordered, loader=loader,
+                                          extensions=extensions, chunk_size=chunk_size, on_error=on_error)
+        return collect_archive_batch(results, self.feature_schema()).to_frame(identifiers=identifiers)
+    
+    def feature_schema(self) -> FeatureSchema:
+        """
+        Schéma fixe des colonnes produites par extract_all_features
+        
+        Déduit d'une extraction sur un contenu vide (toutes les clés sont
+        toujours présentes), avec les dtypes compacts de DEFAULT_REGISTRY :
+        drapeaux uint8, effectifs uint32 ou uint64, ratios float32 et empreintes en
+        binaire brut de largeur fixe.
+        """
+        if self._schema is None:
+            self._schema = DEFAULT_REGISTRY.schema_from_sample(self._extract_all_features(b''))
+        return self._schema
+    
+    def extract_basic_features(self, data: bytes, digests: Dict[str, str] = None) -> Dict:
+        """
+        Features de base du fichier
+        
+        MD5 et SHA-256 sont calculés en une seule lecture des données.
+        
+        Args:
+            data: Données binaires
+            digests: Empreintes déjà calculées (hashing.hash_bytes / hash_file),
+                     évite de hacher une seconde fois
+        """
+        if digests is None:
+            digests = hash_bytes(data, fast=self.fast_hash)
+        
+        features = {
+            'file_size': len(data),
+            'md5': digests['md5'],
+            'sha256': digests['sha256'],
+        }
+        if self.fast_hash:
+            features['fast_hash'] = digests['fast_hash']
         return features
     
-    def extract_structural_features(self, data: bytes) -> Dict:
-        """Features liées à la structure du fichier"""
+    def extract_statistical_features(self, data: bytes, byte_array: np.ndarray = None,
+                                     histogram: np.ndarray = None) -> Dict:
+        """
+        Features statistiques sur la distribution des bytes
+        
+        Toutes les features sont des fonctions de l'histogramme 256 bins :
+        les données ne sont parcourues qu'une fois.
+        
+        Args:
+            data: Données binaires
+            byte_array: Vue uint8 de data déjà construite (évite une conversion)
+            histogram: Histogramme déjà calculé par byte_histogram()
+        """
+        if histogram is None:
+            if byte_array is None:
+                byte_array = np.frombuffer(data, dtype=np.uint8)
+            histogram = byte_histogram(byte_array)
+        
+        return self._statistics_from_histogram(histogram)
+    
+    def extract_structural_features(self, data: bytes, byte_array: np.ndarray = None,
+                                    printable_ratio: float = None) -> Dict:
+        """
+        Features liées à la structure du fichier
+        
+        Args:
+            data: Données binaires
+            byte_array: Vue uint8 de data déjà construite (évite une conversion)
+            printable_ratio: Ratio imprimable déjà calculé (évite un second passage)
+        """
+        if byte_array is None:
+            byte_array = np.frombuffer(data, dtype=np.uint8)
+        
         features = {}
         
         # Détection de magic bytes (signatures de fichiers)
         features.update(self._detect_file_signatures(data))
         
-        # Sections avec haute entropie (possiblement chiffré/compressé)
-        features['high_entropy_sections'] = self._count_high_entropy_sections(data)
+        # Profil d'entropie par fenêtres (sections chiffrées/compressées)
+        features.update(self.entropy_profiler.extract_features(byte_array))
         
-        # Séquences répétées
-        features['repeated_sequences'] = self._count_repeated_sequences(data)
+        # Séquences répétées (nombre, effectif maximal, part du fichier couverte)
+        features.update(self.sequence_counter.extract_features(byte_array))
         
         # Présence de strings lisibles
-        features['printable_ratio'] = self._calculate_printable_ratio(data)
+        if printable_ratio is None:
+            printable_ratio = self._calculate_printable_ratio(byte_array)
+        features['printable_ratio'] = printable_ratio
         
         return features
     
-    def extract_ngram_features(self, data: bytes, top_n: int = 100) -> Dict:
+    def extract_ngram_features(self, data: bytes, top_n: int = None, byte_array: np.ndarray = None) -> Dict:
         """
-        Extrait les n-grams les plus fréquents
+        Extrait la distribution des n-grams sur un nombre fixe de colonnes
+        
+        Les n-grams sont comptés dans un histogramme numpy (65 536 bins exacts
+        pour les bigrams, buckets hachés à partir des trigrams) puis repliés
+        sur `ngram_buckets` colonnes dont les noms ne dépendent pas du fichier.
         
         Args:
             data: Données binaires
-            top_n: Nombre de n-grams à retourner
+            top_n: Obsolète, ignoré (le nombre de colonnes est fixé par ngram_buckets)
+            byte_array: Vue uint8 de data déjà construite (évite une conversion)
             
         Returns:
-            Dictionnaire avec fréquences des top n-grams
+            Dictionnaire avec fréquences par bucket et statistiques globales
         """
-        ngrams = []
+        if top_n is not None:
+            warnings.warn(
+                "top_n est obsolète et ignoré : le nombre de colonnes n-grams est fixé "
+                "par le paramètre ngram_buckets de BinaryFeatureExtractor",
+                DeprecationWarning, stacklevel=2,
+            )
+        if byte_array is None:
+            byte_array = np.frombuffer(data, dtype=np.uint8)
         
-        # Créer les n-grams
-        for i in range(len(data) - self.ngram_size + 1):
-            ngram = data[i:i + self.ngram_size]
-            ngrams.append(ngram)
-        
-        # Compter les fréquences
-        ngram_counts = Counter(ngrams)
-        
-        # Top N n-grams
-        features = {}
-        for idx, (ngram, count) in enumerate(ngram_counts.most_common(top_n)):
-            ngram_hex = ngram.hex()
-            features[f'ngram_{idx}_{ngram_hex}'] = count
-        
-        return features
+        return self.ngram_counter.extract_features(byte_array)
     
     def _calculate_entropy(self, byte_array: np.ndarray) -> float:
         """Calcule l'entropie de Shannon"""
-        # Compter la fréquence de chaque byte
-        value_counts = np.bincount(byte_array, minlength=256)
-        probabilities = value_counts[value_counts > 0] / len(byte_array)
+        return self._entropy_from_histogram(np.bincount(byte_array, minlength=256))
+    
+    def _entropy_from_histogram(self, histogram: np.ndarray) -> float:
+        """Entropie de Shannon à partir des effectifs des 256 valeurs"""
+        total = histogram.sum()
+        if total == 0:
+            return 0.0
+        probabilities = histogram[histogram > 0] / total
         
         # Entropie de Shannon
         entropy = -np.sum(probabilities * np.log2(probabilities))
         return float(entropy)
     
-    def _byte_distribution(self, byte_array: np.ndarray) -> Dict:
-        """Distribution des bytes par catégories"""
+    def _statistics_from_histogram(self, histogram: np.ndarray) -> Dict:
+        """Bloc statistique complet dérivé de l'histogramme"""
+        total = int(histogram.sum())
+        present = np.flatnonzero(histogram)
+        
+        if total == 0:
+            return {
+                'entropy': 0.0,
+                'mean_byte_value': 0.0,
+                'std_byte_value': 0.0,
+                'min_byte_value': 0,
+                'max_byte_value': 0,
+                'unique_bytes_count': 0,
+                'unique_bytes_ratio': 0.0,
+                'null_bytes_count': 0,
+                'null_bytes_ratio': 0.0,
+                'printable_bytes_ratio': 0.0,
+                'high_bytes_ratio': 0.0,
+            }
+        
+        # Moments d'ordre 1 et 2 (somme entière exacte pour la moyenne)
+        mean = int(histogram @ _BYTE_VALUES) / total
+        variance = float(histogram @ (_BYTE_VALUES - mean) ** 2) / total
+        
+        features = {
+            # Entropie de Shannon (mesure de randomness)
+            'entropy': self._entropy_from_histogram(histogram),
+            
+            # Statistiques descriptives
+            'mean_byte_value': mean,
+            'std_byte_value': float(np.sqrt(variance)),
+            'min_byte_value': int(present[0]),
+            'max_byte_value': int(present[-1]),
+            
+            # Distribution
+            'unique_bytes_count': len(present),
+            'unique_bytes_ratio': len(present) / 256.0,
+        }
+        
+        # Distribution par plages de bytes
+        features.update(self._byte_distribution(histogram))
+        
+        return features
+    
+    def _byte_distribution(self, histogram: np.ndarray) -> Dict:
+        """Distribution des bytes par catégories (à partir de l'histogramme)"""
+        total = histogram.sum()
         features = {}
         
         # Bytes NULL (0x00)
-        features['null_bytes_count'] = int(np.sum(byte_array == 0))
-        features['null_bytes_ratio'] = float(np.mean(byte_array == 0))
+        features['null_bytes_count'] = int(histogram[0])
+        features['null_bytes_ratio'] = float(histogram[0] / total)
         
         # Bytes ASCII imprimables (0x20-0x7E)
-        printable = (byte_array >= 0x20) & (byte_array <= 0x7E)
-        features['printable_bytes_ratio'] = float(np.mean(printable))
+        features['printable_bytes_ratio'] = float(histogram[0x20:0x7F].sum() / total)
         
         # Bytes haute valeur (> 127)
-        features['high_bytes_ratio'] = float(np.mean(byte_array > 127))
+        features['high_bytes_ratio'] = float(histogram[0x80:].sum() / total)
         
         return features
     
@@ -166,89 +499,199 @@ class BinaryFeatureExtractor:
         
         return {f'signature_{k}': int(v) for k, v in signatures.items()}
     
-    def _count_high_entropy_sections(self, data: bytes, window_size: int = 256, threshold: float = 7.5) -> int:
-        """Compte le nombre de sections avec haute entropie (possiblement chiffré)"""
-        count = 0
+    def entropy_profile(self, data: bytes) -> np.ndarray:
+        """
+        Profil d'entropie complet (une valeur par fenêtre)
         
-        for i in range(0, len(data) - window_size, window_size):
-            section = data[i:i + window_size]
-            byte_array = np.frombuffer(section, dtype=np.uint8)
-            entropy = self._calculate_entropy(byte_array)
+        Args:
+            data: Données binaires
             
-            if entropy > threshold:
-                count += 1
-        
-        return count
+        Returns:
+            Array float64 des entropies de fenêtres
+        """
+        return self.entropy_profiler.profile(np.frombuffer(data, dtype=np.uint8))
     
-    def _count_repeated_sequences(self, data: bytes, min_length: int = 4, min_repeats: int = 3) -> int:
-        """Compte les séquences répétées (packing, obfuscation)"""
-        # Simplifié pour performance
-        sequences = {}
-        count = 0
-        
-        for i in range(0, len(data) - min_length, min_length):
-            seq = data[i:i + min_length]
-            sequences[seq] = sequences.get(seq, 0) + 1
-            
-            if sequences[seq] == min_repeats:
-                count += 1
-        
-        return count
+    def _count_high_entropy_sections(self, data: bytes, window_size: int = 256, threshold: float = 7.5) -> int:
+        """Compte le nombre de sections avec haute entropie (possiblement chiffré)"""
+        profiler = EntropyProfiler(window_size=window_size, threshold=threshold)
+        profile = profiler.profile(np.frombuffer(data, dtype=np.uint8))
+        return int(np.count_nonzero(profile > threshold))
     
-    def _calculate_printable_ratio(self, data: bytes) -> float:
+    def _calculate_printable_ratio(self, byte_array: np.ndarray) -> float:
         """Ratio de caractères imprimables (strings, messages)"""
-        printable_count = sum(1 for b in data if 32 <= b <= 126)
-        return printable_count / len(data) if len(data) > 0 else 0.0
+        if len(byte_array) == 0:
+            return 0.0
+        # Une seule comparaison : (b - 0x20) déborde en uint8 pour b < 0x20
+        printable_count = np.count_nonzero((byte_array - np.uint8(0x20)) < 0x5F)
+        return printable_count / len(byte_array)
 
 
 class PEFileFeatureExtractor:
     """Extraction spécifique pour fichiers PE (Windows executables)"""
     
-    def __init__(self):
+    # DLLs importées indicatrices de comportement réseau
+    SUSPICIOUS_DLLS = ('ws2_32.dll', 'wininet.dll', 'urlmon.dll')
+    
+    def __init__(self, fast: bool = True, max_bytes: int = 32 << 20, timeout: float = 2.0,
+                 packed_entropy_threshold: float = 7.0):
+        """
+        Args:
+            fast: Lire les en-têtes d'abord et ne décoder que les répertoires utiles
+                  (False = pefile.PE complet, comportement historique)
+            max_bytes: Nombre maximum de bytes analysés par fichier
+            timeout: Budget de temps (secondes) du décodage des répertoires (debug,
+                     imports, exports) ; vérifié entre deux répertoires, les
+                     répertoires restants sont alors ignorés (pe_parse_truncated).
+                     La lecture des en-têtes et de la table des sections
+                     (pefile.PE(fast_load=True)) n'est pas interrompue : son coût
+                     est borné par max_bytes. Sans effet avec fast=False
+            packed_entropy_threshold: Entropie d'une section exécutable au-delà de
+                                      laquelle le fichier est considéré packé
+        """
+        self.fast = fast
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.packed_entropy_threshold = packed_entropy_threshold
+        
+        # Sans pefile, les en-têtes sont lus avec le module struct (pe_header)
         self.pe_available = False
         try:
             import pefile
             self.pe = pefile
             self.pe_available = True
         except ImportError:
-            print("Warning: pefile non installé. Installer avec: pip install pefile")
+            self.pe = None
     
     def extract_pe_features(self, data: bytes) -> Dict:
-        """Extrait des features spécifiques aux PE files"""
-        if not self.pe_available:
+        """
+        Extrait des features spécifiques aux PE files
+        
+        Args:
+            data: Données binaires (bytes, memoryview ou mmap)
+            
+        Returns:
+            Dictionnaire de features ({} si les données ne sont pas un PE)
+        """
+        view = memoryview(data).cast('B')
+        if bytes(view[:2]) != b'MZ':
             return {}
+        if self.max_bytes is not None:
+            view = view[:self.max_bytes]
+        
+        deadline = time.monotonic() + self.timeout if self.timeout is not None else None
         
         try:
-            pe = self.pe.PE(data=data)
-            
-            features = {
-                # Header info
-                'pe_machine': pe.FILE_HEADER.Machine,
-                'pe_timestamp': pe.FILE_HEADER.TimeDateStamp,
-                'pe_num_sections': pe.FILE_HEADER.NumberOfSections,
-                
-                # Sections
-                'pe_section_count': len(pe.sections),
-                'pe_has_debug': int(hasattr(pe, 'DIRECTORY_ENTRY_DEBUG')),
-                
-                # Imports/Exports
-                'pe_num_imports': len(pe.DIRECTORY_ENTRY_IMPORT) if hasattr(pe, 'DIRECTORY_ENTRY_IMPORT') else 0,
-                'pe_num_exports': len(pe.DIRECTORY_ENTRY_EXPORT.symbols) if hasattr(pe, 'DIRECTORY_ENTRY_EXPORT') else 0,
-            }
-            
-            # DLLs importées (indicateurs de comportement)
-            if hasattr(pe, 'DIRECTORY_ENTRY_IMPORT'):
-                suspicious_dlls = ['ws2_32.dll', 'wininet.dll', 'urlmon.dll']  # Network
-                for entry in pe.DIRECTORY_ENTRY_IMPORT:
-                    dll_name = entry.dll.decode().lower()
-                    if dll_name in suspicious_dlls:
-                        features[f'pe_imports_{dll_name}'] = 1
-            
-            return features
+            if not self.pe_available:
+                return self._features_from_struct(PEHeaderReader(view), deadline)
+            if self.fast:
+                pe = self.pe.PE(data=bytes(view), fast_load=True)
+                return self._features_from_pefile(pe, lazy=True, deadline=deadline)
+            return self._features_from_pefile(self.pe.PE(data=bytes(view)))
             
         except Exception as e:
             print(f"Erreur extraction PE: {e}")
             return {}
+    
+    def extract_section_features(self, data: bytes, byte_array: np.ndarray = None) -> Dict:
+        """
+        Features par section : entropies, ratios taille disque / mémoire, sections exécutables
+        
+        Les sections sont lues sur des vues de byte_array (aucune copie) et leurs
+        entropies calculées ensemble sur la matrice des histogrammes.
+        
+        Args:
+            data: Données binaires
+            byte_array: Vue uint8 de data déjà construite (évite une conversion)
+            
+        Returns:
+            Dictionnaire à clés fixes (num_sections, code_section_entropy,
+            data_section_entropy, is_packed, ...), nul si data n'est pas un PE
+        """
+        if byte_array is None:
+            byte_array = np.frombuffer(data, dtype=np.uint8)
+        
+        accumulator = self.section_accumulator()
+        accumulator.update(byte_array)
+        return accumulator.result()
+    
+    def section_accumulator(self) -> PESectionAccumulator:
+        """Accumulateur incrémental des features par section (mode streaming)"""
+        return PESectionAccumulator(packed_entropy_threshold=self.packed_entropy_threshold)
+    
+    def _features_from_pefile(self, pe, lazy: bool = False, deadline: float = None) -> Dict:
+        """
+        Features depuis un objet pefile
+        
+        Args:
+            pe: pefile.PE
+            lazy: pe a été chargé avec fast_load (répertoires décodés ici)
+            deadline: Instant (time.monotonic) au-delà duquel on s'arrête
+        """
+        features = {
+            # Header info
+            'pe_machine': pe.FILE_HEADER.Machine,
+            'pe_timestamp': pe.FILE_HEADER.TimeDateStamp,
+            'pe_num_sections': pe.FILE_HEADER.NumberOfSections,
+            
+            # Sections
+            'pe_section_count': len(pe.sections),
+        }
+        
+        truncated = False
+        if lazy:
+            # Un répertoire à la fois, tant que le budget de temps le permet
+            for name in ('IMAGE_DIRECTORY_ENTRY_DEBUG', 'IMAGE_DIRECTORY_ENTRY_IMPORT',
+                         'IMAGE_DIRECTORY_ENTRY_EXPORT'):
+                if _expired(deadline):
+                    truncated = True
+                    break
+                pe.parse_data_directories(directories=[self.pe.DIRECTORY_ENTRY[name]],
+                                          import_dllnames_only=True)
+        
+        imports = getattr(pe, 'DIRECTORY_ENTRY_IMPORT', [])
+        features['pe_has_debug'] = int(hasattr(pe, 'DIRECTORY_ENTRY_DEBUG'))
+        
+        # Imports/Exports
+        features['pe_num_imports'] = len(imports)
+        features['pe_num_exports'] = (len(pe.DIRECTORY_ENTRY_EXPORT.symbols)
+                                      if hasattr(pe, 'DIRECTORY_ENTRY_EXPORT') else 0)
+        features['pe_parse_truncated'] = int(truncated)
+        
+        dll_names = [entry.dll.decode(errors='replace') for entry in imports]
+        features.update(self._dll_flags(dll_names))
+        return features
+    
+    def _features_from_struct(self, reader: PEHeaderReader, deadline: float = None) -> Dict:
+        """Features depuis PEHeaderReader (sans pefile)"""
+        features = {
+            'pe_machine': reader.machine,
+            'pe_timestamp': reader.timestamp,
+            'pe_num_sections': reader.num_sections,
+            'pe_section_count': len(reader.sections),
+            'pe_has_debug': int(reader.has_debug()),
+        }
+        
+        dll_names = reader.import_dlls(deadline=deadline)
+        truncated = _expired(deadline)
+        features['pe_num_imports'] = len(dll_names)
+        features['pe_num_exports'] = 0 if truncated else reader.export_count()
+        features['pe_parse_truncated'] = int(truncated)
+        
+        features.update(self._dll_flags(dll_names))
+        return features
+    
+    def _dll_flags(self, dll_names: List[str]) -> Dict:
+        """DLLs importées (indicateurs de comportement)"""
+        flags = {}
+        for dll_name in dll_names:
+            dll_name = dll_name.lower()
+            if dll_name in self.SUSPICIOUS_DLLS:
+                flags[f'pe_imports_{dll_name}'] = 1
+        return flags
+
+
+def _expired(deadline: float) -> bool:
+    return deadline is not None and time.monotonic() > deadline
 
 
 if __name__ == "__main__":
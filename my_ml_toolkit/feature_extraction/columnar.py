@@ -0,0 +1,286 @@
+"""
+Sortie colonnaire (struct-of-arrays) pour l'extraction par lots
+Un schéma fixe décrit les colonnes ; les features de chaque échantillon sont
+écrites directement dans des arrays numpy typés préalloués
+"""
+
+import operator
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Tuple
+
+
+# Modes d'export des colonnes d'empreintes (voir ColumnarBatch.to_frame)
+IDENTIFIER_MODES = ('hex', 'binary', 'drop')
+
+# Valeur de chaque caractère hexadécimal (minuscule ou majuscule) par code ASCII
+_HEX_VALUES = np.zeros(256, dtype=np.uint8)
+for _code, _char in enumerate(b'0123456789abcdef'):
+    _HEX_VALUES[_char] = _code
+    _HEX_VALUES[ord(chr(_char).upper())] = _code
+_HEX_DIGITS = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+
+
+def _dtype_of(value) -> np.dtype:
+    """Type numpy d'une colonne à partir d'une valeur représentative"""
+    if isinstance(value, (bool, np.bool_)):
+        return np.dtype(bool)
+    if isinstance(value, (int, np.integer)):
+        return np.dtype(np.int64)
+    if isinstance(value, (float, np.floating)):
+        return np.dtype(np.float64)
+    return np.dtype(object)
+
+
+class FeatureSchema:
+    """Liste ordonnée et figée de colonnes (nom, dtype numpy)"""
+
+    def __init__(self, columns: Iterable[Tuple[str, object]], identifiers: Dict[str, int] = None):
+        """
+        Args:
+            columns: Paires (nom, dtype) dans l'ordre des colonnes produites
+            identifiers: Colonnes d'empreintes {nom: taille en bytes}, reçues en
+                         hexadécimal et stockées en binaire brut (dtype S{taille})
+        """
+        self.columns = [(name, np.dtype(dtype)) for name, dtype in columns]
+        self.names = [name for name, _ in self.columns]
+        if len(set(self.names)) != len(self.names):
+            raise ValueError("Le schéma contient des colonnes en double")
+
+        self.identifiers = dict(identifiers or {})
+        dtypes = dict(self.columns)
+        for name, num_bytes in self.identifiers.items():
+            if dtypes.get(name) != np.dtype(f'S{num_bytes}'):
+                raise ValueError(f"La colonne d'empreinte '{name}' doit être de type S{num_bytes}")
+
+    @classmethod
+    def from_sample(cls, features: Dict) -> 'FeatureSchema':
+        """
+        Schéma déduit d'un dictionnaire de features représentatif
+
+        Args:
+            features: Sortie d'un extract_all_features
+
+        Returns:
+            FeatureSchema (int -> int64, float -> float64, autres -> object)
+        """
+        return cls((name, _dtype_of(value)) for name, value in features.items())
+
+    def with_columns(self, columns: Iterable[Tuple[str, object]]) -> 'FeatureSchema':
+        """Copie du schéma avec des colonnes ajoutées ou retypées"""
+        updated = dict(self.columns)
+        identifiers = dict(self.identifiers)
+        for name, dtype in columns:
+            updated[name] = np.dtype(dtype)
+            identifiers.pop(name, None)
+        return FeatureSchema(updated.items(), identifiers=identifiers)
+
+    @property
+    def nbytes_per_row(self) -> int:
+        """Taille d'une ligne en mémoire (hors objets Python des colonnes object)"""
+        return sum(dtype.itemsize for _, dtype in self.columns)
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, FeatureSchema) and self.columns == other.columns
+                and self.identifiers == other.identifiers)
+
+
+class ColumnarBatch:
+    """
+    Lot de features stocké colonne par colonne
+
+    Les colonnes absentes d'un échantillon reçoivent une valeur par défaut
+    (NaN pour les flottants, 0 pour les entiers, '' pour les chaînes) ;
+    les clés hors schéma sont ignorées.
+
+    Les lignes sont tamponnées par blocs de `flush_rows` puis transposées :
+    chaque colonne est écrite en une affectation de tranche plutôt qu'un
+    élément à la fois.
+
+    Les colonnes d'empreintes du schéma (schema.identifiers) sont reçues en
+    hexadécimal et converties en binaire brut au moment de l'écriture.
+    """
+
+    def __init__(self, schema: FeatureSchema, capacity: int = 1024, flush_rows: int = 4096):
+        """
+        Args:
+            schema: Colonnes du lot
+            capacity: Nombre de lignes préallouées (doublé si nécessaire)
+            flush_rows: Nombre de lignes tamponnées avant écriture dans les arrays
+        """
+        self.schema = schema
+        self.flush_rows = flush_rows
+        self._size = 0
+        self._capacity = max(capacity, 1)
+        self._arrays = {name: np.empty(self._capacity, dtype=dtype) for name, dtype in schema}
+        self._defaults = [
+            (name, '0' * 2 * schema.identifiers[name] if name in schema.identifiers else _fill_value(dtype))
+            for name, dtype in schema
+        ]
+        self._getter = operator.itemgetter(*schema.names) if len(schema) > 1 else None
+        self._pending = []
+
+    def __len__(self) -> int:
+        return self._size + len(self._pending)
+
+    def append(self, features: Dict):
+        """
+        Ajoute un échantillon
+
+        Args:
+            features: Dictionnaire {colonne: valeur}
+        """
+        try:
+            # Cas courant : toutes les colonnes présentes, lecture en un appel C
+            row = self._getter(features)
+        except (KeyError, TypeError):
+            get = features.get
+            row = [get(name, default) for name, default in self._defaults]
+        self._pending.append(row)
+        if len(self._pending) >= self.flush_rows:
+            self._flush()
+
+    def extend(self, samples: Iterable[Dict]):
+        """Ajoute plusieurs échantillons"""
+        for features in samples:
+            self.append(features)
+
+    def column(self, name: str) -> np.ndarray:
+        """Vue sur les valeurs remplies d'une colonne"""
+        self._flush()
+        return self._arrays[name][:self._size]
+
+    @property
+    def nbytes(self) -> int:
+        """Mémoire occupée par les lignes remplies (hors objets Python des colonnes object)"""
+        return len(self) * self.schema.nbytes_per_row
+
+    def to_frame(self, identifiers: str = 'hex') -> pd.DataFrame:
+        """
+        Conversion en DataFrame (une colonne par array, sans liste de dictionnaires)
+
+        Args:
+            identifiers: Export des colonnes d'empreintes : 'hex' (chaînes),
+                         'binary' (bytes de largeur fixe) ou 'drop' (colonnes
+                         retirées, pour une matrice d'entraînement)
+
+        Returns:
+            DataFrame avec les colonnes dans l'ordre du schéma
+        """
+        return pd.DataFrame({
+            name: self._export(name, dtype, identifiers)
+            for name, dtype in self._exported_columns(identifiers)
+        })
+
+    def to_arrow(self, identifiers: str = 'hex'):
+        """
+        Conversion en table Arrow (pyarrow requis)
+
+        Args:
+            identifiers: Export des colonnes d'empreintes ('hex', 'binary' ou 'drop') ;
+                         en 'binary' les colonnes sont de type fixed_size_binary
+
+        Returns:
+            pyarrow.Table avec les colonnes dans l'ordre du schéma
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("pyarrow non installé. Installer avec: pip install pyarrow")
+
+        arrays, names = [], []
+        for name, dtype in self._exported_columns(identifiers):
+            if identifiers == 'binary' and name in self.schema.identifiers:
+                # Buffer des empreintes repris tel quel, sans objet bytes par ligne
+                width = self.schema.identifiers[name]
+                values = np.ascontiguousarray(self.column(name))
+                arrays.append(pa.FixedSizeBinaryArray.from_buffers(
+                    pa.binary(width), len(values), [None, pa.py_buffer(values.view(np.uint8))]
+                ))
+            else:
+                values = self._export(name, dtype, identifiers)
+                if values.dtype.kind == 'O':
+                    values = values.tolist()
+                arrays.append(pa.array(values))
+            names.append(name)
+        return pa.Table.from_arrays(arrays, names=names)
+
+    def _exported_columns(self, identifiers: str) -> list:
+        if identifiers not in IDENTIFIER_MODES:
+            raise ValueError(f"identifiers doit valoir {', '.join(IDENTIFIER_MODES)}")
+        if identifiers == 'drop':
+            return [(name, dtype) for name, dtype in self.schema if name not in self.schema.identifiers]
+        return self.schema.columns
+
+    def _export(self, name: str, dtype: np.dtype, identifiers: str = 'hex') -> np.ndarray:
+        """Colonne prête à l'export (chaînes ASCII de largeur fixe décodées en str)"""
+        values = self.column(name)
+        if name in self.schema.identifiers:
+            # Lecture par la vue uint8 : les bytes nuls finaux d'une empreinte
+            # seraient perdus en passant par les scalaires numpy 'S'
+            raw = np.ascontiguousarray(values).view(np.uint8).reshape(len(values), dtype.itemsize)
+            if identifiers == 'binary':
+                return np.array([row.tobytes() for row in raw], dtype=object)
+            return _bytes_to_hex(raw)
+        if dtype.kind == 'S':
+            return np.char.decode(values, 'ascii').astype(object)
+        return values
+
+    def _flush(self):
+        """Transpose les lignes tamponnées et les écrit colonne par colonne"""
+        if not self._pending:
+            return
+
+        stop = self._size + len(self._pending)
+        if stop > self._capacity:
+            self._grow(max(stop, self._capacity * 2))
+
+        identifiers = self.schema.identifiers
+        for (name, _), values in zip(self._defaults, zip(*self._pending)):
+            if name in identifiers:
+                values = _hex_to_bytes(values, identifiers[name])
+            self._arrays[name][self._size:stop] = values
+        self._size = stop
+        self._pending = []
+
+    def _grow(self, capacity: int):
+        for name, array in self._arrays.items():
+            grown = np.empty(capacity, dtype=array.dtype)
+            grown[:self._size] = array[:self._size]
+            self._arrays[name] = grown
+        self._capacity = capacity
+
+
+def _fill_value(dtype: np.dtype):
+    if dtype.kind == 'f':
+        return np.nan
+    if dtype.kind in 'US':
+        return dtype.type()
+    if dtype.kind == 'O':
+        return ''
+    return 0
+
+
+def _hex_to_bytes(values, num_bytes: int) -> np.ndarray:
+    """Empreintes hexadécimales -> array S{num_bytes} (conversion vectorisée)"""
+    digits = np.array(values, dtype=f'S{2 * num_bytes}')
+    codes = digits.view(np.uint8).reshape(len(digits), 2 * num_bytes)
+    nibbles = _HEX_VALUES[codes]
+    packed = (nibbles[:, 0::2] << 4) | nibbles[:, 1::2]
+    return np.ascontiguousarray(packed).view(f'S{num_bytes}').ravel()
+
+
+def _bytes_to_hex(raw: np.ndarray) -> np.ndarray:
+    """Matrice (n, taille) uint8 -> array object de chaînes hexadécimales"""
+    digits = np.empty((len(raw), 2 * raw.shape[1]), dtype=np.uint8)
+    digits[:, 0::2] = _HEX_DIGITS[raw >> 4]
+    digits[:, 1::2] = _HEX_DIGITS[raw & 0x0F]
+    text = digits.view(f'S{digits.shape[1]}').ravel()
+    return np.char.decode(text, 'ascii').astype(object)
@@ -0,0 +1,226 @@
+"""
+Moteur de profil d'entropie par fenêtres glissantes
+Calcule l'entropie de toutes les fenêtres d'un fichier en une passe vectorisée
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict
+
+
+class EntropyProfiler:
+    """Profil d'entropie de Shannon sur fenêtres (éventuellement chevauchantes)"""
+
+    def __init__(self, window_size: int = 256, step: int = None, threshold: float = 7.5,
+                 block_windows: int = 256):
+        """
+        Args:
+            window_size: Taille des fenêtres en bytes
+            step: Pas entre deux fenêtres (None = window_size, sans chevauchement)
+            threshold: Seuil d'entropie au-delà duquel une fenêtre est "haute entropie"
+            block_windows: Nombre de fenêtres histogrammées par lot (lot tenant en cache)
+        """
+        if window_size <= 0:
+            raise ValueError("window_size doit être strictement positif")
+        if step is None:
+            step = window_size
+        if step <= 0:
+            raise ValueError("step doit être strictement positif")
+
+        self.window_size = window_size
+        self.step = step
+        self.threshold = threshold
+        self.block_windows = block_windows
+
+        # Table c * log2(c) pour tous les effectifs possibles d'une fenêtre
+        counts = np.arange(window_size + 1, dtype=np.float64)
+        self._plogp = np.zeros(window_size + 1, dtype=np.float64)
+        self._plogp[1:] = counts[1:] * np.log2(counts[1:])
+        self._log_window = float(np.log2(window_size))
+
+    def num_windows(self, length: int) -> int:
+        """Nombre de fenêtres complètes pour un buffer de `length` bytes"""
+        if length < self.window_size:
+            return 0
+        return (length - self.window_size) // self.step + 1
+
+    def profile(self, byte_array: np.ndarray) -> np.ndarray:
+        """
+        Calcule l'entropie de chaque fenêtre
+
+        Args:
+            byte_array: Données binaires (array uint8)
+
+        Returns:
+            Array float64 de taille num_windows(len(byte_array))
+        """
+        n_windows = self.num_windows(len(byte_array))
+        entropies = np.empty(n_windows, dtype=np.float64)
+        if n_windows == 0:
+            return entropies
+
+        # Vue (n_windows, window_size) sans copie des données
+        windows = sliding_window_view(byte_array, self.window_size)[::self.step]
+
+        # Buffer d'indices réutilisé d'un lot à l'autre
+        block_rows = min(self.block_windows, n_windows)
+        offsets = (np.arange(block_rows, dtype=np.intp) * 256)[:, None]
+        indices = np.empty((block_rows, self.window_size), dtype=np.intp)
+
+        for start in range(0, n_windows, block_rows):
+            block = windows[start:start + block_rows]
+            n_rows = len(block)
+            np.add(block, offsets[:n_rows], out=indices[:n_rows])
+            entropies[start:start + n_rows] = self._block_entropy(indices[:n_rows])
+
+        return entropies
+
+    def summarize(self, entropies: np.ndarray) -> Dict:
+        """
+        Features dérivées d'un profil d'entropie
+
+        Args:
+            entropies: Profil retourné par profile()
+
+        Returns:
+            Dictionnaire de features
+        """
+        accumulator = self.accumulator()
+        accumulator.update(entropies)
+        return accumulator.result()
+
+    def accumulator(self) -> 'EntropyProfileAccumulator':
+        """Accumulateur incrémental des features dérivées (mode streaming)"""
+        return EntropyProfileAccumulator(self.threshold)
+
+    def extract_features(self, byte_array: np.ndarray) -> Dict:
+        """Profil + features dérivées en un appel"""
+        return self.summarize(self.profile(byte_array))
+
+    def _block_entropy(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Entropie d'un lot de fenêtres via un histogramme groupé unique
+
+        Args:
+            indices: Bytes de chaque fenêtre décalés de 256 * rang de la ligne,
+                     de sorte que chaque fenêtre occupe sa propre plage de bins
+        """
+        n_rows = len(indices)
+        counts = np.bincount(indices.ravel(), minlength=n_rows * 256)
+        counts = counts.reshape(n_rows, 256)
+
+        # H = log2(W) - sum(c * log2(c)) / W
+        return self._log_window - np.take(self._plogp, counts).sum(axis=1) / self.window_size
+
+
+class EntropyProfileAccumulator:
+    """
+    Réduit un profil d'entropie reçu par morceaux en features dérivées
+
+    Les moments sont agrégés par groupes de GROUP_SIZE fenêtres alignés sur
+    l'index de fenêtre : le résultat est identique au bit près quelle que soit
+    la façon dont le profil est découpé.
+    """
+
+    GROUP_SIZE = 4096
+
+    def __init__(self, threshold: float):
+        """
+        Args:
+            threshold: Seuil des fenêtres "haute entropie"
+        """
+        self.threshold = threshold
+        self.count = 0
+        self.high_count = 0
+        self.max = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self._merged_count = 0
+        self.current_run = 0
+        self.longest_run = 0
+        self._pending = np.empty(0, dtype=np.float64)
+
+    def update(self, entropies: np.ndarray):
+        """Ajoute les entropies des fenêtres suivantes du profil"""
+        if len(entropies) == 0:
+            return
+
+        self.max = max(self.max, float(entropies.max()))
+        self.count += len(entropies)
+
+        high = entropies > self.threshold
+        self.high_count += int(np.count_nonzero(high))
+        self._update_runs(high)
+
+        # Moments par groupes de taille fixe (ordre de sommation déterministe)
+        pending = np.concatenate((self._pending, entropies))
+        n_full = len(pending) - len(pending) % self.GROUP_SIZE
+        for start in range(0, n_full, self.GROUP_SIZE):
+            self._merge_group(pending[start:start + self.GROUP_SIZE])
+        self._pending = pending[n_full:].copy()
+
+    def result(self) -> Dict:
+        """Features dérivées du profil reçu jusqu'ici"""
+        if self.count == 0:
+            return {
+                'high_entropy_sections': 0,
+                'entropy_profile_max': 0.0,
+                'entropy_profile_mean': 0.0,
+                'entropy_profile_var': 0.0,
+                'entropy_longest_high_run': 0,
+            }
+
+        # Le dernier groupe incomplet est fusionné sur une copie de l'état
+        n, mean, m2 = self._merged(len(self._pending), *self._group_moments(self._pending))
+
+        return {
+            'high_entropy_sections': self.high_count,
+            'entropy_profile_max': self.max,
+            'entropy_profile_mean': float(mean),
+            'entropy_profile_var': float(m2 / n),
+            'entropy_longest_high_run': max(self.longest_run, self.current_run),
+        }
+
+    def _update_runs(self, high: np.ndarray):
+        """Suit la plus longue suite de fenêtres hautes, y compris entre morceaux"""
+        if high.all():
+            self.current_run += len(high)
+            return
+
+        low = np.flatnonzero(~high)
+        leading = int(low[0])
+        trailing = len(high) - 1 - int(low[-1])
+        self.longest_run = max(self.longest_run, self.current_run + leading, _longest_run(high))
+        self.current_run = trailing
+
+    def _merge_group(self, group: np.ndarray):
+        self._merged_count, self.mean, self.m2 = self._merged(len(group), *self._group_moments(group))
+
+    def _merged(self, n_group: int, group_mean: float, group_m2: float) -> tuple:
+        """Fusion de Chan (n, moyenne, M2) de l'état courant avec un groupe"""
+        n = self._merged_count
+        if n_group == 0:
+            return n, self.mean, self.m2
+        total = n + n_group
+        delta = group_mean - self.mean
+        mean = self.mean + delta * n_group / total
+        m2 = self.m2 + group_m2 + delta * delta * n * n_group / total
+        return total, mean, m2
+
+    @staticmethod
+    def _group_moments(group: np.ndarray) -> tuple:
+        if len(group) == 0:
+            return 0.0, 0.0
+        mean = float(group.mean())
+        return mean, float(np.sum((group - mean) ** 2))
+
+
+def _longest_run(mask: np.ndarray) -> int:
+    """Plus longue suite de True consécutifs"""
+    if not mask.any():
+        return 0
+    padded = np.concatenate(([False], mask, [False])).astype(np.int8)
+    edges = np.diff(padded)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return int((ends - starts).max())
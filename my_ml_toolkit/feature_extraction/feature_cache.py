@@ -0,0 +1,254 @@
+"""
+Cache persistant de features indexé par le contenu (SHA-256)
+Évite de ré-extraire les échantillons déjà vus (DAG quotidien, uploads API)
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+
+class FeatureCache:
+    """
+    Cache SQLite (sha256, configuration) -> features, avec éviction LRU
+
+    La configuration identifie le jeu de features (version + paramètres de
+    l'extracteur) : plusieurs configurations peuvent partager un même
+    fichier, leurs entrées ne se mélangent pas. Les entrées d'anciennes
+    configurations disparaissent par éviction LRU, ou explicitement avec
+    invalidate().
+
+    Le nombre d'entrées est tenu à jour dans la base (même transaction que
+    l'insertion) : put() ne recompte pas la table. Les dates d'accès des
+    lectures réussies sont écrites par lots (flush()).
+
+    La base est en mode WAL (les lectures ne bloquent pas l'écriture) et
+    chaque connexion attend jusqu'à `timeout` secondes un verrou tenu par un
+    autre processus (workers d'extraction, DAG) au lieu d'échouer.
+    """
+
+    def __init__(self, path: str, max_entries: int = 100_000, access_batch: int = 256,
+                 timeout: float = 30.0):
+        """
+        Args:
+            path: Fichier SQLite (créé si absent, ':memory:' pour un cache volatil)
+            max_entries: Nombre maximum d'entrées conservées
+            access_batch: Nombre de dates d'accès gardées en mémoire avant écriture
+            timeout: Attente maximale (secondes) d'un verrou tenu par une autre connexion
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries doit être strictement positif")
+
+        self.path = path
+        self.max_entries = max_entries
+        self.access_batch = access_batch
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._accessed = {}
+
+    def __getstate__(self) -> Dict:
+        # La connexion n'est pas sérialisable : elle est rouverte dans le worker
+        state = self.__dict__.copy()
+        state['_conn'] = None
+        state['_lock'] = None
+        state['_accessed'] = {}
+        return state
+
+    def __setstate__(self, state: Dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def bind(self, config_key: str):
+        """
+        Déclare la configuration courante (les entrées des autres configurations sont conservées)
+
+        Args:
+            config_key: Empreinte du jeu de features (BinaryFeatureExtractor.config_key)
+        """
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('config_key', ?)",
+                (config_key,),
+            )
+            conn.commit()
+
+    def invalidate(self, config_key: str) -> int:
+        """
+        Supprime les entrées de toutes les configurations autres que `config_key`
+
+        Returns:
+            Nombre d'entrées supprimées
+        """
+        with self._lock:
+            conn = self._connection()
+            removed = conn.execute("DELETE FROM features WHERE config_key != ?", (config_key,)).rowcount
+            self._add_entries(conn, -removed)
+            conn.commit()
+            self._accessed = {key: t for key, t in self._accessed.items() if key[1] == config_key}
+        return removed
+
+    def get(self, sha256: str, config_key: str) -> Optional[Dict]:
+        """
+        Features en cache pour un contenu, ou None
+
+        Args:
+            sha256: Empreinte SHA-256 (hex) du contenu
+            config_key: Empreinte du jeu de features
+        """
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT payload FROM features WHERE sha256 = ? AND config_key = ?",
+                (sha256, config_key),
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            # Date d'accès écrite plus tard, avec d'autres (pas de transaction par lecture)
+            self._accessed[(sha256, config_key)] = time.time()
+            if len(self._accessed) >= self.access_batch:
+                self._flush_accessed(conn)
+                conn.commit()
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, sha256: str, config_key: str, features: Dict):
+        """
+        Enregistre les features d'un contenu (éviction LRU si le cache est plein)
+
+        Args:
+            sha256: Empreinte SHA-256 (hex) du contenu
+            config_key: Empreinte du jeu de features
+            features: Dictionnaire de features (valeurs sérialisables en JSON)
+        """
+        payload = json.dumps(features)
+
+        with self._lock:
+            conn = self._connection()
+            now = time.time()
+            inserted = conn.execute(
+                "INSERT OR IGNORE INTO features (sha256, config_key, payload, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (sha256, config_key, payload, now),
+            ).rowcount
+            if inserted:
+                self._add_entries(conn, 1)
+            else:
+                conn.execute(
+                    "UPDATE features SET payload = ?, last_access = ? WHERE sha256 = ? AND config_key = ?",
+                    (payload, now, sha256, config_key),
+                )
+
+            excess = self._entries(conn) - self.max_entries
+            if excess > 0:
+                # Les dates d'accès en attente comptent pour l'ordre LRU
+                self._flush_accessed(conn)
+                removed = conn.execute(
+                    "DELETE FROM features WHERE rowid IN "
+                    "(SELECT rowid FROM features ORDER BY last_access ASC LIMIT ?)",
+                    (excess,),
+                ).rowcount
+                self._add_entries(conn, -removed)
+                self.evictions += removed
+            conn.commit()
+
+    def flush(self):
+        """Écrit les dates d'accès en attente"""
+        with self._lock:
+            if self._accessed:
+                conn = self._connection()
+                self._flush_accessed(conn)
+                conn.commit()
+
+    def counters(self) -> Dict:
+        """Compteurs hits / misses / evictions de ce processus"""
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+    def add_counters(self, counters: Dict):
+        """Ajoute des compteurs (ceux d'un worker, par exemple)"""
+        self.hits += counters.get('hits', 0)
+        self.misses += counters.get('misses', 0)
+        self.evictions += counters.get('evictions', 0)
+
+    def clear(self):
+        """Vide complètement le cache"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM features")
+            conn.execute("UPDATE counters SET value = 0 WHERE name = 'entries'")
+            conn.commit()
+            self._accessed = {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._entries(self._connection())
+
+    def stats(self) -> Dict:
+        """Compteurs d'utilisation du cache"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self),
+        }
+
+    def close(self):
+        """Écrit les dates d'accès en attente et ferme la connexion SQLite"""
+        if self._conn is not None:
+            self.flush()
+            self._conn.close()
+            self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=self.timeout)
+            self._conn.execute(f"PRAGMA busy_timeout = {int(self.timeout * 1000)}")
+            # Écrivains concurrents (workers, DAG) : lectures sans blocage, un verrou d'écriture court
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS features ("
+                "sha256 TEXT NOT NULL, config_key TEXT NOT NULL, payload TEXT NOT NULL, "
+                "last_access REAL NOT NULL, PRIMARY KEY (sha256, config_key))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_features_last_access ON features (last_access)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            # Base créée sans compteur : un seul comptage complet
+            self._conn.execute(
+                "INSERT OR IGNORE INTO counters (name, value) "
+                "SELECT 'entries', COUNT(*) FROM features"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _entries(self, conn: sqlite3.Connection) -> int:
+        return conn.execute("SELECT value FROM counters WHERE name = 'entries'").fetchone()[0]
+
+    def _add_entries(self, conn: sqlite3.Connection, delta: int):
+        if delta:
+            conn.execute("UPDATE counters SET value = value + ? WHERE name = 'entries'", (delta,))
+
+    def _flush_accessed(self, conn: sqlite3.Connection):
+        """Écrit les dates d'accès en attente (sans commit)"""
+        conn.executemany(
+            "UPDATE features SET last_access = ? WHERE sha256 = ? AND config_key = ?",
+            [(t, sha256, config_key) for (sha256, config_key), t in self._accessed.items()],
+        )
+        self._accessed = {}
@@ -0,0 +1,148 @@
+"""
+Registre des types de features (dtypes compacts)
+Chaque feature produite par les extracteurs est déclarée avec le plus petit
+dtype qui la représente : drapeaux uint8, effectifs uint32 (uint64 s'ils
+sont bornés par la taille du fichier), ratios float32,
+empreintes en binaire de largeur fixe
+"""
+
+import re
+import numpy as np
+from typing import Dict, Iterable, List, Tuple
+
+from .columnar import FeatureSchema, _dtype_of
+
+
+class FeatureRegistry:
+    """Associe un dtype à chaque nom de feature (nom exact ou motif)"""
+
+    def __init__(self):
+        self._exact = {}
+        self._patterns = []
+        self._identifiers = {}
+
+    def register(self, name: str, dtype, pattern: bool = False):
+        """
+        Déclare le dtype d'une feature
+
+        Args:
+            name: Nom exact, ou expression régulière si pattern=True
+            dtype: dtype numpy de la colonne
+            pattern: name est une expression régulière (fullmatch)
+        """
+        if pattern:
+            self._patterns.append((re.compile(name), np.dtype(dtype)))
+        else:
+            self._exact[name] = np.dtype(dtype)
+
+    def register_identifier(self, name: str, num_bytes: int):
+        """
+        Déclare une empreinte hexadécimale stockée en binaire de largeur fixe
+
+        Args:
+            name: Nom de la colonne (ex: 'sha256')
+            num_bytes: Taille de l'empreinte brute (16 pour MD5, 32 pour SHA-256)
+        """
+        self._identifiers[name] = num_bytes
+        self._exact[name] = np.dtype(f'S{num_bytes}')
+
+    def dtype_for(self, name: str, value=None) -> np.dtype:
+        """
+        dtype déclaré pour une feature
+
+        Args:
+            name: Nom de la feature
+            value: Valeur représentative, utilisée si le nom n'est pas déclaré
+                   (flottants et valeur absente -> float32, entiers -> int64)
+
+        Returns:
+            dtype numpy
+        """
+        if name in self._exact:
+            return self._exact[name]
+        for regex, dtype in self._patterns:
+            if regex.fullmatch(name):
+                return dtype
+
+        if value is None:
+            return np.dtype(np.float32)
+        dtype = _dtype_of(value)
+        return np.dtype(np.float32) if dtype.kind == 'f' else dtype
+
+    def schema(self, names: Iterable[str]) -> FeatureSchema:
+        """Schéma compact pour une liste de noms déclarés"""
+        names = list(names)
+        return FeatureSchema(
+            [(name, self.dtype_for(name)) for name in names],
+            identifiers=self._identifiers_in(names),
+        )
+
+    def schema_from_sample(self, features: Dict) -> FeatureSchema:
+        """Schéma compact pour un dictionnaire de features représentatif"""
+        return FeatureSchema(
+            [(name, self.dtype_for(name, value)) for name, value in features.items()],
+            identifiers=self._identifiers_in(features),
+        )
+
+    def _identifiers_in(self, names: Iterable[str]) -> Dict[str, int]:
+        return {name: self._identifiers[name] for name in names if name in self._identifiers}
+
+
+def _default_registry() -> FeatureRegistry:
+    registry = FeatureRegistry()
+
+    # Empreintes : binaire brut (16 / 32 / 8 bytes au lieu de 32 / 64 / 16 caractères)
+    registry.register_identifier('md5', 16)
+    registry.register_identifier('sha256', 32)
+    registry.register_identifier('fast_hash', 8)
+
+    rules: List[Tuple[str, object, bool]] = [
+        # Tailles (fichiers de plus de 4 Go possibles)
+        ('file_size', np.uint64, False),
+
+        # Drapeaux 0/1
+        (r'signature_is_\w+', np.uint8, True),
+        (r'pe_imports_.+', np.uint8, True),
+        ('is_packed', np.uint8, False),
+        ('pe_has_debug', np.uint8, False),
+        ('pe_parse_truncated', np.uint8, False),
+
+        # Valeurs de bytes
+        ('min_byte_value', np.uint8, False),
+        ('max_byte_value', np.uint8, False),
+
+        # Effectifs bornés par la taille du fichier (plus de 2**32 au-delà de 4 Go)
+        ('null_bytes_count', np.uint64, False),
+        ('high_entropy_sections', np.uint64, False),
+        ('entropy_longest_high_run', np.uint64, False),
+        ('repeated_sequences', np.uint64, False),
+        (r'repeat\d+_(distinct|max_count)', np.uint64, True),
+
+        # Effectifs bornés par le format ou la configuration
+        ('unique_bytes_count', np.uint32, False),
+        (r'ngram\d+_distinct', np.uint32, True),
+        ('num_sections', np.uint32, False),
+        ('num_executable_sections', np.uint32, False),
+        ('num_writable_executable_sections', np.uint32, False),
+        (r'pe_(machine|num_sections|section_count|num_imports|num_exports)', np.uint32, True),
+        ('pe_timestamp', np.uint32, False),
+
+        # Texte : effectifs toujours présents (bornés par la taille du texte)
+        ('text_length', np.uint64, False),
+        ('word_count', np.uint64, False),
+        ('char_count', np.uint64, False),
+        ('sentence_count', np.uint64, False),
+
+        # Texte : features statistiques absentes pour un texte vide (NaN)
+        ('unique_words', np.float32, False),
+        ('max_word_length', np.float32, False),
+        ('min_word_length', np.float32, False),
+    ]
+    for name, dtype, pattern in rules:
+        registry.register(name, dtype, pattern=pattern)
+
+    return registry
+
+
+# Registre utilisé par les extracteurs du toolkit (les autres flottants -> float32)
+DEFAULT_REGISTRY = _default_registry()
@@ -0,0 +1,139 @@
+"""
+Empreintes de contenu calculées en une seule lecture
+MD5 et SHA-256 (et optionnellement une empreinte rapide non cryptographique)
+sont alimentés par les mêmes morceaux, lus une seule fois
+"""
+
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+
+# Empreinte rapide : xxh3-64 si xxhash est installé, sinon BLAKE2b tronqué à 64 bits
+FAST_HASH_NAME = 'xxh3_64' if xxhash is not None else 'blake2b_64'
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Au-delà de cette taille, MD5 est calculé par le thread du hasher pendant que
+# le thread courant calcule SHA-256 (hashlib relâche le GIL sur les gros buffers)
+PARALLEL_THRESHOLD = 1 << 20
+
+
+def _new_fast_hash():
+    if xxhash is not None:
+        return xxhash.xxh3_64()
+    return hashlib.blake2b(digest_size=8)
+
+
+class ContentHasher:
+    """
+    Calcule plusieurs empreintes d'un contenu reçu par morceaux
+
+    Chaque morceau est donné successivement à tous les algorithmes pendant
+    qu'il est encore en cache processeur. Les gros morceaux sont donnés à
+    MD5 par un unique thread propre au hasher, créé au premier gros morceau
+    et arrêté par hexdigests().
+    """
+
+    def __init__(self, fast: bool = False, parallel_threshold: int = PARALLEL_THRESHOLD):
+        """
+        Args:
+            fast: Ajouter l'empreinte rapide non cryptographique ('fast_hash')
+            parallel_threshold: Taille de morceau à partir de laquelle MD5 et
+                                SHA-256 sont calculés dans deux threads
+        """
+        self.fast = fast
+        self.parallel_threshold = parallel_threshold
+        self._md5 = hashlib.md5(usedforsecurity=False)
+        self._sha256 = hashlib.sha256()
+        self._fast = _new_fast_hash() if fast else None
+        self._executor = None
+
+    def update(self, chunk):
+        """
+        Ajoute le morceau suivant
+
+        Args:
+            chunk: Données binaires (bytes, bytearray ou memoryview)
+        """
+        if len(chunk) >= self.parallel_threshold:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='md5')
+            # Attendu avant de rendre la main : l'appelant peut réutiliser son buffer
+            pending = self._executor.submit(self._md5.update, chunk)
+            self._sha256.update(chunk)
+            pending.result()
+        else:
+            self._md5.update(chunk)
+            self._sha256.update(chunk)
+
+        if self._fast is not None:
+            self._fast.update(chunk)
+
+    def hexdigests(self) -> Dict[str, str]:
+        """
+        Empreintes du contenu reçu jusqu'ici
+
+        Returns:
+            {'md5': ..., 'sha256': ...} (+ 'fast_hash' si fast=True)
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        digests = {
+            'md5': self._md5.hexdigest(),
+            'sha256': self._sha256.hexdigest(),
+        }
+        if self._fast is not None:
+            digests['fast_hash'] = self._fast.hexdigest()
+        return digests
+
+
+def hash_bytes(data, fast: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, str]:
+    """
+    Empreintes d'un contenu en mémoire
+
+    Args:
+        data: Données binaires (bytes, bytearray, memoryview ou mmap)
+        fast: Ajouter l'empreinte rapide ('fast_hash')
+        chunk_size: Taille des morceaux donnés aux algorithmes
+
+    Returns:
+        Dictionnaire d'empreintes hexadécimales (voir ContentHasher.hexdigests)
+    """
+    hasher = ContentHasher(fast=fast)
+    view = memoryview(data).cast('B')
+    for start in range(0, len(view), chunk_size):
+        hasher.update(view[start:start + chunk_size])
+    return hasher.hexdigests()
+
+
+def hash_file(filepath: str, fast: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, str]:
+    """
+    Empreintes d'un fichier, lu une seule fois par morceaux (mémoire bornée)
+
+    Args:
+        filepath: Chemin du fichier
+        fast: Ajouter l'empreinte rapide ('fast_hash')
+        chunk_size: Taille des lectures
+
+    Returns:
+        Dictionnaire d'empreintes hexadécimales (voir ContentHasher.hexdigests)
+    """
+    hasher = ContentHasher(fast=fast)
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+
+    with open(filepath, 'rb') as f:
+        while True:
+            n_read = f.readinto(buffer)
+            if not n_read:
+                break
+            hasher.update(view[:n_read])
+
+    return hasher.hexdigests()
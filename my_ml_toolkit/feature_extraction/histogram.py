@@ -0,0 +1,40 @@
+"""
+Histogrammes de bytes (256 bins) partagés par les blocs de features
+"""
+
+import numpy as np
+
+
+def byte_histogram(byte_array: np.ndarray, block_size: int = 1 << 20) -> np.ndarray:
+    """
+    Histogramme 256 bins des valeurs de bytes (un seul passage sur les données)
+    
+    Args:
+        byte_array: Données binaires (array uint8)
+        block_size: Taille des lots passés à np.bincount (borne la copie en intp)
+        
+    Returns:
+        Array int64 de taille 256
+    """
+    histogram = np.zeros(256, dtype=np.int64)
+    for start in range(0, len(byte_array), block_size):
+        histogram += np.bincount(byte_array[start:start + block_size], minlength=256)
+    return histogram
+
+
+def histogram_entropy(histograms: np.ndarray) -> np.ndarray:
+    """
+    Entropie de Shannon de chaque ligne d'une matrice d'histogrammes
+    
+    Args:
+        histograms: Array (n, 256) d'effectifs
+        
+    Returns:
+        Array float64 de taille n (0.0 pour un histogramme vide)
+    """
+    histograms = np.atleast_2d(histograms)
+    totals = histograms.sum(axis=1, keepdims=True)
+    probabilities = histograms / np.maximum(totals, 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = np.where(probabilities > 0, probabilities * np.log2(probabilities), 0.0)
+    return -terms.sum(axis=1) + 0.0
@@ -0,0 +1,134 @@
+"""
+Histogrammes de n-grams de bytes basés sur des arrays numpy
+Remplace le comptage par Counter sur des slices Python
+"""
+
+import numpy as np
+from typing import Dict
+
+
+# Constantes de hachage multiplicatif (Fibonacci / Knuth)
+_HASH_MULT_32 = np.uint32(0x9E3779B1)
+_HASH_MULT_64 = np.uint64(0x9E3779B97F4A7C15)
+
+
+class ByteNgramCounter:
+    """Compte les n-grams de bytes dans un histogramme de taille fixe"""
+
+    def __init__(self, n: int = 2, num_buckets: int = 64, hash_bits: int = 16,
+                 block_size: int = 1 << 20):
+        """
+        Args:
+            n: Taille des n-grams (1 à 8)
+            num_buckets: Nombre de colonnes de features (repliement de l'histogramme)
+            hash_bits: Taille (log2) de l'histogramme haché pour n >= 3
+            block_size: Nombre de positions traitées par lot (borne la mémoire)
+        """
+        if not 1 <= n <= 8:
+            raise ValueError("n doit être compris entre 1 et 8")
+        if num_buckets <= 0:
+            raise ValueError("num_buckets doit être strictement positif")
+
+        self.n = n
+        self.num_buckets = num_buckets
+        self.hash_bits = hash_bits
+        self.block_size = block_size
+
+        # Unigrams et bigrams : histogramme exact (256 / 65 536 bins)
+        if n <= 2:
+            self.num_bins = 256 ** n
+        else:
+            self.num_bins = 1 << hash_bits
+
+        # Repliement fixe bin -> colonne, identique pour tous les fichiers
+        bins = np.arange(self.num_bins, dtype=np.uint64)
+        self._fold = ((bins * _HASH_MULT_64) >> np.uint64(32)) % np.uint64(num_buckets)
+        self._fold = self._fold.astype(np.intp)
+
+        width = len(str(num_buckets - 1))
+        self.bucket_names = [f'ngram{n}_bucket_{i:0{width}d}' for i in range(num_buckets)]
+
+    @property
+    def feature_names(self) -> list:
+        """Noms des colonnes produites, dans l'ordre"""
+        return self.bucket_names + [
+            f'ngram{self.n}_distinct',
+            f'ngram{self.n}_entropy',
+            f'ngram{self.n}_top_freq',
+        ]
+
+    def histogram(self, byte_array: np.ndarray) -> np.ndarray:
+        """
+        Histogramme des n-grams
+
+        Args:
+            byte_array: Données binaires (array uint8)
+
+        Returns:
+            Array int64 de taille num_bins
+        """
+        counts = np.zeros(self.num_bins, dtype=np.int64)
+        n_positions = len(byte_array) - self.n + 1
+
+        for start in range(0, max(n_positions, 0), self.block_size):
+            stop = min(start + self.block_size, n_positions)
+            # Le lot déborde de n-1 bytes pour couvrir les n-grams à cheval
+            block = byte_array[start:stop + self.n - 1]
+            counts += np.bincount(self._bin_indices(block), minlength=self.num_bins)
+
+        return counts
+
+    def extract_features(self, byte_array: np.ndarray) -> Dict:
+        """
+        Features n-grams à largeur fixe
+
+        Args:
+            byte_array: Données binaires (array uint8)
+
+        Returns:
+            Dictionnaire {colonne: valeur} avec toujours les mêmes clés
+        """
+        return self.features_from_histogram(self.histogram(byte_array))
+
+    def features_from_histogram(self, counts: np.ndarray) -> Dict:
+        """Features dérivées d'un histogramme produit par histogram()"""
+        total = int(counts.sum())
+        features = dict.fromkeys(self.feature_names, 0.0)
+        features[f'ngram{self.n}_distinct'] = 0
+
+        if total == 0:
+            return features
+
+        folded = np.bincount(self._fold, weights=counts, minlength=self.num_buckets) / total
+        features.update(zip(self.bucket_names, folded.tolist()))
+
+        nonzero = counts[counts > 0]
+        probabilities = nonzero / total
+        features[f'ngram{self.n}_distinct'] = int(len(nonzero))
+        features[f'ngram{self.n}_entropy'] = float(-np.sum(probabilities * np.log2(probabilities)))
+        features[f'ngram{self.n}_top_freq'] = float(nonzero.max() / total)
+
+        return features
+
+    def _bin_indices(self, block: np.ndarray) -> np.ndarray:
+        """Index de bin de chaque n-gram d'un lot"""
+        n_positions = len(block) - self.n + 1
+
+        if self.n == 1:
+            return block
+        if self.n == 2:
+            # Empaquetage hi * 256 + lo
+            return (block[:-1].astype(np.uint16) << 8) | block[1:]
+
+        # n >= 3 : empaquetage dans un entier puis hachage multiplicatif
+        if self.n <= 4:
+            dtype, mult, word_bits = np.uint32, _HASH_MULT_32, 32
+        else:
+            dtype, mult, word_bits = np.uint64, _HASH_MULT_64, 64
+
+        packed = np.zeros(n_positions, dtype=dtype)
+        for k in range(self.n):
+            packed <<= dtype(8)
+            packed |= block[k:k + n_positions]
+
+        return (packed * mult) >> dtype(word_bits - self.hash_bits)
@@ -0,0 +1,197 @@
+"""
+Lecture des en-têtes PE (Windows executables) avec le module struct
+Alternative sans dépendance à pefile : seuls les en-têtes sont lus d'emblée,
+les répertoires (imports, exports, debug) sont décodés à la demande
+"""
+
+import struct
+import time
+from typing import List, NamedTuple, Optional
+
+
+# Index des répertoires de données (IMAGE_DIRECTORY_ENTRY_*)
+DIRECTORY_EXPORT = 0
+DIRECTORY_IMPORT = 1
+DIRECTORY_DEBUG = 6
+
+# Limites de robustesse face aux fichiers malformés
+MAX_SECTIONS = 96
+MAX_DLL_NAME = 256
+
+_COFF_HEADER = struct.Struct('<HHIIIHH')
+_SECTION_HEADER = struct.Struct('<8sIIIIIIHHI')
+_IMPORT_DESCRIPTOR = struct.Struct('<IIIII')
+_DATA_DIRECTORY = struct.Struct('<II')
+
+
+class PEFormatError(ValueError):
+    """Données qui ne sont pas un PE valide"""
+
+
+class PESection(NamedTuple):
+    """En-tête de section"""
+    name: str
+    virtual_address: int
+    virtual_size: int
+    raw_offset: int
+    raw_size: int
+    characteristics: int
+
+
+class PEHeaderReader:
+    """
+    En-têtes PE lus directement dans le buffer, sans copie
+
+    Le constructeur ne lit que les en-têtes DOS / COFF / optionnel et la
+    table des sections ; import_dlls(), export_count() et has_debug()
+    décodent leur répertoire au premier appel.
+    """
+
+    def __init__(self, data):
+        """
+        Args:
+            data: Contenu du fichier (bytes, bytearray, memoryview ou mmap)
+
+        Raises:
+            PEFormatError: Si les en-têtes sont absents ou tronqués
+        """
+        self.data = memoryview(data).cast('B')
+
+        if len(self.data) < 64 or bytes(self.data[:2]) != b'MZ':
+            raise PEFormatError("Signature DOS 'MZ' absente")
+
+        pe_offset = self._unpack('<I', 0x3C)[0]
+        if bytes(self.data[pe_offset:pe_offset + 4]) != b'PE\x00\x00':
+            raise PEFormatError("Signature 'PE' absente")
+
+        (self.machine, self.num_sections, self.timestamp, _, _,
+         optional_size, self.characteristics) = self._unpack(_COFF_HEADER, pe_offset + 4)
+
+        optional_offset = pe_offset + 24
+        self.magic = self._unpack('<H', optional_offset)[0]
+        if self.magic == 0x10B:
+            self.is_64bit = False
+            directories_offset = optional_offset + 96
+        elif self.magic == 0x20B:
+            self.is_64bit = True
+            directories_offset = optional_offset + 112
+        else:
+            raise PEFormatError(f"Magic d'en-tête optionnel inconnu: {self.magic:#x}")
+
+        self.entry_point = self._unpack('<I', optional_offset + 16)[0]
+        self.size_of_image = self._unpack('<I', optional_offset + 56)[0]
+        self.size_of_headers = self._unpack('<I', optional_offset + 60)[0]
+        self.subsystem, self.dll_characteristics = self._unpack('<HH', optional_offset + 68)
+
+        # Répertoires de données présents dans l'en-tête optionnel
+        num_directories = self._unpack('<I', directories_offset - 4)[0]
+        available = max(0, optional_offset + optional_size - directories_offset) // _DATA_DIRECTORY.size
+        self.directories = []
+        for index in range(min(num_directories, available, 16)):
+            self.directories.append(
+                self._unpack(_DATA_DIRECTORY, directories_offset + index * _DATA_DIRECTORY.size)
+            )
+
+        self.sections = self._read_sections(optional_offset + optional_size)
+
+        self._import_dlls = None
+        self._export_count = None
+
+    def directory(self, index: int) -> tuple:
+        """(rva, taille) du répertoire `index`, (0, 0) s'il est absent"""
+        if index < len(self.directories):
+            return self.directories[index]
+        return 0, 0
+
+    def rva_to_offset(self, rva: int) -> Optional[int]:
+        """Offset dans le fichier d'une adresse virtuelle relative (None si hors fichier)"""
+        if rva < self.size_of_headers:
+            return rva if rva < len(self.data) else None
+
+        for section in self.sections:
+            span = max(section.virtual_size, section.raw_size)
+            if section.virtual_address <= rva < section.virtual_address + span:
+                offset = rva - section.virtual_address + section.raw_offset
+                return offset if offset < len(self.data) else None
+        return None
+
+    def import_dlls(self, max_entries: int = 4096, deadline: float = None) -> List[str]:
+        """
+        Noms des DLL importées (répertoire d'imports décodé au premier appel)
+
+        Args:
+            max_entries: Nombre maximum de descripteurs lus
+            deadline: Instant (time.monotonic) au-delà duquel la lecture s'arrête
+
+        Returns:
+            Liste des noms de DLL, dans l'ordre du répertoire
+        """
+        if self._import_dlls is not None:
+            return self._import_dlls
+
+        dlls = []
+        rva, size = self.directory(DIRECTORY_IMPORT)
+        offset = self.rva_to_offset(rva) if rva and size else None
+
+        if offset is not None:
+            for index in range(max_entries):
+                if deadline is not None and index % 64 == 0 and time.monotonic() > deadline:
+                    break
+                start = offset + index * _IMPORT_DESCRIPTOR.size
+                if start + _IMPORT_DESCRIPTOR.size > len(self.data):
+                    break
+                descriptor = _IMPORT_DESCRIPTOR.unpack_from(self.data, start)
+                if not any(descriptor):
+                    break
+                name = self._read_string(descriptor[3])
+                if name is not None:
+                    dlls.append(name)
+
+        self._import_dlls = dlls
+        return dlls
+
+    def export_count(self) -> int:
+        """Nombre de fonctions exportées (0 sans répertoire d'exports)"""
+        if self._export_count is None:
+            self._export_count = 0
+            rva, size = self.directory(DIRECTORY_EXPORT)
+            offset = self.rva_to_offset(rva) if rva and size else None
+            if offset is not None and offset + 24 <= len(self.data):
+                self._export_count = struct.unpack_from('<I', self.data, offset + 20)[0]
+        return self._export_count
+
+    def has_debug(self) -> bool:
+        """Présence d'un répertoire de debug lisible"""
+        rva, size = self.directory(DIRECTORY_DEBUG)
+        return bool(rva and size) and self.rva_to_offset(rva) is not None
+
+    def _read_sections(self, table_offset: int) -> List[PESection]:
+        sections = []
+        for index in range(min(self.num_sections, MAX_SECTIONS)):
+            start = table_offset + index * _SECTION_HEADER.size
+            if start + _SECTION_HEADER.size > len(self.data):
+                break
+            (name, virtual_size, virtual_address, raw_size, raw_offset,
+             _, _, _, _, characteristics) = _SECTION_HEADER.unpack_from(self.data, start)
+            sections.append(PESection(
+                name=name.rstrip(b'\x00').decode('latin-1'),
+                virtual_address=virtual_address,
+                virtual_size=virtual_size,
+                raw_offset=raw_offset,
+                raw_size=raw_size,
+                characteristics=characteristics,
+            ))
+        return sections
+
+    def _read_string(self, rva: int) -> Optional[str]:
+        offset = self.rva_to_offset(rva)
+        if offset is None:
+            return None
+        raw = bytes(self.data[offset:offset + MAX_DLL_NAME])
+        return raw.split(b'\x00', 1)[0].decode('latin-1')
+
+    def _unpack(self, fmt, offset: int) -> tuple:
+        unpacker = fmt if isinstance(fmt, struct.Struct) else struct.Struct(fmt)
+        if offset < 0 or offset + unpacker.size > len(self.data):
+            raise PEFormatError("En-têtes PE tronqués")
+        return unpacker.unpack_from(self.data, offset)
@@ -0,0 +1,159 @@
+"""
+Features par section PE calculées sur des vues du buffer partagé
+Les histogrammes de sections sont alimentés au fil des données : le même
+code sert au chemin en mémoire et au mode streaming
+"""
+
+import numpy as np
+from typing import Dict
+
+from .histogram import byte_histogram, histogram_entropy
+from .pe_header import PEFormatError, PEHeaderReader, PESection
+
+
+# Les en-têtes et la table des sections doivent tenir dans ce préfixe
+SECTION_HEADER_LIMIT = 1 << 16
+
+# Drapeaux IMAGE_SCN_*
+SCN_CNT_CODE = 0x00000020
+SCN_CNT_INITIALIZED_DATA = 0x00000040
+SCN_MEM_EXECUTE = 0x20000000
+SCN_MEM_WRITE = 0x80000000
+
+# Noms de sections laissés par des packers courants
+PACKER_SECTION_NAMES = frozenset({
+    'UPX0', 'UPX1', 'UPX2', '.aspack', '.adata', '.MPRESS1', '.MPRESS2',
+    '.petite', '.nsp0', '.nsp1', '.nsp2', '.themida', '.vmp0', '.vmp1', 'PEC2', 'pebundle',
+})
+
+# Valeurs produites pour un fichier qui n'est pas un PE (schéma fixe)
+EMPTY_SECTION_FEATURES = {
+    'num_sections': 0,
+    'code_section_entropy': 0.0,
+    'data_section_entropy': 0.0,
+    'is_packed': 0,
+    'section_entropy_max': 0.0,
+    'section_entropy_mean': 0.0,
+    'section_raw_virtual_ratio_min': 0.0,
+    'section_raw_virtual_ratio_max': 0.0,
+    'num_executable_sections': 0,
+    'num_writable_executable_sections': 0,
+    'executable_size_ratio': 0.0,
+}
+
+
+def _is_executable(section: PESection) -> bool:
+    return bool(section.characteristics & (SCN_MEM_EXECUTE | SCN_CNT_CODE))
+
+
+class PESectionAccumulator:
+    """
+    Histogrammes des sections d'un PE reçu par morceaux
+
+    Les premiers bytes sont conservés jusqu'à SECTION_HEADER_LIMIT pour lire
+    la table des sections ; ensuite chaque morceau est découpé en vues sur les
+    plages [PointerToRawData, PointerToRawData + SizeOfRawData) qu'il recouvre.
+    """
+
+    def __init__(self, packed_entropy_threshold: float = 7.0):
+        """
+        Args:
+            packed_entropy_threshold: Entropie d'une section exécutable au-delà
+                                      de laquelle le fichier est considéré packé
+        """
+        self.packed_entropy_threshold = packed_entropy_threshold
+        self.size = 0
+        self.sections = None        # None tant que les en-têtes ne sont pas lus
+        self._histograms = None
+        self._head = []
+        self._head_size = 0
+
+    def update(self, byte_array: np.ndarray):
+        """Ajoute les bytes suivants du fichier (array uint8)"""
+        if len(byte_array) == 0:
+            return
+
+        offset = self.size
+        self.size += len(byte_array)
+
+        if self.sections is not None:
+            self._accumulate(byte_array, offset)
+            return
+
+        # En-têtes pas encore lus : mise en attente du préfixe
+        self._head.append(byte_array)
+        self._head_size += len(byte_array)
+        if self._head_size >= SECTION_HEADER_LIMIT:
+            self._resolve()
+
+    def result(self) -> Dict:
+        """Features par section (valeurs nulles si les données ne sont pas un PE)"""
+        if self.sections is None:
+            self._resolve()
+
+        if not self.sections:
+            return dict(EMPTY_SECTION_FEATURES)
+
+        sections = self.sections
+        executable = np.array([_is_executable(s) for s in sections])
+        writable = np.array([bool(s.characteristics & SCN_MEM_WRITE) for s in sections])
+        data = np.array([bool(s.characteristics & SCN_CNT_INITIALIZED_DATA) for s in sections]) & ~executable
+
+        # Entropies de toutes les sections en une opération sur la matrice (n, 256)
+        entropies = histogram_entropy(self._histograms)
+        code_entropy, data_entropy = histogram_entropy(np.stack((
+            self._histograms[executable].sum(axis=0),
+            self._histograms[data].sum(axis=0),
+        )))
+
+        raw_sizes = np.array([s.raw_size for s in sections], dtype=np.float64)
+        virtual_sizes = np.array([s.virtual_size for s in sections], dtype=np.float64)
+        # VirtualSize nul : la taille en mémoire est celle sur disque
+        ratios = raw_sizes / np.where(virtual_sizes > 0, virtual_sizes, np.maximum(raw_sizes, 1))
+
+        executable_bytes = int(self._histograms[executable].sum())
+        packer_name = any(s.name in PACKER_SECTION_NAMES for s in sections)
+        high_entropy_code = bool(executable.any()) and entropies[executable].max() > self.packed_entropy_threshold
+
+        return {
+            'num_sections': len(sections),
+            'code_section_entropy': float(code_entropy),
+            'data_section_entropy': float(data_entropy),
+            'is_packed': int(packer_name or high_entropy_code or bool((executable & writable).any())),
+            'section_entropy_max': float(entropies.max()),
+            'section_entropy_mean': float(entropies.mean()),
+            'section_raw_virtual_ratio_min': float(ratios.min()),
+            'section_raw_virtual_ratio_max': float(ratios.max()),
+            'num_executable_sections': int(executable.sum()),
+            'num_writable_executable_sections': int((executable & writable).sum()),
+            'executable_size_ratio': executable_bytes / self.size if self.size else 0.0,
+        }
+
+    def _resolve(self):
+        """Lit la table des sections dans le préfixe puis traite les bytes en attente"""
+        if len(self._head) == 1:
+            head = self._head[0]
+        else:
+            head = np.concatenate(self._head) if self._head else np.empty(0, dtype=np.uint8)
+        self._head = []
+        self._head_size = 0
+
+        try:
+            self.sections = PEHeaderReader(head[:SECTION_HEADER_LIMIT]).sections
+        except PEFormatError:
+            self.sections = []
+
+        self._histograms = np.zeros((len(self.sections), 256), dtype=np.int64)
+        if self.sections:
+            self._accumulate(head, 0)
+
+    def _accumulate(self, byte_array: np.ndarray, offset: int):
+        """Ajoute aux histogrammes les plages de sections recouvertes par le morceau"""
+        end = offset + len(byte_array)
+        for index, section in enumerate(self.sections):
+            lo = max(section.raw_offset, offset)
+            hi = min(section.raw_offset + section.raw_size, end)
+            if lo < hi:
+                # Vue sur le buffer partagé : aucune copie par section
+                self._histograms[index] += byte_histogram(byte_array[lo - offset:hi - offset])
+
@@ -0,0 +1,246 @@
+"""
+Détection de séquences de bytes répétées basée sur des arrays numpy
+Remplace le dictionnaire Python indexé par des slices de bytes
+"""
+
+import numpy as np
+from typing import Dict, Sequence
+
+
+class RepeatedSequenceCounter:
+    """
+    Compte les séquences de longueur fixe qui se répètent (packing, obfuscation)
+
+    Chaque séquence de L bytes est empaquetée dans un entier (uint32 jusqu'à
+    4 bytes, uint64 jusqu'à 8) puis les effectifs sont obtenus par histogramme
+    (1 ou 2 bytes) ou par tri (np.unique) : aucun objet Python n'est créé par
+    séquence.
+    """
+
+    def __init__(self, lengths: Sequence[int] = (4,), aligned: bool = True, min_repeats: int = 3,
+                 block_size: int = 1 << 20):
+        """
+        Args:
+            lengths: Longueurs de séquences analysées en un seul appel (1 à 8)
+            aligned: True = blocs disjoints aux offsets multiples de L,
+                     False = toutes les positions (séquences chevauchantes)
+            min_repeats: Nombre d'occurrences à partir duquel une séquence est répétée
+            block_size: Nombre de positions triées par lot (borne la mémoire)
+        """
+        lengths = tuple(lengths)
+        if not lengths:
+            raise ValueError("lengths ne doit pas être vide")
+        if any(not 1 <= length <= 8 for length in lengths):
+            raise ValueError("Les longueurs de séquences doivent être comprises entre 1 et 8")
+        if len(set(lengths)) != len(lengths):
+            raise ValueError("lengths ne doit pas contenir de doublons")
+        if min_repeats < 2:
+            raise ValueError("min_repeats doit être supérieur ou égal à 2")
+
+        self.lengths = lengths
+        self.aligned = aligned
+        self.min_repeats = min_repeats
+        self.block_size = block_size
+
+    @property
+    def feature_names(self) -> list:
+        """Noms des colonnes produites, dans l'ordre"""
+        names = ['repeated_sequences']
+        for length in self.lengths:
+            if len(self.lengths) > 1:
+                names.append(f'repeat{length}_distinct')
+            names += [f'repeat{length}_max_count', f'repeat{length}_coverage']
+        return names
+
+    def accumulator(self) -> 'RepeatedSequenceAccumulator':
+        """Accumulateur incrémental (mode streaming)"""
+        return RepeatedSequenceAccumulator(self)
+
+    def extract_features(self, byte_array: np.ndarray) -> Dict:
+        """
+        Features de séquences répétées
+
+        Args:
+            byte_array: Données binaires (array uint8)
+
+        Returns:
+            Dictionnaire {colonne: valeur} avec toujours les mêmes clés
+        """
+        accumulator = self.accumulator()
+        accumulator.update(byte_array)
+        return accumulator.result()
+
+    def pack(self, byte_array: np.ndarray, length: int) -> np.ndarray:
+        """
+        Empaquette chaque séquence de `length` bytes dans un entier
+
+        Args:
+            byte_array: Données binaires (array uint8)
+            length: Longueur des séquences
+
+        Returns:
+            Array d'entiers, une valeur par séquence complète
+        """
+        step = length if self.aligned else 1
+        n_sequences = self.num_sequences(len(byte_array), length)
+        dtype = np.uint32 if length <= 4 else np.uint64
+        if n_sequences == 0:
+            return np.empty(0, dtype=dtype)
+
+        # Blocs alignés de 4 ou 8 bytes : réinterprétation du buffer (copiée,
+        # le buffer de l'appelant peut être réutilisé avant la fusion des tables)
+        if self.aligned and length in (4, 8):
+            return byte_array[:n_sequences * length].view(dtype).copy()
+
+        packed = np.zeros(n_sequences, dtype=dtype)
+        for k in range(length):
+            packed <<= dtype(8)
+            packed |= byte_array[k:k + (n_sequences - 1) * step + 1:step]
+        return packed
+
+    def num_sequences(self, length_bytes: int, length: int) -> int:
+        """Nombre de séquences complètes dans un buffer de `length_bytes` bytes"""
+        if length_bytes < length:
+            return 0
+        if self.aligned:
+            return length_bytes // length
+        return length_bytes - length + 1
+
+
+class RepeatedSequenceAccumulator:
+    """
+    Table (séquence, effectif) alimentée par morceaux successifs
+
+    Les bytes qui ne forment pas encore une séquence complète sont reportés
+    sur le morceau suivant : le résultat est identique quelle que soit la
+    façon dont les données sont découpées.
+    """
+
+    def __init__(self, counter: RepeatedSequenceCounter):
+        """
+        Args:
+            counter: RepeatedSequenceCounter dont la configuration est utilisée
+        """
+        self.counter = counter
+        self._tails = {length: np.empty(0, dtype=np.uint8) for length in counter.lengths}
+        self._tables = {length: _SequenceTable(length) for length in counter.lengths}
+
+    def update(self, byte_array: np.ndarray):
+        """Ajoute les bytes suivants (array uint8)"""
+        if len(byte_array) == 0:
+            return
+
+        counter = self.counter
+        for length in counter.lengths:
+            tail = self._tails[length]
+            buffer = np.concatenate((tail, byte_array)) if len(tail) else byte_array
+
+            n_sequences = counter.num_sequences(len(buffer), length)
+            step = length if counter.aligned else 1
+
+            # Lots de positions ; chaque lot déborde des bytes de sa dernière séquence
+            block = max(counter.block_size // step * step, step)
+            positions = n_sequences * step
+            for start in range(0, positions, block):
+                stop = min(start + block, positions)
+                chunk = buffer[start:stop - step + length]
+                self._tables[length].add(counter.pack(chunk, length))
+
+            # Bytes non consommés : début de la prochaine séquence
+            if counter.aligned:
+                self._tails[length] = buffer[n_sequences * length:].copy()
+            else:
+                self._tails[length] = buffer[len(buffer) - min(length - 1, len(buffer)):].copy()
+
+    def result(self) -> Dict:
+        """Features des données reçues jusqu'ici"""
+        counter = self.counter
+        features = {'repeated_sequences': 0}
+
+        for length in counter.lengths:
+            counts = self._tables[length].counts()
+            repeated = counts[counts >= counter.min_repeats]
+            total = int(counts.sum())
+
+            features['repeated_sequences'] += int(len(repeated))
+            if len(counter.lengths) > 1:
+                features[f'repeat{length}_distinct'] = int(len(repeated))
+            features[f'repeat{length}_max_count'] = int(counts.max()) if len(counts) else 0
+            # Part des séquences analysées qui appartiennent à une séquence répétée
+            features[f'repeat{length}_coverage'] = float(repeated.sum() / total) if total else 0.0
+
+        return features
+
+
+class _SequenceTable:
+    """
+    Effectifs par valeur de séquence
+
+    Séquences de 1 ou 2 bytes : histogramme direct (np.bincount sur au plus
+    65 536 cases), sans tri. Au-delà : les valeurs en attente sont triées une
+    seule fois par lot (np.unique), puis la table triée obtenue est fusionnée
+    avec la table accumulée par une fusion linéaire de deux séries triées,
+    sans retrier la table accumulée.
+    """
+
+    def __init__(self, length: int):
+        self._dense = np.zeros(1 << (8 * length), dtype=np.int64) if length <= 2 else None
+        self.values = np.empty(0, dtype=np.uint32 if length <= 4 else np.uint64)
+        self._counts = np.empty(0, dtype=np.int64)
+        self._pending = []
+        self._pending_count = 0
+
+    def add(self, values: np.ndarray):
+        if len(values) == 0:
+            return
+        if self._dense is not None:
+            self._dense += np.bincount(values, minlength=len(self._dense))
+            return
+        self._pending.append(values)
+        self._pending_count += len(values)
+
+        # Fusion dès que le lot en attente occupe autant de mémoire que la table
+        # (valeur + effectif int64 par entrée) : la table est retraitée O(log n) fois
+        itemsize = self.values.dtype.itemsize
+        if self._pending_count * itemsize >= max(len(self.values) * (itemsize + 8), 1 << 18):
+            self._merge()
+
+    def counts(self) -> np.ndarray:
+        if self._dense is not None:
+            return self._dense[self._dense > 0]
+        self._merge()
+        return self._counts
+
+    def _merge(self):
+        if not self._pending:
+            return
+
+        values, counts = np.unique(np.concatenate(self._pending), return_counts=True)
+        self._pending = []
+        self._pending_count = 0
+        self.values, self._counts = _merge_sorted(self.values, self._counts,
+                                                  values, counts.astype(np.int64))
+
+
+def _merge_sorted(values: np.ndarray, counts: np.ndarray, other_values: np.ndarray,
+                  other_counts: np.ndarray) -> tuple:
+    """
+    Fusion de deux tables (valeurs uniques triées, effectifs)
+
+    Le tri stable (timsort) de deux séries déjà triées se réduit à leur
+    fusion, en temps linéaire. Chaque valeur étant unique dans sa table, une
+    valeur commune forme exactement une paire de voisins, dont les effectifs
+    sont additionnés.
+    """
+    merged = np.concatenate((values, other_values))
+    order = np.argsort(merged, kind='stable')
+    merged = merged[order]
+    weights = np.concatenate((counts, other_counts))[order]
+
+    pairs = np.flatnonzero(merged[1:] == merged[:-1])
+    if len(pairs) == 0:
+        return merged, weights
+    weights[pairs] += weights[pairs + 1]
+    keep = np.ones(len(merged), dtype=bool)
+    keep[pairs + 1] = False
+    return merged[keep], weights[keep]
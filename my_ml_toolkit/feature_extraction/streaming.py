@@ -0,0 +1,128 @@
+"""
+Extraction de features binaires en streaming (fichiers volumineux)
+Consomme les données par morceaux avec une mémoire bornée
+"""
+
+import numpy as np
+from typing import Dict
+
+from .hashing import ContentHasher
+
+
+class BinaryFeatureStream:
+    """
+    État incrémental qui reproduit BinaryFeatureExtractor.extract_all_features
+
+    Les morceaux peuvent avoir n'importe quelle taille : le dictionnaire final
+    est identique à celui du chemin en mémoire. Seules les tables des séquences
+    répétées grandissent avec le nombre de séquences distinctes rencontrées.
+    """
+
+    def __init__(self, extractor):
+        """
+        Args:
+            extractor: BinaryFeatureExtractor dont la configuration est reproduite
+        """
+        self.extractor = extractor
+
+        self.size = 0
+        self._hasher = ContentHasher(fast=extractor.fast_hash)
+        self._histogram = np.zeros(256, dtype=np.int64)
+        self._head = b''
+
+        # Fenêtres d'entropie : bytes pas encore couverts par une fenêtre complète,
+        # et bytes à sauter avant la fenêtre suivante (pas plus grand que la fenêtre)
+        self._profile = extractor.entropy_profiler.accumulator()
+        self._window_tail = np.empty(0, dtype=np.uint8)
+        self._window_skip = 0
+
+        # N-grams : les n-1 derniers bytes sont reportés sur le morceau suivant
+        self._ngram_counts = np.zeros(extractor.ngram_counter.num_bins, dtype=np.int64)
+        self._ngram_tail = np.empty(0, dtype=np.uint8)
+
+        # Séquences répétées : tables (valeur, effectif) par longueur
+        self._sequences = extractor.sequence_counter.accumulator()
+
+        # Sections PE : histogrammes par plage de fichier
+        self._sections = None
+        if extractor.include_pe_sections:
+            self._sections = extractor.pe_extractor.section_accumulator()
+
+    def update(self, chunk: bytes):
+        """
+        Ajoute le morceau suivant du fichier
+
+        Args:
+            chunk: Données binaires (bytes, bytearray ou memoryview)
+        """
+        if len(chunk) == 0:
+            return
+
+        byte_array = np.frombuffer(chunk, dtype=np.uint8)
+
+        self.size += len(byte_array)
+        self._hasher.update(chunk)
+        self._histogram += np.bincount(byte_array, minlength=256)
+
+        if len(self._head) < 8:
+            self._head += bytes(byte_array[:8 - len(self._head)])
+
+        self._update_entropy_profile(byte_array)
+        if self.extractor.include_ngrams:
+            self._update_ngrams(byte_array)
+        self._sequences.update(byte_array)
+        if self._sections is not None:
+            self._sections.update(byte_array)
+
+    def finalize(self) -> Dict:
+        """
+        Features du fichier complet
+
+        Returns:
+            Dictionnaire identique à extract_all_features(contenu complet)
+        """
+        extractor = self.extractor
+
+        features = {'file_size': self.size}
+        features.update(self._hasher.hexdigests())
+
+        statistical = extractor._statistics_from_histogram(self._histogram)
+        features.update(statistical)
+
+        features.update(extractor._detect_file_signatures(self._head))
+        features.update(self._profile.result())
+        features.update(self._sequences.result())
+        features['printable_ratio'] = statistical['printable_bytes_ratio']
+
+        if extractor.include_ngrams:
+            features.update(extractor.ngram_counter.features_from_histogram(self._ngram_counts))
+
+        if self._sections is not None:
+            features.update(self._sections.result())
+
+        return features
+
+    def _update_entropy_profile(self, byte_array: np.ndarray):
+        profiler = self.extractor.entropy_profiler
+        if self._window_skip:
+            skipped = min(self._window_skip, len(byte_array))
+            self._window_skip -= skipped
+            byte_array = byte_array[skipped:]
+        buffer = np.concatenate((self._window_tail, byte_array))
+
+        self._profile.update(profiler.profile(buffer))
+
+        # La prochaine fenêtre commence après la dernière fenêtre calculée,
+        # éventuellement au-delà de la fin du buffer (step > window_size)
+        consumed = profiler.num_windows(len(buffer)) * profiler.step
+        self._window_skip += max(consumed - len(buffer), 0)
+        self._window_tail = buffer[consumed:].copy()
+
+    def _update_ngrams(self, byte_array: np.ndarray):
+        counter = self.extractor.ngram_counter
+        buffer = np.concatenate((self._ngram_tail, byte_array))
+
+        self._ngram_counts += counter.histogram(buffer)
+
+        keep = min(counter.n - 1, len(buffer))
+        self._ngram_tail = buffer[len(buffer) - keep:].copy()
@@ -4,22 +4,37 @@ Module d'extraction de features pour données textuelles
 
 import re
 import numpy as np
+import pandas as pd
 from collections import Counter
-from typing import Dict, List
+from typing import Dict, Iterable, List
 from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
 
+from ..precision import resolve_float_dtype
+from .columnar import ColumnarBatch
+from .feature_registry import DEFAULT_REGISTRY
+
 
 class TextFeatureExtractor:
     """Extrait des features de données textuelles"""
     
-    def __init__(self, max_features: int = 1000, ngram_range: tuple = (1, 2)):
+    # Schéma fixe des colonnes de extract_all_features (dtypes de DEFAULT_REGISTRY) ;
+    # les features statistiques sont absentes pour un texte vide (NaN en sortie colonnaire)
+    FEATURE_SCHEMA = DEFAULT_REGISTRY.schema([
+        'text_length', 'word_count', 'char_count', 'avg_word_length', 'sentence_count',
+        'uppercase_ratio', 'digit_ratio', 'special_char_ratio', 'unique_words',
+        'lexical_diversity', 'max_word_length', 'min_word_length', 'std_word_length',
+    ])
+    
+    def __init__(self, max_features: int = 1000, ngram_range: tuple = (1, 2), dtype: str = 'float64'):
         """
         Args:
             max_features: Nombre max de features pour TF-IDF
             ngram_range: Range de n-grams (1,1) = unigrams, (1,2) = uni+bigrams
+            dtype: Précision des vecteurs TF-IDF ('float64' ou 'float32')
         """
         self.max_features = max_features
         self.ngram_range = ngram_range
+        self.dtype = resolve_float_dtype(dtype)
         self.tfidf_vectorizer = None
         self.count_vectorizer = None
     
@@ -63,7 +78,8 @@ class TextFeatureExtractor:
         """Entraîne le vectoriseur TF-IDF"""
         self.tfidf_vectorizer = TfidfVectorizer(
             max_features=self.max_features,
-            ngram_range=self.ngram_range
+            ngram_range=self.ngram_range,
+            dtype=self.dtype,
         )
         self.tfidf_vectorizer.fit(texts)
     
@@ -79,6 +95,26 @@ class TextFeatureExtractor:
         features.update(self.extract_basic_features(text))
         features.update(self.extract_statistical_features(text))
         return features
+    
+    def extract_batch_columnar(self, texts: Iterable[str]) -> ColumnarBatch:
+        """
+        Features de plusieurs textes écrites dans des arrays typés préalloués
+        
+        Args:
+            texts: Textes à analyser
+            
+        Returns:
+            ColumnarBatch (to_frame() / to_arrow()) au schéma FEATURE_SCHEMA
+        """
+        texts = list(texts)
+        batch = ColumnarBatch(self.FEATURE_SCHEMA, capacity=len(texts))
+        for text in texts:
+            batch.append(self.extract_all_features(text))
+        return batch
+    
+    def extract_batch(self, texts: Iterable[str]) -> pd.DataFrame:
+        """Comme extract_batch_columnar, converti en DataFrame"""
+        return self.extract_batch_columnar(texts).to_frame()
 
 
 if __name__ == "__main__":
@@ -2,10 +2,11 @@
 VirusTotal API Integration
 """
 import vt
-import hashlib
 import time
 from typing import Dict, Optional
 
+from ..feature_extraction.hashing import hash_file
+
 class VirusTotalIntegration:
     """Intégration avec VirusTotal pour validation croisée"""
     
@@ -16,19 +17,22 @@ class VirusTotalIntegration:
         """
         self.client = vt.Client(api_key)
     
-    def scan_file(self, filepath: str) -> Dict:
+    def scan_file(self, filepath: str, digests: Optional[Dict[str, str]] = None) -> Dict:
         """
         Scanner un fichier avec VirusTotal
         
         Args:
             filepath: Chemin vers le fichier
+            digests: Empreintes déjà calculées (features 'sha256' de l'extracteur,
+                     hashing.hash_file...) : évite de relire le fichier pour le hacher
             
         Returns:
             Résultats du scan
         """
-        # Calculer le hash
-        with open(filepath, 'rb') as f:
-            file_hash = hashlib.sha256(f.read()).hexdigest()
+        # Calculer le hash (lecture par morceaux) s'il n'est pas fourni
+        if digests is None:
+            digests = hash_file(filepath)
+        file_hash = digests['sha256']
         
         try:
             # Vérifier si déjà scanné
@@ -70,18 +74,20 @@ class VirusTotalIntegration:
             else:
                 return {'error': str(e)}
     
-    def compare_with_ml_prediction(self, filepath: str, ml_prediction: int) -> Dict:
+    def compare_with_ml_prediction(self, filepath: str, ml_prediction: int,
+                                   digests: Optional[Dict[str, str]] = None) -> Dict:
         """
         Compare prédiction ML avec VirusTotal
         
         Args:
             filepath: Chemin fichier
             ml_prediction: 0 (benign) ou 1 (malware)
+            digests: Empreintes déjà calculées (voir scan_file)
             
         Returns:
             Comparaison détaillée
         """
-        vt_result = self.scan_file(filepath)
+        vt_result = self.scan_file(filepath, digests=digests)
         
         if 'error' in vt_result:
             return vt_result
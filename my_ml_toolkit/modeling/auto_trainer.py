@@ -12,18 +12,25 @@ from sklearn.neighbors import KNeighborsClassifier
 from sklearn.metrics import accuracy_score, f1_score, mean_squared_error, r2_score, classification_report
 from typing import Dict, List, Tuple, Union
 
+from ..precision import as_float_matrix, resolve_float_dtype
+
 
 class AutoTrainer:
     """Entraîne et compare automatiquement plusieurs modèles"""
     
-    def __init__(self, task_type: str = 'classification', test_size: float = 0.2, random_state: int = 42):
+    def __init__(self, task_type: str = 'classification', test_size: float = 0.2, random_state: int = 42,
+                 dtype: str = 'float64'):
         """
         Args:
             task_type: 'classification' ou 'regression'
             test_size: Proportion des données pour le test
             random_state: Seed pour reproductibilité
+            dtype: 'float32' = features converties une fois en float32 avant le
+                   découpage train/test (les arbres travaillent déjà en float32) ;
+                   'float64' = features transmises telles quelles
         """
         self.task_type = task_type
+        self.dtype = resolve_float_dtype(dtype)
         self.test_size = test_size
         self.random_state = random_state
         self.models = {}
@@ -67,6 +74,8 @@ class AutoTrainer:
         Returns:
             Dictionnaire avec résultats de tous les modèles
         """
+        X = self._as_features(X)
+        
         # Split train/test
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=self.test_size, random_state=self.random_state
@@ -150,7 +159,13 @@ class AutoTrainer:
         """Prédit avec le meilleur modèle"""
         if self.best_model is None:
             raise ValueError("Aucun modèle entraîné. Appelez train_all_models() d'abord.")
-        return self.best_model.predict(X)
+        return self.best_model.predict(self._as_features(X))
+    
+    def _as_features(self, X: Union[np.ndarray, pd.DataFrame]) -> Union[np.ndarray, pd.DataFrame]:
+        """Features dans la précision du trainer (inchangées en float64)"""
+        if getattr(self, 'dtype', np.float64) == np.float32:
+            return as_float_matrix(X, self.dtype)
+        return X
     
     def get_results_dataframe(self) -> pd.DataFrame:
         """Retourne les résultats sous forme de DataFrame"""
@@ -7,30 +7,44 @@ import numpy as np
 from typing import Union, Dict, List
 
 from .data_loader.tabular import TabularLoader
+from .data_loader.archive import is_archive
 from .data_loader.binary import BinaryLoader
 from .preprocessing.numeric_prep import NumericPreprocessor
 from .feature_extraction.binary_features import BinaryFeatureExtractor
+from .feature_extraction.columnar import ColumnarBatch
+from .feature_extraction.feature_cache import FeatureCache
 from .feature_extraction.text_features import TextFeatureExtractor
 from .modeling.auto_trainer import AutoTrainer
+from .precision import cast_float_columns, resolve_float_dtype
 
 
 class MLPipeline:
     """Pipeline ML end-to-end pour tous types de données"""
     
-    def __init__(self, data_type: str = 'tabular', task_type: str = 'classification'):
+    def __init__(self, data_type: str = 'tabular', task_type: str = 'classification', n_jobs: int = 1,
+                 feature_cache: FeatureCache = None, dtype: str = 'float64'):
         """
         Args:
             data_type: 'tabular', 'binary', ou 'text'
             task_type: 'classification' ou 'regression'
+            n_jobs: Processus pour l'extraction binaire par chemins (-1 = tous les coeurs)
+            feature_cache: Cache de features binaires par SHA-256 (None = pas de cache)
+            dtype: Précision des features, du prétraitement et de l'entraînement
+                   ('float32' divise par deux la mémoire des matrices)
         """
         self.data_type = data_type
         self.task_type = task_type
+        self.n_jobs = n_jobs
+        self.feature_cache = feature_cache
+        self.dtype = resolve_float_dtype(dtype)
         
         # Initialiser les composants
         self.loader = None
         self.preprocessor = None
         self.feature_extractor = None
         self.trainer = None
+        # Prétraitement figé par fit_transform (colonnes, imputer, encodeurs, scaler)
+        self.preprocessing = None
         
         self._init_components()
     
@@ -38,16 +52,16 @@ class MLPipeline:
         """Initialise les composants selon le type de données"""
         # Loader
         if self.data_type == 'tabular':
-            self.loader = TabularLoader()
-            self.preprocessor = NumericPreprocessor()
+            self.loader = TabularLoader(dtype=self.dtype)
+            self.preprocessor = NumericPreprocessor(dtype=self.dtype)
         elif self.data_type == 'binary':
             self.loader = BinaryLoader()
-            self.feature_extractor = BinaryFeatureExtractor()
+            self.feature_extractor = BinaryFeatureExtractor(cache=self.feature_cache)
         elif self.data_type == 'text':
-            self.feature_extractor = TextFeatureExtractor()
+            self.feature_extractor = TextFeatureExtractor(dtype=self.dtype)
         
         # Trainer
-        self.trainer = AutoTrainer(task_type=self.task_type)
+        self.trainer = AutoTrainer(task_type=self.task_type, dtype=self.dtype)
     
     def load_data(self, filepath: str, **kwargs) -> Union[pd.DataFrame, bytes, str]:
         """
@@ -61,14 +75,13 @@ class MLPipeline:
             Données chargées
         """
         if self.data_type == 'tabular':
-            if filepath.endswith('.csv'):
-                return self.loader.load_csv(filepath, **kwargs)
-            elif filepath.endswith(('.xlsx', '.xls')):
-                return self.loader.load_excel(filepath, **kwargs)
-            else:
-                raise ValueError("Format non supporté. Utilisez .csv ou .xlsx")
+            # .csv, .xlsx, .parquet, .feather / .arrow (colonnes : columns=[...])
+            return self.loader.load(filepath, **kwargs)
         
         elif self.data_type == 'binary':
+            if is_archive(filepath):
+                # Membres lus en flux, sans extraction sur disque
+                return self.loader.load_archive(filepath, **kwargs)
             return self.loader.load_file(filepath)
         
         elif self.data_type == 'text':
@@ -93,35 +106,75 @@ class MLPipeline:
             return data
         
         elif self.data_type == 'binary':
-            if isinstance(data, list):
-                # Multiple fichiers
-                features_list = []
+            if isinstance(data, list) and data and isinstance(data[0], str):
+                # Liste de chemins : extraction parallèle, chaque worker lit ses fichiers
+                df = self.feature_extractor.extract_batch(data, n_jobs=self.n_jobs)
+            elif isinstance(data, list):
+                # Multiple fichiers : écriture colonne par colonne (schéma fixe)
+                schema = self.feature_extractor.feature_schema().with_columns([('filename', object)])
+                batch = ColumnarBatch(schema, capacity=len(data))
                 for filename, binary_data in data:
                     features = self.feature_extractor.extract_all_features(binary_data)
                     features['filename'] = filename
-                    features_list.append(features)
-                return pd.DataFrame(features_list)
+                    batch.append(features)
+                df = batch.to_frame()
             else:
-                # Un seul fichier
-                features = self.feature_extractor.extract_all_features(data)
-                return pd.DataFrame([features])
+                # Un seul fichier : même schéma que les lots
+                batch = ColumnarBatch(self.feature_extractor.feature_schema(), capacity=1)
+                batch.append(self.feature_extractor.extract_all_features(data))
+                df = batch.to_frame()
         
         elif self.data_type == 'text':
-            if isinstance(data, list):
-                # Multiple textes
-                features_list = []
-                for text in data:
-                    features = self.feature_extractor.extract_all_features(text)
-                    features_list.append(features)
-                return pd.DataFrame(features_list)
-            else:
-                # Un seul texte
-                features = self.feature_extractor.extract_all_features(data)
-                return pd.DataFrame([features])
+            # Un seul texte : même schéma que les lots
+            texts = data if isinstance(data, list) else [data]
+            df = self.feature_extractor.extract_batch(texts)
+        
+        # Flottants à la précision du pipeline quelle que soit la forme de l'appel
+        # (les lots sortent avec les dtypes compacts du registre)
+        return cast_float_columns(df, self.dtype)
+    
+    def fit_transform(self, X: pd.DataFrame, y: pd.Series = None) -> tuple:
+        """
+        Apprend le prétraitement sur X puis le fige pour l'inférence
+        
+        Les colonnes non numériques (md5, sha256, filename, etc.) sont écartées
+        une fois pour toutes ; les colonnes retenues, l'imputer, les encodeurs
+        et le scaler sont conservés dans self.preprocessing, que transform()
+        et predict_new_data() réutilisent sans rien recalculer.
+        
+        Args:
+            X: Features
+            y: Target (optionnel)
+            
+        Returns:
+            (X, y) prétraités
+        """
+        if self.preprocessor is None:
+            self.preprocessor = NumericPreprocessor(dtype=self.dtype)
+        
+        columns = [col for col in X.columns if pd.api.types.is_numeric_dtype(X[col])]
+        options = self._preprocessing_options()
+        X_processed, _ = self.preprocessor.preprocess_full(X, columns=columns, **options)
+        self.preprocessing = self.preprocessor.freeze(columns, **options)
+        return X_processed, y
+    
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        Prétraite de nouvelles données avec l'état appris par fit_transform
+        
+        Args:
+            X: Features (au moins les colonnes vues à l'apprentissage)
+            
+        Returns:
+            Features prétraitées
+        """
+        if self.preprocessing is None:
+            raise ValueError("Prétraitement non appris : appeler fit_transform() ou run_full_pipeline()")
+        return self.preprocessing.transform(X)
     
     def preprocess(self, X: pd.DataFrame, y: pd.Series = None) -> tuple:
         """
-        Prétraite les données
+        Prétraite les données d'apprentissage (équivalent de fit_transform)
         
         Args:
             X: Features
@@ -130,36 +183,14 @@ class MLPipeline:
         Returns:
             (X, y) prétraités
         """
+        return self.fit_transform(X, y)
+    
+    def _preprocessing_options(self) -> Dict:
+        """Étapes de prétraitement selon le type de données"""
         if self.data_type == 'tabular':
-            # Supprimer toutes les colonnes non-numériques (md5, sha256, filename, etc.)
-            cols_to_drop = [col for col in X.columns
-                            if not pd.api.types.is_numeric_dtype(X[col])]
-
-            X_processed = X.drop(columns=cols_to_drop, errors='ignore')
-
-            # Prétraiter
-            X_processed, _ = self.preprocessor.preprocess_full(
-                X_processed,
-                handle_missing=True,
-                encode_cat=True,
-                scale=True
-            )
-
-            return X_processed, y
-        else:
-            # Pour binary et text, les features sont déjà numériques
-            # Mais on peut quand même normaliser
-            if self.preprocessor is None:
-                self.preprocessor = NumericPreprocessor()
-
-            # Supprimer colonnes non-numériques (compatible pandas 2.x et 3.x)
-            cols_to_drop = [col for col in X.columns
-                            if not pd.api.types.is_numeric_dtype(X[col])]
-
-            X_processed = X.drop(columns=cols_to_drop, errors='ignore')
-            
-            X_processed = self.preprocessor.scale_features(X_processed, fit=True)
-            return X_processed, y
+            return {'handle_missing': True, 'encode_cat': True, 'scale': True}
+        # Pour binary et text, les features sont déjà numériques : normalisation seule
+        return {'handle_missing': False, 'encode_cat': False, 'scale': True}
     
     def train(self, X: pd.DataFrame, y: pd.Series, verbose: bool = True) -> Dict:
         """
@@ -215,7 +246,7 @@ class MLPipeline:
             X = df
             y = None
         
-        X, y = self.preprocess(X, y)
+        X, y = self.fit_transform(X, y)
         if verbose:
             print(f"   ✓ Données prétraitées: {X.shape}\n")
         
@@ -238,21 +269,30 @@ class MLPipeline:
         """
         Prédit sur de nouvelles données
         
+        Le prétraitement appris par run_full_pipeline est appliqué tel quel
+        (aucune statistique recalculée sur le lot à prédire).
+        
         Args:
             filepath: Chemin vers les nouvelles données
             
         Returns:
             Prédictions
         """
-        # Charger et prétraiter comme avant
         data = self.load_data(filepath)
         df = self.extract_features(data)
-        X, _ = self.preprocess(df)
-        
-        # Prédire avec le meilleur modèle
-        predictions = self.trainer.predict(X)
+        return self.predict(df)
+    
+    def predict(self, X: pd.DataFrame) -> np.ndarray:
+        """
+        Prédit sur des features déjà extraites (prétraitement figé, sans réapprentissage)
         
-        return predictions
+        Args:
+            X: Features
+            
+        Returns:
+            Prédictions du meilleur modèle
+        """
+        return self.trainer.predict(self.transform(X))
 
 
 if __name__ == "__main__":
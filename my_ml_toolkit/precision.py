@@ -0,0 +1,66 @@
+"""
+Précision des matrices de features
+float64 par défaut ; float32 divise par deux la mémoire et la bande passante
+des chargeurs, du prétraitement et de l'entraînement
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# Précisions acceptées par le paramètre dtype des composants
+FLOAT_DTYPES = (np.dtype(np.float64), np.dtype(np.float32))
+
+
+def resolve_float_dtype(dtype) -> np.dtype:
+    """
+    dtype numpy d'une précision ('float64', 'float32', np.float32...)
+
+    Raises:
+        ValueError: Si la précision n'est ni float64 ni float32
+    """
+    try:
+        resolved = np.dtype(dtype)
+    except TypeError:
+        resolved = None
+    if resolved not in FLOAT_DTYPES:
+        raise ValueError("dtype doit être 'float64' ou 'float32'")
+    return resolved
+
+
+def cast_float_columns(df: pd.DataFrame, dtype) -> pd.DataFrame:
+    """
+    Colonnes flottantes numpy converties en `dtype` (les autres sont inchangées)
+
+    Args:
+        df: Données
+        dtype: Précision cible
+
+    Returns:
+        df lui-même si aucune colonne n'est à convertir, sinon un nouveau DataFrame
+    """
+    dtype = resolve_float_dtype(dtype)
+    columns = {
+        col: dtype for col, col_dtype in df.dtypes.items()
+        if isinstance(col_dtype, np.dtype) and col_dtype.kind == 'f' and col_dtype != dtype
+    }
+    return df.astype(columns) if columns else df
+
+
+def as_float_matrix(X, dtype):
+    """
+    Features entièrement converties en `dtype` (DataFrame ou ndarray, sans copie si déjà au bon type)
+
+    Args:
+        X: DataFrame ou ndarray de features numériques
+        dtype: Précision cible
+
+    Returns:
+        Même type d'objet que X
+    """
+    dtype = resolve_float_dtype(dtype)
+    if isinstance(X, pd.DataFrame):
+        if (X.dtypes == dtype).all():
+            return X
+        return X.astype(dtype)
+    return np.asarray(X, dtype=dtype)
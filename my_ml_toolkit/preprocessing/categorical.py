@@ -0,0 +1,204 @@
+"""
+Encodage vectorisé des colonnes catégorielles
+Vocabulaire appris une fois (recherche vectorisée dans un pd.Index) ou hachage des valeurs
+dans un nombre fixe de seaux ; les valeurs inconnues reçoivent un code réservé
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+
+# Code des valeurs absentes du vocabulaire (ou manquantes), convention pandas
+UNKNOWN_CODE = -1
+
+
+class CategoryVocabulary:
+    """
+    Vocabulaire d'une colonne : chaque catégorie retenue reçoit sa position
+
+    Les catégories sont triées (codes identiques à ceux de LabelEncoder
+    quand rien n'est écarté) ; les valeurs hors vocabulaire et les valeurs
+    manquantes reçoivent UNKNOWN_CODE au lieu de lever une erreur.
+    """
+
+    def __init__(self, categories=None):
+        """
+        Args:
+            categories: Catégories connues (None = à apprendre avec fit)
+        """
+        self.categories = pd.Index(categories) if categories is not None else None
+
+    def fit(self, series: pd.Series, max_categories: int = None,
+            min_frequency: int = 1) -> 'CategoryVocabulary':
+        """
+        Apprend le vocabulaire (comptage par table de hachage, sans conversion en str)
+
+        Args:
+            series: Valeurs de la colonne
+            max_categories: Nombre maximum de catégories (les plus fréquentes)
+            min_frequency: Effectif minimum d'une catégorie
+
+        Returns:
+            self
+        """
+        counts = series.value_counts(dropna=True)
+        # Une colonne category compte aussi ses catégories jamais observées
+        counts = counts[counts >= max(min_frequency, 1)]
+        if max_categories is not None:
+            counts = counts.iloc[:max_categories]
+
+        categories = counts.index
+        try:
+            categories = categories.sort_values()
+        except TypeError:
+            # Types mélangés : ordre de fréquence conservé
+            pass
+        self.categories = pd.Index(categories)
+        return self
+
+    def transform(self, series: pd.Series) -> np.ndarray:
+        """Codes de la colonne (int8/int16/int32 selon la taille du vocabulaire)"""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Recherche des seules catégories de la colonne, puis report par les codes
+            # (le code -1 d'une valeur manquante désigne le dernier élément : UNKNOWN_CODE)
+            mapping = np.append(self.categories.get_indexer(series.cat.categories), UNKNOWN_CODE)
+            codes = mapping[series.cat.codes.to_numpy()]
+        else:
+            # Table de hachage de l'index : -1 (UNKNOWN_CODE) hors vocabulaire
+            codes = self.categories.get_indexer(series)
+        return codes.astype(_code_dtype(len(self.categories)))
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def to_dict(self) -> Dict:
+        return {'type': 'vocabulary', 'categories': self.categories.tolist()}
+
+    def __getstate__(self):
+        # Liste Python : pas de dépendance à la représentation interne de pd.Index
+        return {'categories': self.categories.tolist() if self.categories is not None else None}
+
+    def __setstate__(self, state):
+        self.__init__(state['categories'])
+
+
+class HashedCategories:
+    """
+    Hachage des valeurs dans `n_buckets` seaux (sans vocabulaire)
+
+    La mémoire ne dépend pas du nombre de catégories et aucune valeur n'est
+    inconnue ; des catégories distinctes peuvent partager un seau. Le hachage
+    (pd.util.hash_array) est stable d'une exécution à l'autre.
+    """
+
+    def __init__(self, n_buckets: int):
+        if n_buckets < 1:
+            raise ValueError("n_buckets doit être positif")
+        self.n_buckets = n_buckets
+
+    def fit(self, series: pd.Series, **kwargs) -> 'HashedCategories':
+        return self
+
+    def transform(self, series: pd.Series) -> np.ndarray:
+        """Seau de chaque valeur (UNKNOWN_CODE pour une valeur manquante)"""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Chaque catégorie n'est hachée qu'une fois
+            buckets = self._buckets(series.cat.categories.to_numpy(dtype=object))
+            return np.append(buckets, UNKNOWN_CODE).astype(buckets.dtype)[series.cat.codes.to_numpy()]
+
+        codes = self._buckets(series.to_numpy(dtype=object))
+        codes[series.isna().to_numpy()] = UNKNOWN_CODE
+        return codes
+
+    def _buckets(self, values: np.ndarray) -> np.ndarray:
+        if len(values) == 0:
+            return np.empty(0, dtype=_code_dtype(self.n_buckets))
+        hashes = pd.util.hash_array(values, categorize=True)
+        return (hashes % np.uint64(self.n_buckets)).astype(_code_dtype(self.n_buckets))
+
+    def __len__(self) -> int:
+        return self.n_buckets
+
+    def to_dict(self) -> Dict:
+        return {'type': 'hashing', 'n_buckets': self.n_buckets}
+
+
+class CategoricalEncoder:
+    """
+    Encodeurs des colonnes catégorielles d'un jeu de données
+
+    Le vocabulaire d'une colonne est appris au premier encodage puis
+    réutilisé ; avec hash_buckets, les colonnes sont hachées sans
+    apprentissage (mémoire bornée, pour les colonnes à très forte
+    cardinalité).
+    """
+
+    def __init__(self, max_categories: int = None, min_frequency: int = 1, hash_buckets: int = None):
+        """
+        Args:
+            max_categories: Taille maximale du vocabulaire par colonne (les plus fréquentes)
+            min_frequency: Effectif minimum d'une catégorie à l'apprentissage
+            hash_buckets: Nombre de seaux du mode hachage (None = vocabulaire)
+        """
+        self.max_categories = max_categories
+        self.min_frequency = min_frequency
+        self.hash_buckets = hash_buckets
+        self.encoders = {}
+
+    def encode(self, col: str, series: pd.Series) -> np.ndarray:
+        """
+        Codes d'une colonne (encodeur appris au premier appel)
+
+        Args:
+            col: Nom de la colonne
+            series: Valeurs
+
+        Returns:
+            Array d'entiers signés, UNKNOWN_CODE pour les valeurs inconnues
+        """
+        encoder = self.encoders.get(col)
+        if encoder is None:
+            if self.hash_buckets is not None:
+                encoder = HashedCategories(self.hash_buckets)
+            else:
+                encoder = CategoryVocabulary().fit(
+                    series, max_categories=self.max_categories, min_frequency=self.min_frequency
+                )
+            self.encoders[col] = encoder
+        return encoder.transform(series)
+
+    def encode_frame(self, df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+        """Copie superficielle de df avec les colonnes encodées (les autres sont partagées)"""
+        result = df.copy(deep=False)
+        for col in columns:
+            result[col] = self.encode(col, df[col])
+        return result
+
+    def to_dict(self) -> Dict:
+        """État sérialisable en JSON"""
+        return {
+            'max_categories': self.max_categories,
+            'min_frequency': self.min_frequency,
+            'hash_buckets': self.hash_buckets,
+            'columns': {col: encoder.to_dict() for col, encoder in self.encoders.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> 'CategoricalEncoder':
+        """Reconstruit un encodeur à partir de to_dict()"""
+        encoder = cls(state['max_categories'], state['min_frequency'], state['hash_buckets'])
+        for col, column in state['columns'].items():
+            if column['type'] == 'hashing':
+                encoder.encoders[col] = HashedCategories(column['n_buckets'])
+            else:
+                encoder.encoders[col] = CategoryVocabulary(column['categories'])
+        return encoder
+
+
+def _code_dtype(n: int) -> np.dtype:
+    """Plus petit entier signé qui contient les codes 0..n-1 et UNKNOWN_CODE"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
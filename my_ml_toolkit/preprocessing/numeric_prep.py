@@ -2,25 +2,50 @@
 Module de prétraitement pour données numériques/tabulaires
 """
 
+import copy
+
 import numpy as np
 import pandas as pd
-from sklearn.preprocessing import StandardScaler, MinMaxScaler, LabelEncoder
+from sklearn.base import clone
+from sklearn.preprocessing import StandardScaler, MinMaxScaler
 from sklearn.impute import SimpleImputer
-from typing import Union, List
+from typing import Iterable, Iterator, Union, List
+
+from ..precision import as_float_matrix, resolve_float_dtype
+from .categorical import CategoricalEncoder, CategoryVocabulary
+from .running_stats import RunningStats
+
+# Stratégies d'imputation calculables bloc par bloc (la médiane exige toutes les valeurs)
+STREAM_STRATEGIES = ('mean', 'most_frequent', 'constant')
 
 
 class NumericPreprocessor:
     """Prétraite les données numériques"""
     
-    def __init__(self, scaling_method: str = 'standard'):
+    def __init__(self, scaling_method: str = 'standard', max_categories: int = None,
+                 min_frequency: int = 1, hash_buckets: int = None, dtype: str = 'float64'):
         """
         Args:
             scaling_method: 'standard' (StandardScaler) ou 'minmax' (MinMaxScaler)
+            max_categories: Taille maximale du vocabulaire d'une colonne catégorielle
+            min_frequency: Effectif minimum d'une catégorie (les plus rares -> code inconnu)
+            hash_buckets: Encoder les catégorielles par hachage dans ce nombre de seaux
+            dtype: Précision des features et des statistiques du scaler ('float64' ou 'float32')
         """
         self.scaling_method = scaling_method
+        self.dtype = resolve_float_dtype(dtype)
         self.scaler = None
         self.imputer = None
-        self.label_encoders = {}
+        self.categorical = CategoricalEncoder(
+            max_categories=max_categories, min_frequency=min_frequency, hash_buckets=hash_buckets
+        )
+        # Encodeur de chaque colonne (même dictionnaire que self.categorical.encoders)
+        self.label_encoders = self.categorical.encoders
+        
+        # État de l'apprentissage par blocs (partial_fit / fit_stream)
+        self._stream = None
+        self._stream_columns = None
+        self._stream_options = None
         
         if scaling_method == 'standard':
             self.scaler = StandardScaler()
@@ -40,18 +65,28 @@ class NumericPreprocessor:
         Returns:
             DataFrame sans valeurs manquantes
         """
+        if self.dtype == np.float32:
+            X = as_float_matrix(X, self.dtype)
         if self.imputer is None:
             self.imputer = SimpleImputer(strategy=strategy)
             X_imputed = self.imputer.fit_transform(X)
         else:
             X_imputed = self.imputer.transform(X)
         
-        return pd.DataFrame(X_imputed, columns=X.columns, index=X.index)
+        columns = X.columns
+        if X_imputed.shape[1] != len(columns):
+            # Colonnes sans valeur observée à l'apprentissage : retirées par SimpleImputer
+            columns = columns[~np.isnan(self.imputer.statistics_.astype(np.float64))]
+        return pd.DataFrame(X_imputed, columns=columns, index=X.index)
     
     def encode_categorical(self, df: pd.DataFrame, columns: List[str] = None) -> pd.DataFrame:
         """
         Encode les variables catégorielles
         
+        Une passe vectorisée par colonne (codes pandas catégoriels ou
+        hachage) ; les valeurs inconnues à l'apprentissage et les valeurs
+        manquantes reçoivent le code réservé UNKNOWN_CODE (-1).
+        
         Args:
             df: DataFrame
             columns: Liste des colonnes à encoder (None = auto-détection)
@@ -59,20 +94,12 @@ class NumericPreprocessor:
         Returns:
             DataFrame avec colonnes encodées
         """
-        df_copy = df.copy()
-        
         # Auto-détection des colonnes catégorielles
         if columns is None:
-            columns = df_copy.select_dtypes(include=['object', 'category']).columns.tolist()
+            columns = [col for col, dtype in df.dtypes.items() if _is_categorical(dtype)]
         
-        for col in columns:
-            if col not in self.label_encoders:
-                self.label_encoders[col] = LabelEncoder()
-                df_copy[col] = self.label_encoders[col].fit_transform(df_copy[col].astype(str))
-            else:
-                df_copy[col] = self.label_encoders[col].transform(df_copy[col].astype(str))
-        
-        return df_copy
+        # Copie superficielle : seules les colonnes encodées sont remplacées
+        return self.categorical.encode_frame(df, columns)
     
     def scale_features(self, X: pd.DataFrame, fit: bool = True) -> pd.DataFrame:
         """
@@ -85,6 +112,11 @@ class NumericPreprocessor:
         Returns:
             DataFrame normalisé
         """
+        if X.shape[1] == 0:
+            # sklearn refuse une matrice sans colonne : rien à normaliser
+            return X
+        if self.dtype == np.float32:
+            X = as_float_matrix(X, self.dtype)
         if fit:
             X_scaled = self.scaler.fit_transform(X)
         else:
@@ -92,45 +124,386 @@ class NumericPreprocessor:
         
         return pd.DataFrame(X_scaled, columns=X.columns, index=X.index)
     
+    def reset(self) -> 'NumericPreprocessor':
+        """
+        Oublie tout l'état appris (imputer, encodeurs, scaler, apprentissage par blocs)
+        
+        Returns:
+            self
+        """
+        self.imputer = None
+        self.scaler = clone(self.scaler)
+        # Même dictionnaire que self.label_encoders
+        self.categorical.encoders.clear()
+        self._stream = None
+        self._stream_columns = None
+        self._stream_options = None
+        return self
+    
+    def __setstate__(self, state):
+        """Compatibilité des préprocesseurs sauvegardés avec des LabelEncoder"""
+        self.__dict__.update(state)
+        if 'categorical' not in state:
+            self.categorical = CategoricalEncoder()
+            for col, encoder in state.get('label_encoders', {}).items():
+                # Mêmes codes (classes triées), valeurs inconnues tolérées
+                self.categorical.encoders[col] = CategoryVocabulary(encoder.classes_)
+            self.label_encoders = self.categorical.encoders
+        for name in ('_stream', '_stream_columns', '_stream_options'):
+            self.__dict__.setdefault(name, None)
+        self.__dict__.setdefault('dtype', np.dtype(np.float64))
+    
+    def partial_fit(self, chunk: pd.DataFrame, strategy: str = 'mean',
+                    handle_missing: bool = True, scale: bool = True) -> 'NumericPreprocessor':
+        """
+        Met à jour l'imputer et le scaler avec un bloc de lignes
+        
+        Les statistiques (moyenne, variance, min, max, effectifs) sont
+        cumulées bloc par bloc : l'imputer et le scaler obtenus sont ceux
+        qu'aurait donnés handle_missing_values puis scale_features sur la
+        concaténation des blocs. Ils sont utilisables après chaque bloc.
+        
+        Args:
+            chunk: Bloc de colonnes numériques (mêmes colonnes à chaque appel)
+            strategy: 'mean', 'most_frequent' ou 'constant' (0)
+            handle_missing: Apprendre l'imputation (le scaler voit les blocs imputés)
+            scale: Apprendre la normalisation
+            
+        Returns:
+            self
+        """
+        options = (strategy, handle_missing, scale)
+        if self._stream is None:
+            if handle_missing and strategy not in STREAM_STRATEGIES:
+                raise ValueError(
+                    f"Stratégie '{strategy}' non calculable par blocs. "
+                    f"Utilisez {', '.join(STREAM_STRATEGIES)}"
+                )
+            self._stream_columns = list(chunk.columns)
+            self._stream_options = options
+            self._stream = RunningStats(
+                len(self._stream_columns),
+                track_counts=handle_missing and strategy == 'most_frequent',
+            )
+        elif options != self._stream_options:
+            raise ValueError("Options différentes de celles des blocs précédents (utiliser fit_stream)")
+        
+        values = chunk[self._stream_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        self._stream.update(values)
+        self._refresh_from_stream()
+        return self
+    
+    def fit_stream(self, chunks: Iterable[pd.DataFrame], strategy: str = 'mean',
+                   handle_missing: bool = True, scale: bool = True) -> 'NumericPreprocessor':
+        """
+        Apprend l'imputer et le scaler sur une suite de blocs (table plus grande que la mémoire)
+        
+        Args:
+            chunks: Blocs de colonnes numériques, ex: TabularLoader().iter_csv(...)
+            strategy: 'mean', 'most_frequent' ou 'constant' (0)
+            handle_missing: Apprendre l'imputation
+            scale: Apprendre la normalisation
+            
+        Returns:
+            self
+        """
+        self._stream = None
+        self.imputer = None
+        for chunk in chunks:
+            self.partial_fit(chunk, strategy=strategy, handle_missing=handle_missing, scale=scale)
+        if self._stream is None:
+            raise ValueError("Aucun bloc reçu")
+        return self
+    
+    def transform_stream(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """
+        Impute et normalise des blocs avec l'état appris par fit_stream / partial_fit
+        
+        Args:
+            chunks: Blocs contenant au moins les colonnes apprises
+            
+        Yields:
+            Blocs prétraités (colonnes apprises, moins celles sans aucune valeur
+            observée si l'imputation est active ; index d'origine)
+        """
+        if getattr(self, '_stream', None) is None:
+            raise ValueError("Appeler fit_stream ou partial_fit avant transform_stream")
+        _, handle_missing, scale = self._stream_options
+        for chunk in chunks:
+            X = chunk[self._stream_columns]
+            if handle_missing:
+                X = self.handle_missing_values(X)
+            if scale:
+                X = self.scale_features(X, fit=False)
+            yield X
+    
+    def _refresh_from_stream(self):
+        """Reconstruit l'imputer et le scaler sklearn à partir des statistiques cumulées"""
+        strategy, handle_missing, scale = self._stream_options
+        stats = self._stream
+        columns = self._stream_columns
+        
+        if handle_missing:
+            if strategy == 'mean':
+                fill = stats.mean.copy()
+                fill[stats.count == 0] = np.nan
+            elif strategy == 'most_frequent':
+                fill = stats.most_frequent()
+            else:
+                fill = np.zeros(stats.n_features)
+            # Un fit sur une ligne valant les statistiques donne exactement ces statistiques
+            self.imputer = SimpleImputer(strategy=strategy).fit(pd.DataFrame([fill], columns=columns))
+            stats = stats.filled(fill)
+            # Colonnes sans valeur observée : retirées par l'imputer, donc absentes du scaler
+            kept = ~np.isnan(fill)
+            if not kept.all():
+                stats = stats.select(kept)
+                columns = [col for col, keep in zip(columns, kept) if keep]
+        
+        if scale:
+            self.scaler = _scaler_from_stats(self.scaler, stats, columns, self.dtype)
+    
     def preprocess_full(self, df: pd.DataFrame, target_col: str = None, 
                        handle_missing: bool = True, encode_cat: bool = True, 
-                       scale: bool = True) -> tuple:
+                       scale: bool = True, as_frame: bool = True, dtype=None,
+                       columns: List[str] = None, fit: bool = True) -> tuple:
         """
         Pipeline complet de prétraitement
         
+        Les features sont copiées une seule fois, colonne par colonne, dans
+        une matrice float contiguë (ordre Fortran) ; l'imputation et la
+        normalisation la modifient en place. Le DataFrame renvoyé est une vue
+        sur cette matrice : le pic mémoire est d'environ une matrice de
+        features en plus des données d'entrée.
+        
         Args:
             df: DataFrame complet
             target_col: Nom de la colonne cible (y)
             handle_missing: Gérer les valeurs manquantes
             encode_cat: Encoder les variables catégorielles
             scale: Normaliser les features
+            as_frame: Renvoyer X en DataFrame (False = ndarray, sans reconstruction)
+            dtype: dtype de la matrice (None = self.dtype)
+            columns: Colonnes de features à lire dans df (None = toutes sauf target_col)
+            fit: Réapprendre tout l'état (imputer, encodeurs, scaler) sur df
+                 (False = état déjà appris, appliqué sans recalculer de statistiques)
             
         Returns:
             (X, y) preprocessés
         """
-        df_copy = df.copy()
+        dtype = self.dtype if dtype is None else resolve_float_dtype(dtype)
+        if fit:
+            self.reset()
         
-        # Séparer X et y
-        if target_col:
-            y = df_copy[target_col]
-            X = df_copy.drop(columns=[target_col])
+        # Séparer X et y (sans copie du DataFrame)
+        if columns is None:
+            columns = [col for col in df.columns if col != target_col] if target_col else list(df.columns)
         else:
-            X = df_copy
-            y = None
+            columns = list(columns)
+            absent = [col for col in columns if col not in df.columns]
+            if absent:
+                raise ValueError(f"Colonnes absentes des données: {absent}")
+        y = df[target_col] if target_col else None
         
-        # Encoder les catégorielles
-        if encode_cat:
-            X = self.encode_categorical(X)
+        # Conversion unique, catégorielles encodées directement dans la matrice
+        X = np.empty((len(df), len(columns)), dtype=dtype, order='F')
+        for j, col in enumerate(columns):
+            series = df[col]
+            if encode_cat and _is_categorical(series.dtype):
+                if not fit and col not in self.categorical.encoders:
+                    raise ValueError(f"Colonne catégorielle '{col}' non apprise")
+                X[:, j] = self.categorical.encode(col, series)
+            elif isinstance(series.dtype, pd.api.extensions.ExtensionDtype):
+                X[:, j] = series.to_numpy(dtype=dtype, na_value=np.nan)
+            else:
+                X[:, j] = series.to_numpy()
         
         # Gérer les valeurs manquantes
         if handle_missing:
-            X = self.handle_missing_values(X)
+            if not fit and self.imputer is None:
+                raise ValueError("Imputer non appris (appeler preprocess_full avec fit=True)")
+            X, columns = self._impute_inplace(X, columns)
         
         # Normaliser
         if scale:
-            X = self.scale_features(X)
+            if fit:
+                stats = RunningStats(len(columns))
+                stats.update(X)
+                self.scaler = _scaler_from_stats(self.scaler, stats, columns, dtype)
+            else:
+                _check_columns(self.scaler, columns, 'le scaler')
+            _scale_inplace(self.scaler, X)
         
+        if as_frame:
+            # Matrice Fortran : chaque colonne devient une vue, sans recopie
+            X = pd.DataFrame(X, columns=columns, index=df.index, copy=False)
         return X, y
+    
+    def _impute_inplace(self, X: np.ndarray, columns: List[str]) -> tuple:
+        """
+        Remplace les NaN de X en place (moyenne apprise si l'imputer n'est pas encore appris)
+        
+        Returns:
+            (X, colonnes) ; les colonnes sans aucune valeur observée sont retirées, comme SimpleImputer
+        """
+        if self.imputer is None:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                statistics = np.array([
+                    np.nanmean(X[:, j]) if not np.isnan(X[:, j]).all() else np.nan
+                    for j in range(X.shape[1])
+                ])
+            self.imputer = SimpleImputer(strategy='mean').fit(pd.DataFrame([statistics], columns=columns))
+        else:
+            _check_columns(self.imputer, columns, "l'imputer")
+            statistics = self.imputer.statistics_.astype(np.float64)
+        
+        for j, value in enumerate(statistics):
+            column = X[:, j]
+            missing = np.isnan(column)
+            if missing.any():
+                column[missing] = value
+        
+        observed = ~np.isnan(statistics)
+        if not observed.all():
+            X = np.asfortranarray(X[:, observed])
+            columns = [col for col, keep in zip(columns, observed) if keep]
+        return X, columns
+    
+    def freeze(self, columns: List[str], handle_missing: bool = True, encode_cat: bool = True,
+               scale: bool = True) -> 'FrozenPreprocessor':
+        """
+        Fige l'état appris par preprocess_full pour l'inférence
+        
+        Args:
+            columns: Colonnes d'entrée retenues à l'apprentissage
+            handle_missing, encode_cat, scale: Options utilisées à l'apprentissage
+            
+        Returns:
+            FrozenPreprocessor indépendant de ce préprocesseur
+        """
+        return FrozenPreprocessor(self, columns, handle_missing=handle_missing,
+                                  encode_cat=encode_cat, scale=scale)
+
+
+class FrozenPreprocessor:
+    """
+    Prétraitement appris puis figé, pour l'inférence
+    
+    Conserve les colonnes d'entrée retenues et une copie du
+    NumericPreprocessor entraîné : transform() applique encodeurs, imputer et
+    scaler sans recalculer de statistiques ni redétecter les colonnes. Un
+    nouvel apprentissage du préprocesseur d'origine ne le modifie pas, et
+    transform() ne modifie rien (appels concurrents possibles).
+    """
+    
+    def __init__(self, preprocessor: NumericPreprocessor, columns: List[str],
+                 handle_missing: bool = True, encode_cat: bool = True, scale: bool = True):
+        """
+        Args:
+            preprocessor: NumericPreprocessor entraîné (copié)
+            columns: Colonnes d'entrée, dans l'ordre de l'apprentissage
+            handle_missing, encode_cat, scale: Options utilisées à l'apprentissage
+        """
+        self.__dict__.update({
+            'preprocessor': copy.deepcopy(preprocessor),
+            'columns': tuple(columns),
+            'handle_missing': handle_missing,
+            'encode_cat': encode_cat,
+            'scale': scale,
+        })
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenPreprocessor est figé")
+    
+    @property
+    def dtype(self) -> np.dtype:
+        return self.preprocessor.dtype
+    
+    def transform(self, X: pd.DataFrame, as_frame: bool = True) -> Union[pd.DataFrame, np.ndarray]:
+        """
+        Prétraite des données avec l'état figé
+        
+        Args:
+            X: Données contenant au moins les colonnes apprises (les autres sont ignorées)
+            as_frame: Renvoyer un DataFrame (False = ndarray)
+            
+        Returns:
+            Features prétraitées
+        """
+        X_processed, _ = self.preprocessor.preprocess_full(
+            X, columns=self.columns, handle_missing=self.handle_missing,
+            encode_cat=self.encode_cat, scale=self.scale, as_frame=as_frame, fit=False,
+        )
+        return X_processed
+
+
+def _scaler_from_stats(scaler, stats: RunningStats, columns: List[str], dtype=np.float64):
+    """
+    Copie non entraînée de `scaler` dont les attributs appris viennent de `stats`
+    
+    Les statistiques, cumulées en float64, sont stockées dans la précision `dtype`.
+    """
+    fitted = clone(scaler)
+    count = stats.count
+    if len(columns) == 0:
+        # Rien à normaliser (ex: colonnes toutes retirées par l'imputer) : attributs vides
+        fitted.n_samples_seen_ = stats.n_rows
+    else:
+        fitted.n_samples_seen_ = int(count[0]) if (count == count[0]).all() else count
+    fitted.n_features_in_ = len(columns)
+    if all(isinstance(col, str) for col in columns):
+        fitted.feature_names_in_ = np.asarray(columns, dtype=object)
+    
+    if isinstance(fitted, StandardScaler):
+        fitted.mean_ = stats.mean.copy() if fitted.with_mean else None
+        fitted.var_ = stats.var if fitted.with_std else None
+        fitted.scale_ = _nonzero(np.sqrt(stats.var)) if fitted.with_std else None
+    else:
+        low, high = fitted.feature_range
+        fitted.data_min_ = stats.min.copy()
+        fitted.data_max_ = stats.max.copy()
+        fitted.data_range_ = stats.max - stats.min
+        fitted.scale_ = (high - low) / _nonzero(fitted.data_range_)
+        fitted.min_ = low - fitted.data_min_ * fitted.scale_
+    
+    for name in ('mean_', 'var_', 'scale_', 'data_min_', 'data_max_', 'data_range_', 'min_'):
+        value = getattr(fitted, name, None)
+        if value is not None:
+            setattr(fitted, name, value.astype(dtype, copy=False))
+    return fitted
+
+
+def _check_columns(estimator, columns: List[str], name: str):
+    """Vérifie qu'un imputer / scaler entraîné a vu exactement `columns`"""
+    names = getattr(estimator, 'feature_names_in_', None)
+    if getattr(estimator, 'n_features_in_', None) != len(columns) or (
+            names is not None and list(names) != list(columns)):
+        raise ValueError(f"Les colonnes diffèrent de celles vues par {name} (ou {name} n'est pas appris)")
+
+
+def _scale_inplace(scaler, X: np.ndarray):
+    """Applique un StandardScaler / MinMaxScaler entraîné à X, en place"""
+    if isinstance(scaler, StandardScaler):
+        if scaler.with_mean:
+            X -= scaler.mean_
+        if scaler.with_std:
+            X /= scaler.scale_
+    else:
+        X *= scaler.scale_
+        X += scaler.min_
+        if scaler.clip:
+            np.clip(X, *scaler.feature_range, out=X)
+
+
+def _is_categorical(dtype) -> bool:
+    """Colonne à encoder : object, chaînes ou category"""
+    return (isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_object_dtype(dtype)
+            or pd.api.types.is_string_dtype(dtype))
+
+
+def _nonzero(scale: np.ndarray) -> np.ndarray:
+    """Échelles nulles (colonnes constantes) remplacées par 1, comme sklearn"""
+    return np.where(scale < 10 * np.finfo(scale.dtype).eps, 1.0, scale)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,150 @@
+"""
+Statistiques par colonne accumulées bloc par bloc
+Moyenne et variance fusionnées par la formule de Chan (Welford par blocs),
+minimum, maximum et effectifs des valeurs non manquantes
+"""
+
+import numpy as np
+from collections import Counter
+from typing import List
+
+
+class RunningStats:
+    """
+    Moyenne, variance, min et max de chaque colonne, NaN ignorés
+
+    Les blocs sont fusionnés sans conserver les données : un bloc de n
+    lignes coûte O(n * colonnes) et l'état O(colonnes). Les calculs sont
+    faits en float64 quel que soit le dtype des blocs.
+    """
+
+    def __init__(self, n_features: int, track_counts: bool = False):
+        """
+        Args:
+            n_features: Nombre de colonnes
+            track_counts: Compter les occurrences de chaque valeur (pour la valeur
+                          la plus fréquente ; mémoire proportionnelle au nombre de
+                          valeurs distinctes)
+        """
+        self.n_features = n_features
+        self.n_rows = 0
+        self.count = np.zeros(n_features, dtype=np.int64)
+        self.mean = np.zeros(n_features)
+        self.m2 = np.zeros(n_features)
+        self.min = np.full(n_features, np.nan)
+        self.max = np.full(n_features, np.nan)
+        self.counts: List[Counter] = [Counter() for _ in range(n_features)] if track_counts else None
+
+    @property
+    def missing(self) -> np.ndarray:
+        """Nombre de valeurs manquantes par colonne"""
+        return self.n_rows - self.count
+
+    @property
+    def var(self) -> np.ndarray:
+        """Variance (ddof=0, comme StandardScaler), NaN pour une colonne vide"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.count > 0, self.m2 / self.count, np.nan)
+
+    def update(self, values: np.ndarray):
+        """
+        Ajoute un bloc
+
+        Les colonnes sont traitées une à une : les temporaires ont la taille
+        d'une colonne, pas celle du bloc.
+
+        Args:
+            values: Matrice (lignes, n_features), NaN = valeur manquante
+        """
+        values = np.asarray(values)
+        if values.ndim != 2 or values.shape[1] != self.n_features:
+            raise ValueError(f"Bloc de forme {values.shape} pour {self.n_features} colonnes")
+        if len(values) == 0:
+            return
+
+        count = np.zeros(self.n_features, dtype=np.int64)
+        mean = np.zeros(self.n_features)
+        m2 = np.zeros(self.n_features)
+        low = np.full(self.n_features, np.nan)
+        high = np.full(self.n_features, np.nan)
+        for j in range(self.n_features):
+            column = values[:, j].astype(np.float64, copy=False)
+            missing = np.isnan(column)
+            if missing.any():
+                column = column[~missing]
+            if len(column) == 0:
+                continue
+            count[j] = len(column)
+            mean[j] = column.mean()
+            centered = column - mean[j]
+            m2[j] = np.dot(centered, centered)
+            low[j], high[j] = column.min(), column.max()
+            if self.counts is not None:
+                uniques, occurrences = np.unique(column, return_counts=True)
+                self.counts[j].update(dict(zip(uniques.tolist(), occurrences.tolist())))
+
+        self.mean, self.m2, self.count = merge_moments(self.count, self.mean, self.m2, count, mean, m2)
+        # fmin / fmax ignorent les NaN des colonnes vides
+        self.min = np.fmin(self.min, low)
+        self.max = np.fmax(self.max, high)
+        self.n_rows += len(values)
+
+    def most_frequent(self) -> np.ndarray:
+        """Valeur la plus fréquente par colonne (la plus petite en cas d'égalité, comme SimpleImputer)"""
+        if self.counts is None:
+            raise ValueError("Effectifs non suivis (track_counts=False)")
+        modes = np.full(self.n_features, np.nan)
+        for column, counter in enumerate(self.counts):
+            if counter:
+                top = max(counter.values())
+                modes[column] = min(value for value, n in counter.items() if n == top)
+        return modes
+
+    def filled(self, fill: np.ndarray) -> 'RunningStats':
+        """
+        Statistiques qu'auraient les colonnes si leurs valeurs manquantes valaient `fill`
+
+        Les valeurs imputées forment un groupe de variance nulle fusionné
+        avec les valeurs observées : les statistiques du scaler après
+        imputation sont exactes sans second passage sur les données.
+        """
+        fill = np.asarray(fill, dtype=np.float64)
+        known = ~np.isnan(fill)
+        missing = np.where(known, self.missing, 0)
+
+        stats = RunningStats(self.n_features)
+        stats.n_rows = self.n_rows
+        stats.mean, stats.m2, stats.count = merge_moments(
+            self.count, self.mean, self.m2, missing, np.where(known, fill, 0.0), np.zeros(self.n_features)
+        )
+        imputed = known & (missing > 0)
+        stats.min = np.where(imputed, np.fmin(self.min, fill), self.min)
+        stats.max = np.where(imputed, np.fmax(self.max, fill), self.max)
+        return stats
+
+    def select(self, keep: np.ndarray) -> 'RunningStats':
+        """Statistiques des seules colonnes retenues (masque booléen ou indices)"""
+        keep = np.arange(self.n_features)[keep]
+        stats = RunningStats(len(keep))
+        stats.n_rows = self.n_rows
+        stats.count, stats.mean, stats.m2 = self.count[keep], self.mean[keep], self.m2[keep]
+        stats.min, stats.max = self.min[keep], self.max[keep]
+        if self.counts is not None:
+            stats.counts = [self.counts[j] for j in keep]
+        return stats
+
+
+def merge_moments(count_a, mean_a, m2_a, count_b, mean_b, m2_b):
+    """
+    Fusion de deux groupes (effectif, moyenne, somme des carrés des écarts)
+
+    Returns:
+        (moyenne, m2, effectif) du groupe réuni
+    """
+    count = count_a + count_b
+    delta = mean_b - mean_a
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weight = np.where(count > 0, count_b / count, 0.0)
+    mean = mean_a + delta * weight
+    m2 = m2_a + m2_b + delta ** 2 * count_a * weight
+    return mean, m2, count
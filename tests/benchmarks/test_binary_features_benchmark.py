@@ -0,0 +1,167 @@
+"""
+Benchmarks de débit (MB/s) pour BinaryFeatureExtractor.
+
+Désactivés par défaut (plusieurs secondes sur 128 MB) :
+    ML_TOOLKIT_BENCHMARKS=1 pytest tests/benchmarks -s
+"""
+
+import os
+import time
+
+import numpy as np
+import pytest
+
+from my_ml_toolkit.feature_extraction.binary_features import BinaryFeatureExtractor
+
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(
+        not os.environ.get("ML_TOOLKIT_BENCHMARKS"),
+        reason="Benchmarks désactivés (définir ML_TOOLKIT_BENCHMARKS=1)",
+    ),
+]
+
+MB = 1024 * 1024
+
+
+def _throughput(func, data: bytes) -> float:
+    """Débit en MB/s d'un appel unique de func(data)."""
+    start = time.perf_counter()
+    func(data)
+    elapsed = time.perf_counter() - start
+    return (len(data) / MB) / max(elapsed, 1e-9)
+
+
+def _legacy_printable_ratio(data: bytes) -> float:
+    """Implémentation historique (générateur Python octet par octet)."""
+    printable_count = sum(1 for b in data if 32 <= b <= 126)
+    return printable_count / len(data) if len(data) > 0 else 0.0
+
+
+@pytest.mark.parametrize("size_mb", [1, 16, 128])
+def test_printable_ratio_throughput(size_mb):
+    rng = np.random.default_rng(size_mb)
+    data = rng.integers(0, 256, size=size_mb * MB, dtype=np.uint8).tobytes()
+    extractor = BinaryFeatureExtractor()
+
+    def vectorized(buf):
+        return extractor._calculate_printable_ratio(np.frombuffer(buf, dtype=np.uint8))
+
+    before = _throughput(_legacy_printable_ratio, data)
+    after = _throughput(vectorized, data)
+    print(f"\nprintable_ratio {size_mb:>4} MB : avant {before:10.1f} MB/s | après {after:10.1f} MB/s")
+
+    assert vectorized(data) == pytest.approx(_legacy_printable_ratio(data))
+    assert after > before
+
+
+def test_entropy_profile_100mb():
+    from my_ml_toolkit.feature_extraction.entropy_profile import EntropyProfiler
+
+    rng = np.random.default_rng(0)
+    byte_array = rng.integers(0, 256, size=100 * MB, dtype=np.uint8)
+    profiler = EntropyProfiler(window_size=256)
+
+    start = time.perf_counter()
+    profile = profiler.profile(byte_array)
+    elapsed = time.perf_counter() - start
+    print(f"\nentropy_profile 100 MB : {elapsed:.3f} s ({100 / elapsed:.1f} MB/s)")
+
+    assert len(profile) == profiler.num_windows(len(byte_array))
+    assert elapsed < 1.0
+
+
+def test_statistical_block_latency():
+    extractor = BinaryFeatureExtractor()
+    rng = np.random.default_rng(1)
+    data = rng.integers(0, 256, size=16 * MB, dtype=np.uint8).tobytes()
+    byte_array = np.frombuffer(data, dtype=np.uint8)
+
+    def multi_pass(buf):
+        arr = np.frombuffer(buf, dtype=np.uint8)
+        return (extractor._calculate_entropy(arr), np.mean(arr), np.std(arr),
+                np.min(arr), np.max(arr), len(np.unique(arr)), len(np.unique(arr)),
+                np.sum(arr == 0), np.mean(arr == 0), np.mean(arr > 127))
+
+    def fused(buf):
+        return extractor.extract_statistical_features(buf, byte_array=byte_array)
+
+    before = _throughput(multi_pass, data)
+    after = _throughput(fused, data)
+    print(f"\nstatistical block 16 MB : multi-passes {before:8.1f} MB/s | histogramme {after:8.1f} MB/s")
+
+    assert after > before
+
+
+def test_extract_batch_scaling(tmp_path):
+    rng = np.random.default_rng(2)
+    paths = []
+    for i in range(500):
+        path = tmp_path / f"sample_{i}.bin"
+        path.write_bytes(rng.integers(0, 256, size=64 * 1024, dtype=np.uint8).tobytes())
+        paths.append(str(path))
+
+    extractor = BinaryFeatureExtractor()
+    timings = {}
+    for n_jobs in (1, -1):
+        start = time.perf_counter()
+        df = extractor.extract_batch(paths, n_jobs=n_jobs)
+        timings[n_jobs] = time.perf_counter() - start
+        assert len(df) == len(paths)
+
+    speedup = timings[1] / timings[-1]
+    print(f"\nextract_batch 500 fichiers : 1 proc {timings[1]:.2f} s | "
+          f"{os.cpu_count()} procs {timings[-1]:.2f} s | x{speedup:.1f}")
+
+
+def _legacy_repeated_sequences(data: bytes, min_length: int = 4, min_repeats: int = 3) -> int:
+    """Implémentation historique (dictionnaire de slices de 4 bytes)."""
+    sequences = {}
+    count = 0
+    for i in range(0, len(data) - min_length, min_length):
+        seq = data[i:i + min_length]
+        sequences[seq] = sequences.get(seq, 0) + 1
+        if sequences[seq] == min_repeats:
+            count += 1
+    return count
+
+
+def test_repeated_sequences_throughput():
+    from my_ml_toolkit.feature_extraction.repeated_sequences import RepeatedSequenceCounter
+
+    rng = np.random.default_rng(3)
+    # Moitié aléatoire, moitié motif répété : table de taille réaliste
+    data = (rng.integers(0, 256, size=8 * MB, dtype=np.uint8).tobytes()
+            + bytes(range(64)) * (8 * MB // 64))
+    counter = RepeatedSequenceCounter()
+
+    def vectorized(buf):
+        return counter.extract_features(np.frombuffer(buf, dtype=np.uint8))
+
+    before = _throughput(_legacy_repeated_sequences, data)
+    after = _throughput(vectorized, data)
+    print(f"\nrepeated_sequences 16 MB : dict {before:8.1f} MB/s | np.unique {after:8.1f} MB/s")
+
+    assert after > before
+
+
+def test_repeated_sequences_100mb():
+    from my_ml_toolkit.feature_extraction.repeated_sequences import RepeatedSequenceCounter
+
+    # Données aléatoires : presque toutes les séquences sont distinctes (pire cas des tables)
+    data = np.random.default_rng(4).integers(0, 256, size=100 * MB, dtype=np.uint8).tobytes()
+    byte_array = np.frombuffer(data, dtype=np.uint8)
+
+    start = time.perf_counter()
+    RepeatedSequenceCounter().extract_features(byte_array)
+    repeated = time.perf_counter() - start
+
+    start = time.perf_counter()
+    BinaryFeatureExtractor().extract_all_features(data)
+    total = time.perf_counter() - start
+    print(f"\nrepeated_sequences 100 MB : {repeated:.2f} s sur {total:.2f} s pour extract_all_features")
+
+    # Avant : ~3.9 s sur ~6 s (re-tri de toute la table à chaque fusion)
+    assert repeated < 3.0
+    assert total < 5.0
@@ -0,0 +1,52 @@
+"""
+Benchmark d'encodage des catégorielles : astype(str) + LabelEncoder vs CategoricalEncoder.
+
+Désactivé par défaut :
+    ML_TOOLKIT_BENCHMARKS=1 pytest tests/benchmarks -s
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import LabelEncoder
+
+from my_ml_toolkit.preprocessing.categorical import CategoricalEncoder
+
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(
+        not os.environ.get("ML_TOOLKIT_BENCHMARKS"),
+        reason="Benchmarks désactivés (définir ML_TOOLKIT_BENCHMARKS=1)",
+    ),
+]
+
+
+def test_encode_1m_rows_high_cardinality():
+    rng = np.random.default_rng(0)
+    vocabulary = np.array([f"imphash_{i:06x}" for i in range(200_000)], dtype=object)
+    series = pd.Series(vocabulary[rng.zipf(1.3, 1_000_000) % len(vocabulary)])
+
+    start = time.perf_counter()
+    LabelEncoder().fit_transform(series.astype(str))
+    label_time = time.perf_counter() - start
+
+    timings = {}
+    for name, encoder in [("vocabulaire", CategoricalEncoder()),
+                          ("vocabulaire (10k max)", CategoricalEncoder(max_categories=10_000)),
+                          ("hachage (2^16 seaux)", CategoricalEncoder(hash_buckets=1 << 16))]:
+        start = time.perf_counter()
+        encoder.encode("imphash", series)
+        fit_time = time.perf_counter() - start
+        start = time.perf_counter()
+        encoder.encode("imphash", series)
+        timings[name] = (fit_time, time.perf_counter() - start)
+
+    print(f"\nencodage 1M lignes : LabelEncoder {label_time:.2f} s")
+    for name, (fit_time, transform_time) in timings.items():
+        print(f"  {name:22s} apprentissage {fit_time:.2f} s | encodage {transform_time:.2f} s")
+
+    assert timings["vocabulaire"][0] < label_time
@@ -0,0 +1,52 @@
+"""
+Benchmark d'assemblage des features : liste de dictionnaires vs ColumnarBatch.
+
+Désactivé par défaut :
+    ML_TOOLKIT_BENCHMARKS=1 pytest tests/benchmarks -s
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from my_ml_toolkit.feature_extraction.binary_features import BinaryFeatureExtractor
+from my_ml_toolkit.feature_extraction.columnar import ColumnarBatch
+
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(
+        not os.environ.get("ML_TOOLKIT_BENCHMARKS"),
+        reason="Benchmarks désactivés (définir ML_TOOLKIT_BENCHMARKS=1)",
+    ),
+]
+
+
+def test_assembly_100k_rows():
+    extractor = BinaryFeatureExtractor()
+    rng = np.random.default_rng(0)
+    sample = extractor.extract_all_features(rng.integers(0, 256, 4096, dtype=np.uint8).tobytes())
+    rows = [dict(sample) for _ in range(100_000)]
+
+    start = time.perf_counter()
+    df_dicts = pd.DataFrame(rows)
+    dicts_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = ColumnarBatch(extractor.feature_schema(), capacity=len(rows))
+    batch.extend(rows)
+    df_columnar = batch.to_frame()
+    columnar_time = time.perf_counter() - start
+
+    dicts_mb = df_dicts.memory_usage(deep=True).sum() / 2**20
+    columnar_mb = batch.nbytes / 2**20
+    training_mb = batch.to_frame(identifiers="drop").memory_usage(deep=True).sum() / 2**20
+    print(f"\nassemblage 100k lignes : dicts {dicts_time:.2f} s ({dicts_mb:.0f} MB) | "
+          f"colonnaire {columnar_time:.2f} s ({columnar_mb:.0f} MB d'arrays, "
+          f"{training_mb:.0f} MB sans empreintes)")
+
+    assert df_columnar.shape == df_dicts.shape
+    assert columnar_mb < dicts_mb / 2
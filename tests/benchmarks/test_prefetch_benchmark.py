@@ -0,0 +1,63 @@
+"""
+Benchmark de la lecture anticipée : lecture puis extraction en série vs PrefetchReader,
+sur un stockage à latence simulée.
+
+Désactivé par défaut :
+    ML_TOOLKIT_BENCHMARKS=1 pytest tests/benchmarks -s
+"""
+
+import os
+import time
+
+import numpy as np
+import pytest
+
+from my_ml_toolkit.data_loader.binary import BinaryLoader
+from my_ml_toolkit.data_loader.prefetch import PrefetchReader
+from my_ml_toolkit.feature_extraction.binary_features import BinaryFeatureExtractor
+
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(
+        not os.environ.get("ML_TOOLKIT_BENCHMARKS"),
+        reason="Benchmarks désactivés (définir ML_TOOLKIT_BENCHMARKS=1)",
+    ),
+]
+
+LATENCY = 0.01
+
+
+class LatencyLoader(BinaryLoader):
+    def load_file(self, filepath, mmap=False):
+        time.sleep(LATENCY)
+        return super().load_file(filepath, mmap=mmap)
+
+
+def test_prefetch_overlaps_latency(tmp_path):
+    rng = np.random.default_rng(0)
+    paths = []
+    for i in range(200):
+        path = tmp_path / f"s{i}.bin"
+        path.write_bytes(rng.integers(0, 256, 64 << 10, dtype=np.uint8).tobytes())
+        paths.append(str(path))
+
+    extractor = BinaryFeatureExtractor()
+    loader = LatencyLoader()
+
+    start = time.perf_counter()
+    serial = [extractor.extract_all_features(loader.load_file(p)) for p in paths]
+    serial_time = time.perf_counter() - start
+
+    reader = PrefetchReader(loader, max_in_flight=16, max_buffered_bytes=4 << 20)
+    start = time.perf_counter()
+    prefetched = [features for _, features in extractor.iter_prefetch_batch(paths, reader=reader)]
+    prefetch_time = time.perf_counter() - start
+
+    stats = reader.stats.snapshot()
+    print(f"\n200 fichiers, latence {LATENCY * 1000:.0f} ms : série {serial_time:.2f} s | "
+          f"prefetch {prefetch_time:.2f} s (file max {stats['max_queue_depth']}, "
+          f"{stats['max_buffered_bytes'] / 2**20:.1f} MB max en mémoire)")
+
+    assert prefetched == serial
+    assert prefetch_time < serial_time
@@ -0,0 +1,66 @@
+"""
+Benchmark de prétraitement : étapes séparées (une copie par étape) vs preprocess_full fusionné.
+
+Désactivé par défaut :
+    ML_TOOLKIT_BENCHMARKS=1 pytest tests/benchmarks -s
+"""
+
+import os
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from my_ml_toolkit.preprocessing.numeric_prep import NumericPreprocessor
+
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(
+        not os.environ.get("ML_TOOLKIT_BENCHMARKS"),
+        reason="Benchmarks désactivés (définir ML_TOOLKIT_BENCHMARKS=1)",
+    ),
+]
+
+
+def _measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def test_preprocess_500k_rows():
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(500_000, 50))
+    values[rng.random(values.shape) < 0.02] = np.nan
+    df = pd.DataFrame(values, columns=[f"f{i}" for i in range(50)])
+    df["label"] = rng.integers(0, 2, len(df))
+    frame_mb = values.nbytes / 2**20
+    del values
+
+    def separate():
+        prep = NumericPreprocessor()
+        X = prep.encode_categorical(df.copy().drop(columns=["label"]))
+        X = prep.handle_missing_values(X)
+        prep.scale_features(X)
+
+    def fused():
+        NumericPreprocessor().preprocess_full(df, target_col="label")
+
+    separate_time, separate_mb = _measure(separate)
+    fused_time, fused_mb = _measure(fused)
+    fused32_time, fused32_mb = _measure(
+        lambda: NumericPreprocessor().preprocess_full(df, target_col="label", dtype=np.float32)
+    )
+    print(f"\nprétraitement 500k x 50 ({frame_mb:.0f} MB) : étapes séparées {separate_time:.2f} s "
+          f"(pic {separate_mb:.0f} MB) | fusionné {fused_time:.2f} s (pic {fused_mb:.0f} MB) | "
+          f"fusionné float32 {fused32_time:.2f} s (pic {fused32_mb:.0f} MB)")
+
+    assert fused_mb < 2 * frame_mb
+    assert fused_mb < separate_mb / 2
@@ -0,0 +1,65 @@
+"""
+Benchmark d'échange de la table de features entre tâches : CSV vs Parquet vs Feather.
+
+Désactivé par défaut :
+    ML_TOOLKIT_BENCHMARKS=1 pytest tests/benchmarks -s
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from my_ml_toolkit.data_loader.tabular import TabularLoader
+
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(
+        not os.environ.get("ML_TOOLKIT_BENCHMARKS"),
+        reason="Benchmarks désactivés (définir ML_TOOLKIT_BENCHMARKS=1)",
+    ),
+]
+
+
+def _feature_table(n: int) -> pd.DataFrame:
+    """Table de features compacte typique (flottants float32, effectifs uint32, drapeaux uint8)"""
+    rng = np.random.default_rng(0)
+    columns = {f"ratio_{i}": rng.random(n, dtype=np.float32) for i in range(20)}
+    columns.update({f"count_{i}": rng.integers(0, 5000, n).astype(np.uint32) for i in range(10)})
+    columns.update({f"flag_{i}": rng.integers(0, 2, n).astype(np.uint8) for i in range(10)})
+    columns["label"] = rng.integers(0, 2, n).astype(np.uint8)
+    return pd.DataFrame(columns)
+
+
+def test_round_trip_1m_rows(tmp_path):
+    loader = TabularLoader()
+    df = _feature_table(1_000_000)
+    projection = ["ratio_0", "count_0", "label"]
+
+    timings = {}
+    for name in ("features.csv", "features.parquet", "features.feather"):
+        path = str(tmp_path / name)
+        start = time.perf_counter()
+        loader.save(df, path)
+        written = time.perf_counter() - start
+
+        start = time.perf_counter()
+        full = loader.load(path)
+        read = time.perf_counter() - start
+
+        start = time.perf_counter()
+        loader.load(path, columns=projection)
+        projected = time.perf_counter() - start
+
+        assert full.shape == df.shape
+        size_mb = os.path.getsize(path) / 2**20
+        timings[name] = written + read
+        print(f"\n{name:18s} écriture {written:.2f} s | lecture {read:.2f} s | "
+              f"3 colonnes {projected:.3f} s | {size_mb:.0f} MB | dtypes conservés: "
+              f"{(full.dtypes == df.dtypes).all()}")
+
+    assert timings["features.parquet"] < timings["features.csv"]
+    assert timings["features.feather"] < timings["features.csv"]
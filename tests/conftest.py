@@ -31,6 +31,66 @@ def binary_elf():
     return b"\x7fELF" + b"\x01\x02\x03" + b"\x00" * 100
 
 
+def build_pe(text: bytes = None, data: bytes = None, dlls=("KERNEL32.dll", "ws2_32.dll")) -> bytes:
+    """
+    PE32 minimal valide : sections .text (code), .data et .idata (imports).
+
+    Chaque section occupe 0x200 bytes sur disque et une page en mémoire.
+    """
+    import struct
+
+    text = (text if text is not None else b"\x90" * 0x200).ljust(0x200, b"\x00")[:0x200]
+    data = (data if data is not None else b"config=1;" * 56).ljust(0x200, b"\x00")[:0x200]
+
+    # .idata (RVA 0x3000) : descripteurs, noms de DLL, thunks, hint/name
+    idata = bytearray(0x200)
+    base = 0x3000
+    names_at, thunks_at, hint_at = 0x80, 0x100, 0x180
+    struct.pack_into("<H", idata, hint_at, 0)
+    idata[hint_at + 2:hint_at + 9] = b"socket\x00"
+    for index, dll in enumerate(dlls):
+        name_rva = base + names_at + index * 0x20
+        idata[names_at + index * 0x20:names_at + index * 0x20 + len(dll)] = dll.encode()
+        thunk_rva = base + thunks_at + index * 0x10
+        struct.pack_into("<I", idata, thunks_at + index * 0x10, base + hint_at)
+        struct.pack_into("<IIIII", idata, index * 20, thunk_rva, 0, 0, name_rva, thunk_rva)
+
+    header = bytearray(0x200)
+    header[:2] = b"MZ"
+    struct.pack_into("<I", header, 0x3C, 0x40)
+    header[0x40:0x44] = b"PE\x00\x00"
+    struct.pack_into("<HHIIIHH", header, 0x44, 0x14C, 3, 0x5F000000, 0, 0, 0xE0, 0x0102)
+
+    optional = 0x58
+    struct.pack_into("<H", header, optional, 0x10B)
+    struct.pack_into("<I", header, optional + 16, 0x1000)      # AddressOfEntryPoint
+    struct.pack_into("<I", header, optional + 28, 0x400000)    # ImageBase
+    struct.pack_into("<II", header, optional + 32, 0x1000, 0x200)
+    struct.pack_into("<H", header, optional + 40, 4)           # MajorOperatingSystemVersion
+    struct.pack_into("<H", header, optional + 48, 4)           # MajorSubsystemVersion
+    struct.pack_into("<II", header, optional + 56, 0x4000, 0x200)
+    struct.pack_into("<H", header, optional + 68, 2)           # Subsystem
+    struct.pack_into("<I", header, optional + 92, 16)          # NumberOfRvaAndSizes
+    struct.pack_into("<II", header, optional + 96 + 8, base, 20 * (len(dlls) + 1))
+
+    sections = [
+        (b".text", 0x1000, 0x200, 0x60000020),
+        (b".data", 0x2000, 0x400, 0xC0000040),
+        (b".idata", 0x3000, 0x600, 0xC0000040),
+    ]
+    for index, (name, rva, raw, flags) in enumerate(sections):
+        struct.pack_into("<8sIIIIIIHHI", header, optional + 0xE0 + index * 40,
+                         name, 0x200, rva, 0x200, raw, 0, 0, 0, 0, flags)
+
+    return bytes(header) + text + data + bytes(idata)
+
+
+@pytest.fixture
+def binary_pe():
+    """PE32 synthétique avec imports (KERNEL32.dll, ws2_32.dll)."""
+    return build_pe()
+
+
 # ---------------------------------------------------------------------------
 # DataFrames tabulaires
 # ---------------------------------------------------------------------------
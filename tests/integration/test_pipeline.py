@@ -79,6 +79,25 @@ class TestExtractFeatures:
         assert result.shape[0] == 2
         assert "filename" in result.columns
 
+    @pytest.mark.parametrize("dtype", ["float64", "float32"])
+    def test_binary_dtypes_independent_of_call_shape(self, tmp_binary_file, binary_benign, dtype):
+        pipeline = MLPipeline(data_type="binary", dtype=dtype)
+        from_paths = pipeline.extract_features([tmp_binary_file]).drop(columns=["filename"])
+        from_pairs = pipeline.extract_features([("sample.bin", binary_benign)]).drop(columns=["filename"])
+        single = pipeline.extract_features(binary_benign)
+        pd.testing.assert_series_equal(single.dtypes, from_paths.dtypes)
+        pd.testing.assert_series_equal(single.dtypes, from_pairs.dtypes)
+        floats = [name for name, col_dtype in single.dtypes.items() if col_dtype.kind == "f"]
+        assert floats and all(single[name].dtype == np.dtype(dtype) for name in floats)
+
+    @pytest.mark.parametrize("dtype", ["float64", "float32"])
+    def test_text_dtypes_independent_of_call_shape(self, dtype):
+        pipeline = MLPipeline(data_type="text", dtype=dtype)
+        single = pipeline.extract_features("Hello world test")
+        batch = pipeline.extract_features(["Hello world test", "Another one."])
+        pd.testing.assert_series_equal(single.dtypes, batch.dtypes)
+        assert single["lexical_diversity"].dtype == np.dtype(dtype)
+
     def test_text_single_returns_one_row(self):
         pipeline = MLPipeline(data_type="text")
         result = pipeline.extract_features("This is a test sentence.")
@@ -107,6 +126,15 @@ class TestLoadData:
         assert isinstance(df, pd.DataFrame)
         assert df.shape[0] == 20
 
+    @pytest.mark.parametrize("name", ["data.parquet", "data.feather"])
+    def test_load_columnar_formats(self, tmp_csv, tmp_path, name):
+        pipeline = MLPipeline(data_type="tabular")
+        expected = pipeline.load_data(tmp_csv)
+        path = str(tmp_path / name)
+        pipeline.loader.save(expected, path)
+        df = pipeline.load_data(path, columns=["x1", "target"])
+        pd.testing.assert_frame_equal(df, expected[["x1", "target"]])
+
     def test_load_unsupported_format_raises(self, tmp_path):
         pipeline = MLPipeline(data_type="tabular")
         p = tmp_path / "file.json"
@@ -146,6 +174,35 @@ class TestRunFullPipeline:
         assert pipeline.trainer.best_model is not None
 
 
+class TestFloat32Pipeline:
+    def test_scores_match_float64(self, tmp_path):
+        from sklearn.datasets import make_classification
+        X, y = make_classification(n_samples=400, n_features=12, n_informative=6, random_state=0)
+        df = pd.DataFrame(X, columns=[f"f{i}" for i in range(12)])
+        df["target"] = y
+        path = str(tmp_path / "data.csv")
+        df.to_csv(path, index=False)
+
+        reference = MLPipeline(data_type="tabular").run_full_pipeline(path, target_col="target", verbose=False)
+        pipeline = MLPipeline(data_type="tabular", dtype="float32")
+        results = pipeline.run_full_pipeline(path, target_col="target", verbose=False)
+        for name, res in reference.items():
+            # Au plus deux échantillons de test (sur 80) classés différemment
+            assert abs(results[name]["accuracy"] - res["accuracy"]) <= 0.025
+
+    def test_components_share_dtype(self):
+        pipeline = MLPipeline(data_type="tabular", dtype="float32")
+        assert pipeline.loader.dtype == np.float32
+        assert pipeline.preprocessor.dtype == np.float32
+        assert pipeline.trainer.dtype == np.float32
+
+    def test_preprocessed_matrix_is_float32(self, tmp_csv):
+        pipeline = MLPipeline(data_type="tabular", dtype="float32")
+        df = pipeline.load_data(tmp_csv)
+        X, _ = pipeline.preprocess(df.drop(columns=["target"]))
+        assert (X.dtypes == np.float32).all()
+
+
 # ---------------------------------------------------------------------------
 # predict_new_data
 # ---------------------------------------------------------------------------
@@ -163,6 +220,50 @@ class TestPredictNewData:
         predictions = pipeline.predict_new_data(tmp_csv_no_target)
         assert len(predictions) == 20  # taille du CSV de test
 
+    def test_predict_does_not_refit_preprocessing(self, tmp_csv, tmp_csv_no_target):
+        pipeline = MLPipeline(data_type="tabular", task_type="classification")
+        pipeline.run_full_pipeline(tmp_csv, target_col="target", verbose=False)
+        frozen = pipeline.preprocessing
+        scaler = pipeline.preprocessor.scaler
+        mean, scale = scaler.mean_.copy(), scaler.scale_.copy()
+        statistics = pipeline.preprocessor.imputer.statistics_.copy()
+
+        pipeline.predict_new_data(tmp_csv_no_target)
+        assert pipeline.preprocessing is frozen
+        assert pipeline.preprocessor.scaler is scaler
+        np.testing.assert_array_equal(scaler.mean_, mean)
+        np.testing.assert_array_equal(scaler.scale_, scale)
+        np.testing.assert_array_equal(pipeline.preprocessor.imputer.statistics_, statistics)
+
+    def test_predict_before_fit_raises(self, tmp_csv_no_target):
+        pipeline = MLPipeline(data_type="tabular", task_type="classification")
+        with pytest.raises(ValueError):
+            pipeline.predict_new_data(tmp_csv_no_target)
+
+    def test_transform_matches_training_output(self, tmp_csv):
+        pipeline = MLPipeline(data_type="tabular")
+        df = pipeline.load_data(tmp_csv).assign(filename="a.exe")
+        X, _ = pipeline.fit_transform(df.drop(columns=["target"]))
+        # Colonnes numériques retenues une fois pour toutes
+        assert pipeline.preprocessing.columns == ("x1", "x2")
+        pd.testing.assert_frame_equal(pipeline.transform(df), X)
+
+    def test_second_fit_transform_relearns(self):
+        pipeline = MLPipeline(data_type="tabular")
+        pipeline.fit_transform(pd.DataFrame({"a": [1.0, np.nan, 3.0]}))
+        pipeline.fit_transform(pd.DataFrame({"a": [100.0, np.nan, 300.0]}))
+        X = pipeline.transform(pd.DataFrame({"a": [np.nan, 200.0]}))
+        # Moyenne du second apprentissage imputée puis centrée : 0
+        np.testing.assert_allclose(X["a"], [0.0, 0.0])
+
+    def test_single_sample_uses_training_statistics(self, binary_malware, binary_benign):
+        pipeline = MLPipeline(data_type="binary")
+        train = pipeline.extract_features([("mal", binary_malware), ("ben", binary_benign)])
+        pipeline.fit_transform(train)
+        X = pipeline.transform(pipeline.extract_features(binary_malware))
+        # Un scaler réappris sur une ligne donnerait uniquement des zéros
+        assert len(X) == 1 and (X.abs().to_numpy() > 0).any()
+
 
 # ---------------------------------------------------------------------------
 # Pipeline binaire end-to-end (sans entraînement complet)
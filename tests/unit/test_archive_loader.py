@@ -0,0 +1,197 @@
+"""
+Tests unitaires pour la lecture d'archives zip / tar (ArchiveReader, BinaryLoader.iter_archive)
+et l'extraction de features sur leurs membres.
+"""
+
+import io
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+from my_ml_toolkit.data_loader.archive import (
+    ArchiveLimitError, ArchiveLimits, ArchiveReader, is_archive,
+)
+from my_ml_toolkit.data_loader.binary import BinaryLoader
+from my_ml_toolkit.feature_extraction.binary_features import BinaryFeatureExtractor
+from my_ml_toolkit.pipeline import MLPipeline
+
+
+@pytest.fixture
+def members(binary_malware, binary_benign, binary_elf):
+    return {"malware.exe": binary_malware, "sub/benign.dll": binary_benign, "tool.elf": binary_elf}
+
+
+@pytest.fixture
+def zip_archive(tmp_path, members):
+    path = tmp_path / "samples.zip"
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("sub/", b"")
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return str(path)
+
+
+def _write_tar(path, members, mode="w:gz"):
+    with tarfile.open(path, mode) as archive:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+        link = tarfile.TarInfo("link.exe")
+        link.type = tarfile.SYMTYPE
+        link.linkname = "malware.exe"
+        archive.addfile(link)
+    return str(path)
+
+
+@pytest.fixture
+def tar_archive(tmp_path, members):
+    return _write_tar(tmp_path / "samples.tar.gz", members)
+
+
+@pytest.fixture
+def zero_bomb(tmp_path):
+    path = tmp_path / "bomb.zip"
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("zeros.bin", b"\x00" * (8 << 20))
+        archive.writestr("ok.bin", b"ok")
+    return str(path)
+
+
+# ---------------------------------------------------------------------------
+# ArchiveReader
+# ---------------------------------------------------------------------------
+
+class TestArchiveReader:
+    def test_is_archive(self):
+        assert is_archive("a/b.ZIP") and is_archive("x.tar.gz") and is_archive("x.tgz")
+        assert not is_archive("x.exe")
+
+    @pytest.mark.parametrize("archive", ["zip_archive", "tar_archive"])
+    def test_members_streamed(self, archive, members, request):
+        path = request.getfixturevalue(archive)
+        found = {member.name: b"".join(chunks) for member, chunks in ArchiveReader(path, chunk_size=100)}
+        assert found == members
+
+    def test_plain_tar(self, tmp_path, members):
+        path = _write_tar(tmp_path / "samples.tar", members, mode="w")
+        assert {m.name for m, _ in ArchiveReader(path)} == set(members)
+
+    def test_chunks_bounded(self, zip_archive):
+        for _, chunks in ArchiveReader(zip_archive, chunk_size=64):
+            assert all(len(chunk) <= 64 for chunk in chunks)
+
+    def test_max_bytes_truncates(self, tar_archive, members):
+        found = {m.name: b"".join(c) for m, c in ArchiveReader(tar_archive, max_bytes=10)}
+        assert found == {name: data[:10] for name, data in members.items()}
+
+    def test_name_filter_on_basename(self, zip_archive):
+        reader = ArchiveReader(zip_archive, matches=lambda name: name.endswith(".dll"))
+        assert [m.name for m, _ in reader] == ["sub/benign.dll"]
+
+    def test_member_size_limit(self, zip_archive):
+        reader = ArchiveReader(zip_archive, limits=ArchiveLimits(max_member_size=300))
+        errors = 0
+        for member, chunks in reader:
+            try:
+                b"".join(chunks)
+            except ArchiveLimitError:
+                errors += 1
+        assert errors >= 1 and reader.num_members == 3
+
+    def test_ratio_limit_stops_bomb(self, zero_bomb):
+        entries = iter(ArchiveReader(zero_bomb, limits=ArchiveLimits(max_ratio=50)))
+        member, chunks = next(entries)
+        with pytest.raises(ArchiveLimitError, match="taux de compression"):
+            for _ in chunks:
+                pass
+        # Membre suivant toujours lisible (taux vérifié par membre dans un zip)
+        assert [b"".join(c) for _, c in entries] == [b"ok"]
+
+    def test_total_size_aborts_archive(self, zip_archive):
+        reader = ArchiveReader(zip_archive, limits=ArchiveLimits(max_total_size=1000))
+        seen = []
+        with pytest.raises(ArchiveLimitError):
+            for member, chunks in reader:
+                seen.append(member.name)
+                b"".join(chunks)
+        assert len(seen) < 3
+
+    def test_member_count_limit(self, zip_archive):
+        with pytest.raises(ArchiveLimitError, match="membres"):
+            list(ArchiveReader(zip_archive, limits=ArchiveLimits(max_members=2)))
+
+    def test_not_an_archive(self, tmp_binary_file):
+        with pytest.raises(tarfile.ReadError):
+            list(ArchiveReader(tmp_binary_file))
+
+
+# ---------------------------------------------------------------------------
+# BinaryLoader
+# ---------------------------------------------------------------------------
+
+class TestBinaryLoaderArchives:
+    def test_load_archive_matches_members(self, zip_archive, members):
+        assert dict(BinaryLoader().load_archive(zip_archive)) == members
+
+    def test_extension_filter(self, tar_archive):
+        names = [name for name, _ in BinaryLoader().iter_archive(tar_archive, extensions=[".exe"])]
+        assert names == ["malware.exe"]
+
+    def test_oversized_member_reported_and_skipped(self, zip_archive):
+        errors = []
+        loader = BinaryLoader(archive_limits=ArchiveLimits(max_member_size=300))
+        loaded = list(loader.iter_archive(zip_archive, on_error=lambda p, e: errors.append(p)))
+        assert len(loaded) + len(errors) == 3
+        assert all(path.startswith(zip_archive + "/") for path in errors)
+
+    def test_unreadable_archive_reported(self, tmp_binary_file):
+        errors = []
+        assert list(BinaryLoader().iter_archive(tmp_binary_file, on_error=lambda p, e: errors.append(p))) == []
+        assert errors == [tmp_binary_file]
+
+    def test_pipeline_load_data_reads_archive(self, zip_archive, members):
+        pipeline = MLPipeline(data_type="binary")
+        df = pipeline.extract_features(pipeline.load_data(zip_archive))
+        assert sorted(df["filename"]) == sorted(members)
+
+
+# ---------------------------------------------------------------------------
+# Extraction sur archives
+# ---------------------------------------------------------------------------
+
+class TestArchiveExtraction:
+    def test_features_match_in_memory(self, tar_archive, members):
+        extractor = BinaryFeatureExtractor()
+        for member, features in extractor.iter_archive_batch([tar_archive]):
+            assert features == extractor.extract_all_features(members[member.name])
+
+    def test_parallel_matches_serial(self, zip_archive, tar_archive):
+        extractor = BinaryFeatureExtractor()
+        serial = list(extractor.iter_archive_batch([zip_archive, tar_archive]))
+        parallel = list(extractor.iter_archive_batch([zip_archive, tar_archive], n_jobs=2))
+        assert parallel == serial
+
+    def test_frame_columns(self, zip_archive, tar_archive):
+        df = BinaryFeatureExtractor().extract_archive_batch([zip_archive, tar_archive], extensions=[".exe"])
+        assert list(df["archive"]) == ["samples.zip", "samples.tar.gz"]
+        assert list(df["filename"]) == ["malware.exe", "malware.exe"]
+        assert list(df.columns[-2:]) == ["archive", "filename"]
+
+    def test_bomb_member_reported(self, zero_bomb):
+        errors = []
+        loader = BinaryLoader(archive_limits=ArchiveLimits(max_ratio=50))
+        results = list(BinaryFeatureExtractor().iter_archive_batch(
+            [zero_bomb], loader=loader, on_error=lambda p, e: errors.append((p, e))
+        ))
+        assert [member.name for member, _ in results] == ["ok.bin"]
+        assert errors[0][0] == zero_bomb + "/zeros.bin" and "ArchiveLimitError" in errors[0][1]
+
+    def test_unreadable_archive_reported(self, tmp_binary_file, zip_archive):
+        errors = []
+        results = list(BinaryFeatureExtractor().iter_archive_batch(
+            [tmp_binary_file, zip_archive], on_error=lambda p, e: errors.append(p)
+        ))
+        assert len(results) == 3 and errors == [tmp_binary_file]
@@ -237,3 +237,34 @@ class TestGetResultsDataframe:
         df = trainer.get_results_dataframe()
         accuracies = df["Accuracy"].tolist()
         assert accuracies == sorted(accuracies, reverse=True)
+
+
+# ---------------------------------------------------------------------------
+# Précision float32
+# ---------------------------------------------------------------------------
+
+class TestFloat32Mode:
+    def test_invalid_dtype_raises(self):
+        with pytest.raises(ValueError):
+            AutoTrainer("classification", dtype="int32")
+
+    def test_classification_scores_match_float64(self, classification_dataset):
+        X, y = classification_dataset
+        reference = AutoTrainer("classification").train_all_models(X, y, verbose=False)
+        results = AutoTrainer("classification", dtype="float32").train_all_models(X, y, verbose=False)
+        for name, res in reference.items():
+            # Au plus deux échantillons de test (sur 40) classés différemment
+            assert abs(results[name]["accuracy"] - res["accuracy"]) <= 0.05
+
+    def test_regression_scores_match_float64(self, regression_dataset):
+        X, y = regression_dataset
+        reference = AutoTrainer("regression").train_all_models(X, y, verbose=False)
+        results = AutoTrainer("regression", dtype="float32").train_all_models(X, y, verbose=False)
+        for name, res in reference.items():
+            assert results[name]["r2"] == pytest.approx(res["r2"], abs=1e-2)
+
+    def test_predict_accepts_float64_input(self, classification_dataset):
+        X, y = classification_dataset
+        trainer = AutoTrainer("classification", dtype="float32")
+        trainer.train_all_models(X, y, verbose=False)
+        assert len(trainer.predict(X.astype(np.float64))) == len(X)
@@ -0,0 +1,100 @@
+"""
+Tests unitaires pour l'extraction parallèle (extract_batch / iter_batch).
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from my_ml_toolkit.feature_extraction.batch import resolve_n_jobs
+from my_ml_toolkit.feature_extraction.binary_features import BinaryFeatureExtractor
+from my_ml_toolkit.pipeline import MLPipeline
+
+
+@pytest.fixture
+def extractor():
+    return BinaryFeatureExtractor()
+
+
+@pytest.fixture
+def sample_paths(tmp_binary_dir):
+    return sorted(
+        os.path.join(tmp_binary_dir, name) for name in os.listdir(tmp_binary_dir)
+    )
+
+
+# ---------------------------------------------------------------------------
+# iter_batch
+# ---------------------------------------------------------------------------
+
+class TestIterBatch:
+    def test_serial_matches_single_file_extraction(self, extractor, sample_paths):
+        for path, features in extractor.iter_batch(sample_paths):
+            with open(path, "rb") as f:
+                assert features == extractor.extract_all_features(f.read())
+
+    def test_parallel_ordered_matches_serial(self, extractor, sample_paths):
+        serial = list(extractor.iter_batch(sample_paths, n_jobs=1))
+        parallel = list(extractor.iter_batch(sample_paths, n_jobs=2, ordered=True))
+        assert parallel == serial
+
+    def test_parallel_unordered_same_results(self, extractor, sample_paths):
+        serial = dict(extractor.iter_batch(sample_paths))
+        unordered = dict(extractor.iter_batch(sample_paths, n_jobs=2, ordered=False))
+        assert unordered == serial
+
+    def test_errors_reported_to_callback(self, extractor, sample_paths, tmp_path):
+        missing = str(tmp_path / "absent.bin")
+        errors = []
+        results = list(extractor.iter_batch(sample_paths + [missing],
+                                            on_error=lambda p, e: errors.append(p)))
+        assert len(results) == len(sample_paths)
+        assert errors == [missing]
+
+    def test_max_bytes(self, extractor, sample_paths):
+        results = dict(extractor.iter_batch(sample_paths, max_bytes=10))
+        assert all(f["file_size"] <= 10 for f in results.values())
+
+    def test_resolve_n_jobs(self):
+        assert resolve_n_jobs(None) == 1
+        assert resolve_n_jobs(3) == 3
+        assert resolve_n_jobs(-1) == (os.cpu_count() or 1)
+
+
+# ---------------------------------------------------------------------------
+# extract_batch
+# ---------------------------------------------------------------------------
+
+class TestExtractBatch:
+    def test_returns_dataframe(self, extractor, sample_paths):
+        df = extractor.extract_batch(sample_paths, n_jobs=2)
+        assert isinstance(df, pd.DataFrame)
+        assert df.shape[0] == len(sample_paths)
+        assert df.columns[-1] == "filename"
+
+    def test_rows_follow_input_order(self, extractor, sample_paths):
+        df = extractor.extract_batch(sample_paths, n_jobs=2)
+        assert list(df["filename"]) == [os.path.basename(p) for p in sample_paths]
+
+    def test_numeric_columns_typed(self, extractor, sample_paths):
+        df = extractor.extract_batch(sample_paths)
+        assert pd.api.types.is_integer_dtype(df["file_size"])
+        assert pd.api.types.is_float_dtype(df["entropy"])
+
+    def test_empty_input(self, extractor):
+        df = extractor.extract_batch([])
+        assert df.shape[0] == 0
+
+
+# ---------------------------------------------------------------------------
+# MLPipeline.extract_features avec des chemins
+# ---------------------------------------------------------------------------
+
+class TestPipelinePaths:
+    def test_pipeline_accepts_paths(self, sample_paths):
+        pipeline = MLPipeline(data_type="binary", n_jobs=2)
+        df = pipeline.extract_features(sample_paths)
+        assert df.shape[0] == len(sample_paths)
+        assert "filename" in df.columns
+        assert "entropy" in df.columns
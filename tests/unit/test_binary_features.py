@@ -5,7 +5,7 @@ Tests unitaires pour BinaryFeatureExtractor.
 import numpy as np
 import pytest
 
-from my_ml_toolkit.feature_extraction.binary_features import BinaryFeatureExtractor
+from my_ml_toolkit.feature_extraction.binary_features import BinaryFeatureExtractor, byte_histogram
 
 
 @pytest.fixture
@@ -101,6 +101,35 @@ class TestStatisticalFeatures:
         features = extractor.extract_statistical_features(binary_benign)
         assert 0 <= features["mean_byte_value"] <= 255
 
+    def test_histogram_kernel_matches_direct_numpy(self, extractor, binary_benign):
+        byte_array = np.frombuffer(binary_benign, dtype=np.uint8)
+        features = extractor.extract_statistical_features(binary_benign)
+        assert features["mean_byte_value"] == pytest.approx(np.mean(byte_array))
+        assert features["std_byte_value"] == pytest.approx(np.std(byte_array))
+        assert features["min_byte_value"] == int(byte_array.min())
+        assert features["max_byte_value"] == int(byte_array.max())
+        assert features["unique_bytes_count"] == len(np.unique(byte_array))
+        assert features["null_bytes_count"] == int(np.sum(byte_array == 0))
+        assert features["high_bytes_ratio"] == pytest.approx(np.mean(byte_array > 127))
+
+    def test_precomputed_histogram_is_used(self, extractor, binary_benign):
+        histogram = byte_histogram(np.frombuffer(binary_benign, dtype=np.uint8))
+        direct = extractor.extract_statistical_features(binary_benign)
+        fused = extractor.extract_statistical_features(binary_benign, histogram=histogram)
+        assert direct == fused
+
+    def test_byte_histogram_blocks(self, binary_malware):
+        byte_array = np.frombuffer(binary_malware, dtype=np.uint8)
+        np.testing.assert_array_equal(
+            byte_histogram(byte_array, block_size=100),
+            np.bincount(byte_array, minlength=256),
+        )
+
+    def test_empty_data_returns_zeros(self, extractor):
+        features = extractor.extract_statistical_features(b"")
+        assert features["entropy"] == 0.0
+        assert features["unique_bytes_count"] == 0
+
 
 # ---------------------------------------------------------------------------
 # extract_structural_features
@@ -162,6 +191,17 @@ class TestStructuralFeatures:
         features = extractor.extract_structural_features(data)
         assert features["printable_ratio"] == pytest.approx(0.0)
 
+    def test_printable_ratio_boundaries(self, extractor):
+        # 0x1F et 0x7F sont exclus, 0x20 et 0x7E inclus
+        data = bytes(range(256))
+        features = extractor.extract_structural_features(data)
+        expected = sum(1 for b in data if 32 <= b <= 126) / len(data)
+        assert features["printable_ratio"] == pytest.approx(expected)
+
+    def test_printable_ratio_matches_statistical_block(self, extractor, binary_malware):
+        features = extractor.extract_all_features(binary_malware)
+        assert features["printable_ratio"] == features["printable_bytes_ratio"]
+
 
 # ---------------------------------------------------------------------------
 # extract_all_features
@@ -0,0 +1,139 @@
+"""
+Tests unitaires pour l'encodage vectorisé des catégorielles (CategoricalEncoder).
+"""
+
+import json
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import LabelEncoder
+
+from my_ml_toolkit.preprocessing.categorical import (
+    UNKNOWN_CODE, CategoricalEncoder, CategoryVocabulary, HashedCategories,
+)
+from my_ml_toolkit.preprocessing.numeric_prep import NumericPreprocessor
+
+
+@pytest.fixture
+def colors():
+    return pd.Series(["red", "blue", "red", "green", "red", "blue", None, "violet"])
+
+
+# ---------------------------------------------------------------------------
+# CategoryVocabulary
+# ---------------------------------------------------------------------------
+
+class TestCategoryVocabulary:
+    def test_codes_match_label_encoder(self):
+        values = pd.Series(list("dbcadbbc"))
+        codes = CategoryVocabulary().fit(values).transform(values)
+        np.testing.assert_array_equal(codes, LabelEncoder().fit_transform(values))
+
+    def test_unseen_and_missing_get_reserved_code(self, colors):
+        vocabulary = CategoryVocabulary().fit(colors)
+        codes = vocabulary.transform(pd.Series(["red", "orange", None]))
+        assert codes[0] == list(vocabulary.categories).index("red")
+        assert codes[1] == UNKNOWN_CODE and codes[2] == UNKNOWN_CODE
+
+    def test_min_frequency(self, colors):
+        vocabulary = CategoryVocabulary().fit(colors, min_frequency=2)
+        assert list(vocabulary.categories) == ["blue", "red"]
+        assert vocabulary.transform(pd.Series(["green"]))[0] == UNKNOWN_CODE
+
+    def test_max_categories_keeps_most_frequent(self, colors):
+        vocabulary = CategoryVocabulary().fit(colors, max_categories=1)
+        assert list(vocabulary.categories) == ["red"]
+
+    def test_category_dtype_ignores_unobserved(self):
+        values = pd.Series(pd.Categorical(["a", "b", "a"], categories=["a", "b", "z"]))
+        vocabulary = CategoryVocabulary().fit(values)
+        assert list(vocabulary.categories) == ["a", "b"]
+        np.testing.assert_array_equal(vocabulary.transform(values), [0, 1, 0])
+
+    def test_compact_code_dtype(self):
+        values = pd.Series([f"v{i}" for i in range(1000)])
+        codes = CategoryVocabulary().fit(values).transform(values)
+        assert codes.dtype == np.int16
+
+
+# ---------------------------------------------------------------------------
+# HashedCategories
+# ---------------------------------------------------------------------------
+
+class TestHashedCategories:
+    def test_codes_in_range_and_stable(self, colors):
+        first = HashedCategories(16).transform(colors)
+        second = HashedCategories(16).transform(colors)
+        np.testing.assert_array_equal(first, second)
+        present = colors.notna().to_numpy()
+        assert ((first[present] >= 0) & (first[present] < 16)).all()
+        assert first[~present][0] == UNKNOWN_CODE
+        assert first[0] == first[2]
+
+    def test_category_dtype_same_buckets(self, colors):
+        plain = HashedCategories(64).transform(colors)
+        categorical = HashedCategories(64).transform(colors.astype("category"))
+        np.testing.assert_array_equal(plain, categorical)
+
+    def test_invalid_buckets(self):
+        with pytest.raises(ValueError):
+            HashedCategories(0)
+
+
+# ---------------------------------------------------------------------------
+# CategoricalEncoder et NumericPreprocessor
+# ---------------------------------------------------------------------------
+
+class TestCategoricalEncoder:
+    def test_vocabulary_learned_once(self, colors):
+        encoder = CategoricalEncoder()
+        encoder.encode("color", colors)
+        vocabulary = encoder.encoders["color"]
+        encoder.encode("color", pd.Series(["orange"]))
+        assert encoder.encoders["color"] is vocabulary
+        assert "orange" not in vocabulary.categories
+
+    def test_dict_round_trip(self, colors):
+        encoder = CategoricalEncoder(max_categories=2)
+        encoder.encode("color", colors)
+        hashed = CategoricalEncoder(hash_buckets=8)
+        hashed.encode("color", colors)
+        for original in (encoder, hashed):
+            restored = CategoricalEncoder.from_dict(json.loads(json.dumps(original.to_dict())))
+            np.testing.assert_array_equal(
+                restored.encode("color", colors), original.encode("color", colors)
+            )
+
+    def test_preprocessor_unseen_category_does_not_raise(self, sample_df):
+        prep = NumericPreprocessor()
+        prep.encode_categorical(sample_df[["category"]])
+        result = prep.encode_categorical(pd.DataFrame({"category": ["A", "Z"]}))
+        assert result["category"].tolist() == [0, UNKNOWN_CODE]
+
+    def test_preprocessor_hashing_mode(self, sample_df):
+        prep = NumericPreprocessor(hash_buckets=4)
+        X, _ = prep.preprocess_full(sample_df, target_col="label", scale=False)
+        assert X["category"].between(0, 3).all()
+        assert isinstance(prep.label_encoders["category"], HashedCategories)
+
+    def test_pickle_with_preprocessor(self, sample_df):
+        prep = NumericPreprocessor(max_categories=2)
+        prep.preprocess_full(sample_df, target_col="label")
+        restored = pickle.loads(pickle.dumps(prep))
+        assert restored.label_encoders is restored.categorical.encoders
+        pd.testing.assert_frame_equal(
+            restored.encode_categorical(sample_df[["category"]]),
+            prep.encode_categorical(sample_df[["category"]]),
+        )
+
+    def test_legacy_label_encoders_converted(self, sample_df):
+        prep = NumericPreprocessor()
+        state = dict(vars(prep))
+        del state["categorical"]
+        state["label_encoders"] = {"category": LabelEncoder().fit(sample_df["category"].astype(str))}
+        legacy = NumericPreprocessor.__new__(NumericPreprocessor)
+        legacy.__setstate__(state)
+        codes = legacy.encode_categorical(sample_df[["category"]])["category"]
+        np.testing.assert_array_equal(codes, state["label_encoders"]["category"].transform(sample_df["category"]))
@@ -0,0 +1,118 @@
+"""
+Tests unitaires pour la sortie colonnaire (FeatureSchema, ColumnarBatch).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from my_ml_toolkit.feature_extraction.binary_features import BinaryFeatureExtractor
+from my_ml_toolkit.feature_extraction.columnar import ColumnarBatch, FeatureSchema
+from my_ml_toolkit.feature_extraction.text_features import TextFeatureExtractor
+
+
+@pytest.fixture
+def schema():
+    return FeatureSchema([("size", np.int64), ("ratio", np.float64), ("name", object), ("md5", "S4")])
+
+
+# ---------------------------------------------------------------------------
+# FeatureSchema
+# ---------------------------------------------------------------------------
+
+class TestFeatureSchema:
+    def test_from_sample_dtypes(self):
+        schema = FeatureSchema.from_sample({"a": 1, "b": 0.5, "c": "x", "d": np.float64(1.0), "e": True})
+        assert dict(schema) == {
+            "a": np.dtype(np.int64), "b": np.dtype(np.float64), "c": np.dtype(object),
+            "d": np.dtype(np.float64), "e": np.dtype(bool),
+        }
+
+    def test_with_columns_appends_and_retypes(self, schema):
+        updated = schema.with_columns([("ratio", np.float32), ("filename", object)])
+        assert updated.names == ["size", "ratio", "name", "md5", "filename"]
+        assert dict(updated)["ratio"] == np.dtype(np.float32)
+        assert dict(schema)["ratio"] == np.dtype(np.float64)
+
+    def test_duplicate_columns_raise(self):
+        with pytest.raises(ValueError):
+            FeatureSchema([("a", int), ("a", float)])
+
+
+# ---------------------------------------------------------------------------
+# ColumnarBatch
+# ---------------------------------------------------------------------------
+
+class TestColumnarBatch:
+    def test_append_and_to_frame(self, schema):
+        batch = ColumnarBatch(schema, capacity=1)
+        for i in range(5):     # dépasse la capacité initiale
+            batch.append({"size": i, "ratio": i / 10, "name": f"f{i}", "md5": "abcd"})
+        df = batch.to_frame()
+        assert len(batch) == 5
+        assert list(df.columns) == schema.names
+        assert df["size"].dtype == np.int64
+        assert df["size"].tolist() == [0, 1, 2, 3, 4]
+        assert df["name"].tolist() == ["f0", "f1", "f2", "f3", "f4"]
+
+    def test_missing_values_filled(self, schema):
+        batch = ColumnarBatch(schema)
+        batch.append({"size": 3})
+        row = batch.to_frame().iloc[0]
+        assert np.isnan(row["ratio"])
+        assert row["name"] == ""
+        assert row["md5"] == ""
+
+    def test_extra_keys_ignored(self, schema):
+        batch = ColumnarBatch(schema)
+        batch.append({"size": 1, "other": 42})
+        assert "other" not in batch.to_frame().columns
+
+    def test_empty_batch(self, schema):
+        df = ColumnarBatch(schema).to_frame()
+        assert df.shape == (0, 4)
+
+    def test_to_arrow(self, schema):
+        pa = pytest.importorskip("pyarrow")
+        batch = ColumnarBatch(schema)
+        batch.append({"size": 7, "ratio": 0.25, "name": "x", "md5": "abcd"})
+        table = batch.to_arrow()
+        assert table.column_names == schema.names
+        assert table.schema.field("size").type == pa.int64()
+        assert table.schema.field("md5").type == pa.string()
+        assert table.to_pylist() == [{"size": 7, "ratio": 0.25, "name": "x", "md5": "abcd"}]
+
+
+# ---------------------------------------------------------------------------
+# Extracteurs
+# ---------------------------------------------------------------------------
+
+class TestExtractorBatches:
+    def test_binary_schema_matches_features(self, binary_malware):
+        extractor = BinaryFeatureExtractor(include_pe_sections=True)
+        assert extractor.feature_schema().names == list(extractor.extract_all_features(binary_malware))
+        assert dict(extractor.feature_schema())["sha256"] == np.dtype("S32")
+        assert extractor.feature_schema().identifiers["sha256"] == 32
+
+    def test_binary_batch_matches_dicts(self, tmp_binary_dir):
+        import os
+        paths = sorted(os.path.join(tmp_binary_dir, n) for n in os.listdir(tmp_binary_dir))
+        extractor = BinaryFeatureExtractor()
+        df = extractor.extract_batch_columnar(paths).to_frame()
+        expected = pd.DataFrame([
+            {**extractor.extract_all_features(open(p, "rb").read()), "filename": os.path.basename(p)}
+            for p in paths
+        ])
+        pd.testing.assert_frame_equal(df, expected, check_dtype=False)
+
+    def test_text_batch_matches_dicts(self, sample_texts):
+        extractor = TextFeatureExtractor()
+        df = extractor.extract_batch(sample_texts)
+        expected = pd.DataFrame([extractor.extract_all_features(t) for t in sample_texts])
+        pd.testing.assert_frame_equal(df, expected, check_dtype=False)
+        assert list(df.columns) == TextFeatureExtractor.FEATURE_SCHEMA.names
+
+    def test_text_batch_empty_text_gives_nan(self):
+        df = TextFeatureExtractor().extract_batch(["hello world", ""])
+        assert df.shape == (2, len(TextFeatureExtractor.FEATURE_SCHEMA))
+        assert np.isnan(df.loc[1, "lexical_diversity"])
@@ -0,0 +1,218 @@
+"""
+Tests unitaires pour le parcours dédoublonné du corpus (CorpusManifest, CorpusScanner).
+"""
+
+import hashlib
+import os
+import warnings
+
+import pytest
+
+from my_ml_toolkit.data_loader import corpus as corpus_module
+from my_ml_toolkit.data_loader.corpus import (
+    STATUS_MOVED, STATUS_NEW, STATUS_UNCHANGED, CorpusManifest, CorpusScanner,
+)
+from my_ml_toolkit.feature_extraction.binary_features import BinaryFeatureExtractor
+from my_ml_toolkit.feature_extraction.feature_cache import FeatureCache
+
+
+@pytest.fixture
+def corpus(tmp_path, binary_malware, binary_benign, binary_elf):
+    malware = tmp_path / "malware"
+    benign = tmp_path / "benign"
+    malware.mkdir()
+    benign.mkdir()
+    (malware / "a.exe").write_bytes(binary_malware)
+    (malware / "a_copy.exe").write_bytes(binary_malware)
+    (malware / "elf.bin").write_bytes(binary_elf)
+    (benign / "b.dll").write_bytes(binary_benign)
+    # Même contenu sous deux étiquettes
+    (benign / "a_again.exe").write_bytes(binary_malware)
+    return [(1, str(malware)), (0, str(benign))]
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    manifest = CorpusManifest(str(tmp_path / "manifest.sqlite"))
+    yield manifest
+    manifest.close()
+
+
+class CountingExtractor(BinaryFeatureExtractor):
+    """Compte les contenus réellement extraits"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.extracted = []
+
+    def iter_batch(self, paths, **kwargs):
+        paths = list(paths)
+        self.extracted.extend(paths)
+        return super().iter_batch(paths, **kwargs)
+
+
+@pytest.fixture
+def cache():
+    cache = FeatureCache(":memory:")
+    yield cache
+    cache.close()
+
+
+def _representative(entries, content: bytes) -> str:
+    """Premier chemin du contenu dupliqué (celui que extract_frame lit)"""
+    sha256 = hashlib.sha256(content).hexdigest()
+    return next(e.path for e in entries if e.sha256 == sha256)
+
+
+# ---------------------------------------------------------------------------
+# CorpusManifest
+# ---------------------------------------------------------------------------
+
+class TestCorpusManifest:
+    def test_update_and_prune(self, manifest, corpus, tmp_path):
+        scanner = CorpusScanner(manifest)
+        entries = scanner.scan(corpus)
+        scanner.extract_frame(BinaryFeatureExtractor(), entries)
+        assert len(manifest) == 5
+        assert manifest.prune([entries[0].path]) == 4
+        assert len(manifest) == 1
+
+    def test_persists_across_instances(self, tmp_path, corpus):
+        path = str(tmp_path / "m.sqlite")
+        first = CorpusManifest(path)
+        scanner = CorpusScanner(first)
+        scanner.extract_frame(BinaryFeatureExtractor(), scanner.scan(corpus))
+        first.close()
+
+        second = CorpusManifest(path)
+        entries = CorpusScanner(second).scan(corpus)
+        assert all(e.status == STATUS_UNCHANGED for e in entries)
+        second.close()
+
+
+# ---------------------------------------------------------------------------
+# CorpusScanner
+# ---------------------------------------------------------------------------
+
+class TestCorpusScanner:
+    def test_first_scan_all_new(self, manifest, corpus):
+        entries = CorpusScanner(manifest).scan(corpus)
+        assert len(entries) == 5
+        assert all(e.status == STATUS_NEW for e in entries)
+
+    def test_only_same_size_files_hashed_up_front(self, manifest, corpus):
+        scanner = CorpusScanner(manifest)
+        entries = {os.path.basename(e.path): e for e in scanner.scan(corpus)}
+        assert entries["a.exe"].sha256 == entries["a_copy.exe"].sha256 is not None
+        assert entries["elf.bin"].sha256 is None
+        assert scanner.stats["hashed"] == 3
+
+    def test_duplicates_extracted_once_and_fanned_out(self, manifest, corpus):
+        extractor = CountingExtractor()
+        scanner = CorpusScanner(manifest)
+        df = scanner.extract_frame(extractor, scanner.scan(corpus))
+
+        assert len(extractor.extracted) == 3
+        assert len(df) == 5
+        assert df["sha256"].nunique() == 3
+        copies = df[df["sha256"] == df.loc[df["filename"] == "a.exe", "sha256"].iloc[0]]
+        assert sorted(copies["filename"]) == ["a.exe", "a_again.exe", "a_copy.exe"]
+        assert sorted(copies["label"]) == [0, 1, 1]
+        assert scanner.stats["distinct_contents"] == 3
+
+    def test_features_match_direct_extraction(self, manifest, corpus, binary_elf):
+        extractor = BinaryFeatureExtractor()
+        scanner = CorpusScanner(manifest)
+        df = scanner.extract_frame(extractor, scanner.scan(corpus))
+        row = df[df["filename"] == "elf.bin"].iloc[0]
+        expected = extractor.extract_all_features(binary_elf)
+        assert row["sha256"] == expected["sha256"]
+        assert row["file_size"] == expected["file_size"]
+
+    def test_unchanged_files_not_read_with_cache(self, manifest, corpus, cache, monkeypatch):
+        scanner = CorpusScanner(manifest)
+        scanner.extract_frame(CountingExtractor(cache=cache), scanner.scan(corpus))
+
+        monkeypatch.setattr(corpus_module, "hash_file", lambda path: pytest.fail(f"relu: {path}"))
+        extractor = CountingExtractor(cache=cache)
+        entries = scanner.scan(corpus)
+        df = scanner.extract_frame(extractor, entries)
+
+        assert all(e.status == STATUS_UNCHANGED for e in entries)
+        assert extractor.extracted == []
+        assert len(df) == 5 and scanner.stats["cache_hits"] == 3
+
+    def test_modified_file_rescanned(self, manifest, corpus, cache):
+        scanner = CorpusScanner(manifest)
+        scanner.extract_frame(BinaryFeatureExtractor(cache=cache), scanner.scan(corpus))
+
+        target = os.path.join(corpus[0][1], "elf.bin")
+        with open(target, "ab") as f:
+            f.write(b"changed")
+
+        extractor = CountingExtractor(cache=cache)
+        entries = {os.path.basename(e.path): e for e in scanner.scan(corpus)}
+        assert entries["elf.bin"].status == STATUS_NEW
+        scanner.extract_frame(extractor, list(entries.values()))
+        assert extractor.extracted == [target]
+
+    def test_renamed_file_recognised_by_inode(self, manifest, corpus):
+        scanner = CorpusScanner(manifest)
+        scanner.extract_frame(BinaryFeatureExtractor(), scanner.scan(corpus))
+
+        old = os.path.join(corpus[0][1], "elf.bin")
+        new = os.path.join(corpus[0][1], "renamed.bin")
+        os.rename(old, new)
+
+        entries = {os.path.basename(e.path): e for e in scanner.scan(corpus)}
+        assert entries["renamed.bin"].status == STATUS_MOVED
+        assert entries["renamed.bin"].sha256 is not None
+
+    def test_removed_files_pruned(self, manifest, corpus):
+        scanner = CorpusScanner(manifest)
+        scanner.extract_frame(BinaryFeatureExtractor(), scanner.scan(corpus))
+        os.remove(os.path.join(corpus[1][1], "b.dll"))
+        with pytest.warns(RuntimeWarning):
+            scanner.extract_frame(BinaryFeatureExtractor(), scanner.scan(corpus))
+        assert len(manifest) == 4
+
+    def test_warns_when_known_files_reextracted_without_cache(self, manifest, corpus):
+        scanner = CorpusScanner(manifest)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            scanner.extract_frame(BinaryFeatureExtractor(), scanner.scan(corpus))
+        extractor = CountingExtractor()
+        with pytest.warns(RuntimeWarning, match="FeatureCache"):
+            scanner.extract_frame(extractor, scanner.scan(corpus))
+        assert len(extractor.extracted) == 3
+
+    def test_file_modified_after_scan(self, manifest, corpus, binary_malware):
+        scanner = CorpusScanner(manifest)
+        entries = scanner.scan(corpus)
+        changed = _representative(entries, binary_malware)
+        with open(changed, "ab") as f:
+            f.write(b"changed")
+
+        errors = []
+        df = scanner.extract_frame(BinaryFeatureExtractor(), entries, on_error=lambda p, m: errors.append(p))
+        assert errors == [] and len(df) == 5
+        sha = dict(zip(df["filename"], df["sha256"]))
+        copies = {"a.exe", "a_copy.exe", "a_again.exe"} - {os.path.basename(changed)}
+        assert len({sha[name] for name in copies}) == 1
+        assert sha[os.path.basename(changed)] not in {sha[name] for name in copies}
+
+    def test_file_removed_after_scan_reported(self, manifest, corpus, binary_malware):
+        scanner = CorpusScanner(manifest)
+        entries = scanner.scan(corpus)
+        removed = _representative(entries, binary_malware)
+        os.remove(removed)
+
+        errors = []
+        df = scanner.extract_frame(BinaryFeatureExtractor(), entries, on_error=lambda p, m: errors.append(p))
+        assert errors == [removed]
+        assert len(df) == 4 and os.path.basename(removed) not in set(df["filename"])
+
+    def test_drop_identifiers(self, manifest, corpus):
+        scanner = CorpusScanner(manifest)
+        df = scanner.extract_frame(BinaryFeatureExtractor(), scanner.scan(corpus), identifiers="drop")
+        assert "sha256" not in df.columns and list(df.columns[-2:]) == ["filename", "label"]
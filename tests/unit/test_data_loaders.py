@@ -7,7 +7,7 @@ import pandas as pd
 import pytest
 
 from my_ml_toolkit.data_loader.tabular import TabularLoader
-from my_ml_toolkit.data_loader.binary import BinaryLoader
+from my_ml_toolkit.data_loader.binary import BinaryLoader, BinaryEntry, MappedBinary
 
 
 # ---------------------------------------------------------------------------
@@ -76,6 +76,216 @@ class TestTabularLoader:
         assert info["memory_usage"] > 0
 
 
+# ---------------------------------------------------------------------------
+# TabularLoader par blocs
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def large_csv(tmp_path):
+    n = 1000
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "count": np.arange(n) % 100,
+        "ratio": rng.random(n),
+        "kind": np.where(np.arange(n) % 3 == 0, "pe", "elf"),
+        "sample_id": [f"id{i}" for i in range(n)],
+        "flag": np.arange(n) % 2 == 0,
+    })
+    df.loc[950, "count"] = 70000      # hors de l'échantillon : élargit le type
+    df.loc[980, "kind"] = "pdf"        # catégorie absente de l'échantillon
+    path = tmp_path / "features.csv"
+    df.to_csv(path, index=False)
+    return str(path), df
+
+
+class TestTabularChunks:
+    def test_infer_compact_dtypes(self, large_csv):
+        path, _ = large_csv
+        dtypes = TabularLoader().infer_csv_dtypes(path, sample_rows=200)
+        assert dtypes["count"] == np.dtype(np.uint8)
+        assert dtypes["ratio"] == np.dtype(np.float32)
+        assert dtypes["kind"] == "category"
+        assert "sample_id" not in dtypes and "flag" not in dtypes
+
+    @pytest.mark.parametrize("engine", ["c", "pyarrow"])
+    def test_chunk_sizes(self, large_csv, engine):
+        if engine == "pyarrow":
+            pytest.importorskip("pyarrow")
+        path, _ = large_csv
+        chunks = list(TabularLoader().iter_csv(path, chunksize=300, sample_rows=200, engine=engine))
+        assert [len(chunk) for chunk in chunks] == [300, 300, 300, 100]
+
+    @pytest.mark.parametrize("engine", ["c", "pyarrow"])
+    def test_values_preserved(self, large_csv, engine):
+        if engine == "pyarrow":
+            pytest.importorskip("pyarrow")
+        path, expected = large_csv
+        df = TabularLoader().load_csv_chunked(path, chunksize=300, sample_rows=200, engine=engine)
+        assert df["count"].tolist() == expected["count"].tolist()
+        assert df["kind"].astype(str).tolist() == expected["kind"].tolist()
+        np.testing.assert_allclose(df["ratio"], expected["ratio"], rtol=1e-6)
+
+    def test_integer_widened_after_overflow(self, large_csv):
+        path, _ = large_csv
+        chunks = list(TabularLoader().iter_csv(path, chunksize=300, sample_rows=200))
+        assert chunks[0]["count"].dtype == np.uint8
+        assert chunks[-1]["count"].dtype == np.uint32
+
+    def test_late_nan_keeps_large_integers_exact(self, tmp_path):
+        # Horodatages ~1.6e9 : float32 (mantisse 24 bits) les arrondirait à 64 près
+        stamps = np.arange(1_600_000_000, 1_600_030_000, dtype=np.int64)
+        column = pd.Series(stamps, dtype="Int64")
+        column[25_000] = pd.NA
+        path = tmp_path / "stamps.csv"
+        pd.DataFrame({"ts": column}).to_csv(path, index=False)
+
+        chunks = list(TabularLoader().iter_csv(path, chunksize=10_000, sample_rows=5_000))
+        assert chunks[0]["ts"].dtype == np.uint32
+        assert chunks[-1]["ts"].dtype == pd.UInt32Dtype()
+
+        df = TabularLoader().load_csv_chunked(path, chunksize=10_000, sample_rows=5_000)
+        assert df["ts"].dtype == pd.UInt32Dtype()
+        assert df["ts"].isna().sum() == 1 and pd.isna(df["ts"][25_000])
+        assert df["ts"].dropna().astype(np.int64).tolist() == np.delete(stamps, 25_000).tolist()
+
+    def test_late_decimals_widen_to_float64(self, tmp_path):
+        values = [str(1_600_000_000 + i) for i in range(300)] + ["1600000300.5"]
+        path = tmp_path / "mixed.csv"
+        path.write_text("v\n" + "\n".join(values) + "\n")
+        df = TabularLoader().load_csv_chunked(path, chunksize=100, sample_rows=50)
+        assert df["v"].dtype == np.float64
+        assert df["v"].iloc[299] == 1_600_000_299 and df["v"].iloc[300] == 1_600_000_300.5
+
+    def test_categories_grow_and_concat_keeps_category(self, large_csv):
+        path, _ = large_csv
+        df = TabularLoader().load_csv_chunked(path, chunksize=300, sample_rows=200)
+        assert isinstance(df["kind"].dtype, pd.CategoricalDtype)
+        assert set(df["kind"].cat.categories) == {"pe", "elf", "pdf"}
+
+    def test_usecols_projection(self, large_csv):
+        path, _ = large_csv
+        chunks = list(TabularLoader().iter_csv(path, chunksize=500, usecols=["count", "kind"]))
+        assert all(list(chunk.columns) == ["count", "kind"] for chunk in chunks)
+
+    def test_memory_smaller_than_read_csv(self, large_csv):
+        path, _ = large_csv
+        loader = TabularLoader()
+        compact = loader.load_csv_chunked(path, usecols=["count", "ratio", "kind"], sample_rows=200)
+        plain = loader.load_csv(path, usecols=["count", "ratio", "kind"])
+        assert compact.memory_usage(deep=True).sum() < plain.memory_usage(deep=True).sum() / 2
+
+    def test_explicit_dtypes_and_none(self, large_csv):
+        path, _ = large_csv
+        loader = TabularLoader()
+        chunk = next(loader.iter_csv(path, dtypes={"ratio": "float32"}))
+        assert chunk["ratio"].dtype == np.float32 and chunk["count"].dtype == np.int64
+        assert next(loader.iter_csv(path, dtypes=None))["ratio"].dtype == np.float64
+
+    def test_unknown_engine(self, large_csv):
+        path, _ = large_csv
+        with pytest.raises(ValueError):
+            next(TabularLoader().iter_csv(path, engine="polars"))
+
+
+# ---------------------------------------------------------------------------
+# TabularLoader : Parquet / Feather
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def feature_table():
+    rng = np.random.default_rng(3)
+    n = 1000
+    return pd.DataFrame({
+        "entropy": rng.random(n).astype(np.float32),
+        "num_sections": rng.integers(0, 10, n).astype(np.uint32),
+        "is_packed": rng.integers(0, 2, n).astype(np.uint8),
+        "sha256": [bytes([i % 256]) * 32 for i in range(n)],
+        "label": np.repeat([0, 1], n // 2),
+    })
+
+
+class TestColumnarFormats:
+    @pytest.mark.parametrize("name", ["data.parquet", "data.feather", "data.arrow"])
+    def test_round_trip_keeps_dtypes(self, tmp_path, feature_table, name):
+        loader = TabularLoader()
+        path = str(tmp_path / name)
+        loader.save(feature_table, path)
+        df = loader.load(path)
+        pd.testing.assert_frame_equal(df, feature_table)
+        assert df["num_sections"].dtype == np.uint32 and df["entropy"].dtype == np.float32
+
+    @pytest.mark.parametrize("name", ["data.parquet", "data.feather"])
+    def test_column_projection(self, tmp_path, feature_table, name):
+        loader = TabularLoader()
+        path = str(tmp_path / name)
+        loader.save(feature_table, path)
+        df = loader.load(path, columns=["entropy", "label"])
+        assert list(df.columns) == ["entropy", "label"]
+        assert loader.columns(path) == list(feature_table.columns)
+
+    @pytest.mark.parametrize("name", ["data.parquet", "data.feather"])
+    def test_filters(self, tmp_path, feature_table, name):
+        loader = TabularLoader()
+        path = str(tmp_path / name)
+        loader.save(feature_table, path)
+        df = loader.load(path, filters=[("label", "==", 1)])
+        assert len(df) == 500 and (df["label"] == 1).all()
+
+    def test_parquet_row_groups(self, tmp_path, feature_table):
+        import pyarrow.parquet as pq
+        loader = TabularLoader()
+        path = str(tmp_path / "data.parquet")
+        loader.save_parquet(feature_table, path, row_group_size=250)
+        assert pq.ParquetFile(path).num_row_groups == 4
+
+        df = loader.load_parquet(path, row_groups=[1], columns=["num_sections"])
+        np.testing.assert_array_equal(df["num_sections"], feature_table["num_sections"][250:500])
+        df = loader.load_parquet(path, row_groups=[1, 2], filters=[("label", "==", 1)])
+        assert len(df) == 250
+
+    def test_arrow_table_is_memory_mapped(self, tmp_path, feature_table):
+        import pyarrow as pa
+        loader = TabularLoader()
+        path = str(tmp_path / "data.feather")
+        loader.save_feather(feature_table, path)
+        allocated = pa.total_allocated_bytes()
+        table = loader.load_arrow_table(path, columns=["entropy", "num_sections"])
+        # Colonnes lues par mmap : pas d'allocation dans le pool Arrow
+        assert pa.total_allocated_bytes() == allocated
+        assert table.num_rows == len(feature_table)
+
+    def test_unsupported_extension(self, tmp_path, feature_table):
+        with pytest.raises(ValueError):
+            TabularLoader().save(feature_table, str(tmp_path / "data.json"))
+        with pytest.raises(ValueError):
+            TabularLoader().load(str(tmp_path / "data.json"))
+
+
+class TestFloat32Loading:
+    def test_invalid_dtype_raises(self):
+        with pytest.raises(ValueError):
+            TabularLoader(dtype="float16")
+
+    def test_csv_floats_downcast(self, tmp_csv):
+        df = TabularLoader(dtype="float32").load_csv(tmp_csv)
+        assert df["x1"].dtype == np.float32 and df["target"].dtype == np.int64
+        assert TabularLoader().load_csv(tmp_csv)["x1"].dtype == np.float64
+
+    @pytest.mark.parametrize("name", ["data.parquet", "data.feather"])
+    def test_columnar_floats_downcast(self, tmp_path, name):
+        df = pd.DataFrame({"ratio": np.linspace(0, 1, 10), "count": np.arange(10)})
+        path = str(tmp_path / name)
+        TabularLoader().save(df, path)
+        loaded = TabularLoader(dtype="float32").load(path)
+        assert loaded["ratio"].dtype == np.float32 and loaded["count"].dtype == np.int64
+        np.testing.assert_allclose(loaded["ratio"], df["ratio"], rtol=1e-7)
+
+    def test_chunks_downcast_without_inference(self, large_csv):
+        path, _ = large_csv
+        chunk = next(TabularLoader(dtype="float32").iter_csv(path, dtypes=None))
+        assert chunk["ratio"].dtype == np.float32
+
+
 # ---------------------------------------------------------------------------
 # BinaryLoader
 # ---------------------------------------------------------------------------
@@ -135,6 +345,46 @@ class TestBinaryLoader:
         assert len(result) == 1
         assert result[0][0] == "ben1.exe"
 
+    def test_iter_directory_is_lazy(self, tmp_binary_dir):
+        loader = BinaryLoader()
+        iterator = loader.iter_directory(tmp_binary_dir)
+        assert not isinstance(iterator, list)
+        assert len(list(iterator)) == 4
+
+    def test_iter_directory_matches_load_directory(self, tmp_binary_dir):
+        loader = BinaryLoader()
+        assert sorted(loader.iter_directory(tmp_binary_dir)) == sorted(loader.load_directory(tmp_binary_dir))
+
+    def test_iter_directory_deferred_entries(self, tmp_binary_dir, binary_benign):
+        loader = BinaryLoader()
+        entries = list(loader.iter_directory(tmp_binary_dir, extensions=[".exe"], read=False))
+        assert len(entries) == 1
+        entry = entries[0]
+        assert isinstance(entry, BinaryEntry)
+        assert entry.filename == "ben1.exe"
+        assert entry.size == len(binary_benign)
+        assert loader.load_file(entry.path) == binary_benign
+
+    def test_iter_directory_extension_case_insensitive(self, tmp_path):
+        (tmp_path / "SAMPLE.EXE").write_bytes(b"MZ")
+        (tmp_path / "archive.tar.gz").write_bytes(b"x")
+        loader = BinaryLoader()
+        assert [n for n, _ in loader.iter_directory(str(tmp_path), extensions=[".exe"])] == ["SAMPLE.EXE"]
+        assert [n for n, _ in loader.iter_directory(str(tmp_path), extensions=[".tar.gz"])] == ["archive.tar.gz"]
+
+    def test_iter_directory_errors_go_to_callback(self, tmp_binary_dir, monkeypatch):
+        loader = BinaryLoader()
+
+        def failing_load(filepath):
+            raise OSError("lecture impossible")
+
+        monkeypatch.setattr(loader, "load_file", failing_load)
+        errors = []
+        result = list(loader.iter_directory(tmp_binary_dir, on_error=lambda p, e: errors.append((p, e))))
+        assert result == []
+        assert len(errors) == 4
+        assert all(isinstance(e, OSError) for _, e in errors)
+
     def test_bytes_to_array_type(self, binary_benign):
         loader = BinaryLoader()
         arr = loader.bytes_to_array(binary_benign)
@@ -150,3 +400,56 @@ class TestBinaryLoader:
         arr = loader.bytes_to_array(binary_benign)
         assert arr.min() >= 0
         assert arr.max() <= 255
+
+
+# ---------------------------------------------------------------------------
+# BinaryLoader en mode mmap
+# ---------------------------------------------------------------------------
+
+class TestMappedBinary:
+    def test_load_file_mmap_returns_handle(self, tmp_binary_file):
+        with BinaryLoader().load_file(tmp_binary_file, mmap=True) as mapped:
+            assert isinstance(mapped, MappedBinary)
+
+    def test_buffer_matches_file(self, tmp_binary_file, binary_benign):
+        with BinaryLoader().load_file(tmp_binary_file, mmap=True) as mapped:
+            assert len(mapped) == len(binary_benign)
+            assert mapped.buffer.tobytes() == binary_benign
+
+    def test_max_bytes_limits_view(self, tmp_binary_file, binary_benign):
+        with BinaryLoader(max_bytes=50).load_file(tmp_binary_file, mmap=True) as mapped:
+            assert len(mapped) == 50
+            assert mapped.buffer.tobytes() == binary_benign[:50]
+
+    def test_usable_by_numpy_and_hashlib(self, tmp_binary_file, binary_benign):
+        import hashlib
+        with BinaryLoader().load_file(tmp_binary_file, mmap=True) as mapped:
+            arr = mapped.to_array()
+            assert arr.dtype == np.uint8
+            assert int(arr.sum()) == sum(binary_benign)
+            del arr
+            assert hashlib.sha256(mapped.buffer).hexdigest() == hashlib.sha256(binary_benign).hexdigest()
+
+    def test_close_with_live_array(self, tmp_binary_file, binary_benign):
+        mapped = BinaryLoader().load_file(tmp_binary_file, mmap=True)
+        with mapped:
+            arr = mapped.to_array()
+        assert mapped._file.closed
+        assert len(mapped) == 0
+        # L'array reste valide : la projection est libérée à sa destruction
+        assert arr.tobytes() == binary_benign
+        del arr
+        mapped.close()
+
+    def test_features_identical_to_bytes(self, tmp_binary_file, binary_benign):
+        from my_ml_toolkit.feature_extraction.binary_features import BinaryFeatureExtractor
+        extractor = BinaryFeatureExtractor()
+        with BinaryLoader().load_file(tmp_binary_file, mmap=True) as mapped:
+            features = extractor.extract_all_features(mapped.buffer)
+        assert features == extractor.extract_all_features(binary_benign)
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.bin"
+        path.write_bytes(b"")
+        with BinaryLoader().load_file(str(path), mmap=True) as mapped:
+            assert len(mapped) == 0
@@ -0,0 +1,108 @@
+"""
+Tests unitaires pour EntropyProfiler.
+"""
+
+import numpy as np
+import pytest
+
+from my_ml_toolkit.feature_extraction.entropy_profile import EntropyProfiler
+from my_ml_toolkit.feature_extraction.binary_features import BinaryFeatureExtractor
+
+
+def _reference_profile(byte_array, window_size, step):
+    """Profil calculé fenêtre par fenêtre avec _calculate_entropy."""
+    extractor = BinaryFeatureExtractor()
+    return np.array([
+        extractor._calculate_entropy(byte_array[i:i + window_size])
+        for i in range(0, len(byte_array) - window_size + 1, step)
+    ])
+
+
+@pytest.fixture
+def mixed_array():
+    """Zone basse entropie suivie d'une zone aléatoire."""
+    rng = np.random.default_rng(7)
+    low = np.frombuffer(b"A" * 2048, dtype=np.uint8)
+    high = rng.integers(0, 256, size=4096, dtype=np.uint8)
+    return np.concatenate([low, high, low])
+
+
+# ---------------------------------------------------------------------------
+# profile
+# ---------------------------------------------------------------------------
+
+class TestProfile:
+    def test_matches_reference_disjoint(self, mixed_array):
+        profiler = EntropyProfiler(window_size=256)
+        expected = _reference_profile(mixed_array, 256, 256)
+        np.testing.assert_allclose(profiler.profile(mixed_array), expected, atol=1e-12)
+
+    def test_matches_reference_overlapping(self, mixed_array):
+        profiler = EntropyProfiler(window_size=256, step=64)
+        expected = _reference_profile(mixed_array, 256, 64)
+        np.testing.assert_allclose(profiler.profile(mixed_array), expected, atol=1e-12)
+
+    def test_blocks_do_not_change_result(self, mixed_array):
+        small = EntropyProfiler(window_size=128, step=32, block_windows=3)
+        large = EntropyProfiler(window_size=128, step=32, block_windows=4096)
+        np.testing.assert_array_equal(small.profile(mixed_array), large.profile(mixed_array))
+
+    def test_num_windows(self):
+        profiler = EntropyProfiler(window_size=256, step=128)
+        assert profiler.num_windows(100) == 0
+        assert profiler.num_windows(256) == 1
+        assert profiler.num_windows(512) == 3
+        assert len(profiler.profile(np.zeros(512, dtype=np.uint8))) == 3
+
+    def test_short_input_empty_profile(self):
+        profiler = EntropyProfiler(window_size=256)
+        assert len(profiler.profile(np.zeros(10, dtype=np.uint8))) == 0
+
+    def test_invalid_step_raises(self):
+        with pytest.raises(ValueError):
+            EntropyProfiler(step=0)
+
+
+# ---------------------------------------------------------------------------
+# summarize
+# ---------------------------------------------------------------------------
+
+class TestSummarize:
+    def test_derived_features(self, mixed_array):
+        profiler = EntropyProfiler(window_size=256, threshold=7.0)
+        profile = profiler.profile(mixed_array)
+        features = profiler.summarize(profile)
+        assert features["high_entropy_sections"] == int(np.sum(profile > 7.0))
+        assert features["entropy_profile_max"] == pytest.approx(profile.max())
+        assert features["entropy_profile_mean"] == pytest.approx(profile.mean())
+        assert features["entropy_profile_var"] == pytest.approx(profile.var())
+
+    def test_longest_high_run(self, mixed_array):
+        profiler = EntropyProfiler(window_size=256, threshold=7.0)
+        features = profiler.extract_features(mixed_array)
+        # 4096 bytes aléatoires contigus = 16 fenêtres haute entropie
+        assert features["entropy_longest_high_run"] == 16
+
+    def test_empty_profile_defaults(self):
+        features = EntropyProfiler().summarize(np.empty(0))
+        assert features["high_entropy_sections"] == 0
+        assert features["entropy_longest_high_run"] == 0
+        assert features["entropy_profile_max"] == 0.0
+
+
+# ---------------------------------------------------------------------------
+# Intégration avec BinaryFeatureExtractor
+# ---------------------------------------------------------------------------
+
+class TestExtractorIntegration:
+    def test_structural_features_include_profile(self, binary_malware):
+        features = BinaryFeatureExtractor().extract_structural_features(binary_malware)
+        for key in ["high_entropy_sections", "entropy_profile_max",
+                    "entropy_profile_mean", "entropy_profile_var",
+                    "entropy_longest_high_run"]:
+            assert key in features
+
+    def test_entropy_profile_length(self, binary_malware):
+        extractor = BinaryFeatureExtractor(entropy_window=128, entropy_step=64)
+        profile = extractor.entropy_profile(binary_malware)
+        assert len(profile) == (len(binary_malware) - 128) // 64 + 1
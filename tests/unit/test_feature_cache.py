@@ -0,0 +1,229 @@
+"""
+Tests unitaires pour FeatureCache et son intégration dans l'extracteur.
+"""
+
+import hashlib
+import pickle
+
+import pytest
+
+from my_ml_toolkit.feature_extraction.binary_features import BinaryFeatureExtractor
+from my_ml_toolkit.feature_extraction.feature_cache import FeatureCache
+from my_ml_toolkit.pipeline import MLPipeline
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = FeatureCache(str(tmp_path / "features.sqlite"), max_entries=3)
+    yield cache
+    cache.close()
+
+
+# ---------------------------------------------------------------------------
+# FeatureCache
+# ---------------------------------------------------------------------------
+
+class TestFeatureCache:
+    def test_miss_then_hit(self, cache):
+        assert cache.get("abc", "cfg") is None
+        cache.put("abc", "cfg", {"entropy": 7.5, "file_size": 10})
+        assert cache.get("abc", "cfg") == {"entropy": 7.5, "file_size": 10}
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_config_is_part_of_key(self, cache):
+        cache.put("abc", "cfg1", {"x": 1})
+        assert cache.get("abc", "cfg2") is None
+
+    def test_lru_eviction(self, cache):
+        for key in ["a", "b", "c"]:
+            cache.put(key, "cfg", {"k": key})
+        cache.get("a", "cfg")           # "a" devient le plus récent
+        cache.put("d", "cfg", {"k": "d"})
+        assert len(cache) == 3
+        assert cache.evictions == 1
+        assert cache.get("b", "cfg") is None
+        assert cache.get("a", "cfg") == {"k": "a"}
+
+    def test_bind_keeps_other_configs(self, cache):
+        cache.bind("v1")
+        cache.put("abc", "v1", {"x": 1})
+        cache.bind("v2")
+        cache.put("abc", "v2", {"x": 2})
+        cache.bind("v1")
+        assert len(cache) == 2
+        assert cache.get("abc", "v1") == {"x": 1}
+
+    def test_invalidate_other_configs(self, cache):
+        cache.put("abc", "v1", {"x": 1})
+        cache.put("def", "v1", {"x": 2})
+        cache.put("abc", "v2", {"x": 3})
+        assert cache.invalidate("v2") == 2
+        assert len(cache) == 1
+        assert cache.get("abc", "v2") == {"x": 3}
+
+    def test_entry_count_maintained(self, cache):
+        cache.put("a", "cfg", {"x": 1})
+        cache.put("a", "cfg", {"x": 2})      # remplacement : pas de nouvelle entrée
+        cache.put("b", "cfg", {"x": 3})
+        assert len(cache) == 2
+        assert cache.get("a", "cfg") == {"x": 2}
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_count_initialized_from_existing_table(self, tmp_path):
+        import sqlite3
+        path = str(tmp_path / "old.sqlite")
+        first = FeatureCache(path)
+        first.put("a", "cfg", {"x": 1})
+        first.put("b", "cfg", {"x": 2})
+        first.close()
+        # Base d'une version sans compteur
+        conn = sqlite3.connect(path)
+        conn.execute("DROP TABLE counters")
+        conn.commit()
+        conn.close()
+        second = FeatureCache(path)
+        assert len(second) == 2
+        second.close()
+
+    def test_access_times_written_in_batches(self, tmp_path):
+        import sqlite3
+        path = str(tmp_path / "lru.sqlite")
+        cache = FeatureCache(path, access_batch=2)
+        cache.put("a", "cfg", {"x": 1})
+        cache.put("b", "cfg", {"x": 2})
+        cache._conn.execute("UPDATE features SET last_access = 0")
+        cache._conn.commit()
+
+        def access_times():
+            return dict(sqlite3.connect(path).execute("SELECT sha256, last_access FROM features"))
+
+        cache.get("a", "cfg")
+        assert access_times() == {"a": 0, "b": 0}
+        cache.get("b", "cfg")
+        assert all(t > 0 for t in access_times().values())
+        cache.close()
+
+    def test_wal_and_busy_timeout(self, tmp_path):
+        cache = FeatureCache(str(tmp_path / "wal.sqlite"), timeout=2.5)
+        len(cache)
+        assert cache._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert cache._conn.execute("PRAGMA busy_timeout").fetchone()[0] == 2500
+        cache.close()
+
+    def test_persistent_across_instances(self, tmp_path):
+        path = str(tmp_path / "persist.sqlite")
+        first = FeatureCache(path)
+        first.put("abc", "cfg", {"x": 1.25})
+        first.close()
+        second = FeatureCache(path)
+        assert second.get("abc", "cfg") == {"x": 1.25}
+        second.close()
+
+    def test_picklable(self, cache):
+        cache.put("abc", "cfg", {"x": 1})
+        clone = pickle.loads(pickle.dumps(cache))
+        assert clone.get("abc", "cfg") == {"x": 1}
+        clone.close()
+
+    def test_stats(self, cache):
+        cache.get("missing", "cfg")
+        stats = cache.stats()
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.0
+        assert stats["entries"] == 0
+
+
+# ---------------------------------------------------------------------------
+# Intégration BinaryFeatureExtractor / MLPipeline
+# ---------------------------------------------------------------------------
+
+class TestCachedExtraction:
+    def test_cached_result_identical(self, cache, binary_malware):
+        extractor = BinaryFeatureExtractor(cache=cache)
+        first = extractor.extract_all_features(binary_malware)
+        second = extractor.extract_all_features(binary_malware)
+        assert first == second
+        assert first == BinaryFeatureExtractor().extract_all_features(binary_malware)
+        assert cache.hits == 1
+
+    def test_sha256_computed_once_matches(self, cache, binary_benign):
+        features = BinaryFeatureExtractor(cache=cache).extract_all_features(binary_benign)
+        assert features["sha256"] == hashlib.sha256(binary_benign).hexdigest()
+
+    def test_configs_share_cache(self, cache, binary_benign):
+        default = BinaryFeatureExtractor(cache=cache)
+        default.extract_all_features(binary_benign)
+        other = BinaryFeatureExtractor(ngram_buckets=16, cache=cache)
+        other.extract_all_features(binary_benign)
+        assert len(cache) == 2
+        default.extract_all_features(binary_benign)
+        assert cache.hits == 1
+
+    def test_config_key_depends_on_parameters(self):
+        assert BinaryFeatureExtractor().config_key == BinaryFeatureExtractor().config_key
+        assert BinaryFeatureExtractor().config_key != BinaryFeatureExtractor(entropy_step=64).config_key
+
+    def test_pipeline_uses_cache(self, cache, binary_malware, binary_benign):
+        pipeline = MLPipeline(data_type="binary", feature_cache=cache)
+        data = [("mal.bin", binary_malware), ("ben.exe", binary_benign)]
+        pipeline.extract_features(data)
+        pipeline.extract_features(data)
+        assert cache.hits == 2
+
+    def test_batch_workers_use_cache(self, cache, tmp_binary_dir):
+        import os
+        paths = sorted(os.path.join(tmp_binary_dir, n) for n in os.listdir(tmp_binary_dir))
+        extractor = BinaryFeatureExtractor(cache=cache)
+        first = extractor.extract_batch(paths, n_jobs=2)
+        assert len(cache) == 3   # max_entries=3, 4 fichiers
+        second = extractor.extract_batch(paths, n_jobs=1)
+        assert first.equals(second)
+
+    @pytest.mark.parametrize("ordered", [True, False])
+    def test_worker_counters_merged(self, tmp_path, tmp_binary_dir, ordered):
+        import os
+        paths = sorted(os.path.join(tmp_binary_dir, n) for n in os.listdir(tmp_binary_dir))
+        cache = FeatureCache(str(tmp_path / "workers.sqlite"))
+        extractor = BinaryFeatureExtractor(cache=cache)
+        extractor.extract_batch(paths, n_jobs=2, ordered=ordered)
+        assert (cache.hits, cache.misses) == (0, len(paths))
+        extractor.extract_batch(paths, n_jobs=2, ordered=ordered)
+        assert (cache.hits, cache.misses) == (len(paths), len(paths))
+        cache.close()
+
+    def test_prefetch_worker_counters_merged(self, tmp_path, tmp_binary_dir):
+        import os
+        paths = sorted(os.path.join(tmp_binary_dir, n) for n in os.listdir(tmp_binary_dir))
+        cache = FeatureCache(str(tmp_path / "prefetch.sqlite"))
+        extractor = BinaryFeatureExtractor(cache=cache)
+        list(extractor.iter_prefetch_batch(paths, n_jobs=2))
+        list(extractor.iter_prefetch_batch(paths, n_jobs=2))
+        assert (cache.hits, cache.misses) == (len(paths), len(paths))
+        cache.close()
+
+    def test_stream_populates_cache(self, cache, binary_malware):
+        extractor = BinaryFeatureExtractor(cache=cache)
+        chunks = (binary_malware[i:i + 100] for i in range(0, len(binary_malware), 100))
+        streamed = extractor.extract_stream(chunks)
+        assert len(cache) == 1 and (cache.hits, cache.misses) == (0, 0)
+        assert extractor.extract_all_features(binary_malware) == streamed
+        assert cache.hits == 1
+
+    @pytest.mark.parametrize("n_jobs", [1, 2])
+    def test_archive_worker_counters_merged(self, tmp_path, n_jobs):
+        import zipfile
+        archives = []
+        for a in range(2):
+            path = tmp_path / f"samples_{a}.zip"
+            with zipfile.ZipFile(path, "w") as archive:
+                for m in range(2):
+                    archive.writestr(f"member_{m}.bin", bytes([a, m]) * 500)
+            archives.append(str(path))
+        cache = FeatureCache(str(tmp_path / "archives.sqlite"), max_entries=2)
+        extractor = BinaryFeatureExtractor(cache=cache)
+        df = extractor.extract_archive_batch(archives, n_jobs=n_jobs)
+        assert len(df) == 4
+        assert len(cache) == 2 and cache.evictions == 2
+        cache.close()
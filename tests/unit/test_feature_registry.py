@@ -0,0 +1,161 @@
+"""
+Tests unitaires pour le registre de dtypes compacts (FeatureRegistry).
+"""
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from my_ml_toolkit.feature_extraction.binary_features import BinaryFeatureExtractor
+from my_ml_toolkit.feature_extraction.columnar import ColumnarBatch, FeatureSchema
+from my_ml_toolkit.feature_extraction.feature_registry import DEFAULT_REGISTRY, FeatureRegistry
+
+
+@pytest.fixture
+def hash_schema():
+    return DEFAULT_REGISTRY.schema(["file_size", "md5", "sha256", "byte_entropy"])
+
+
+def _digests(data: bytes) -> dict:
+    return {"md5": hashlib.md5(data).hexdigest(), "sha256": hashlib.sha256(data).hexdigest()}
+
+
+# ---------------------------------------------------------------------------
+# FeatureRegistry
+# ---------------------------------------------------------------------------
+
+class TestFeatureRegistry:
+    def test_exact_and_pattern_dtypes(self):
+        assert DEFAULT_REGISTRY.dtype_for("file_size") == np.dtype(np.uint64)
+        assert DEFAULT_REGISTRY.dtype_for("signature_is_pe") == np.dtype(np.uint8)
+        assert DEFAULT_REGISTRY.dtype_for("pe_imports_ws2_32.dll") == np.dtype(np.uint8)
+        assert DEFAULT_REGISTRY.dtype_for("repeat8_max_count") == np.dtype(np.uint64)
+        assert DEFAULT_REGISTRY.dtype_for("ngram2_distinct") == np.dtype(np.uint32)
+        assert DEFAULT_REGISTRY.dtype_for("md5") == np.dtype("S16")
+
+    def test_undeclared_values(self):
+        registry = FeatureRegistry()
+        assert registry.dtype_for("ratio", 0.5) == np.dtype(np.float32)
+        assert registry.dtype_for("ratio") == np.dtype(np.float32)
+        assert registry.dtype_for("count", 3) == np.dtype(np.int64)
+        assert registry.dtype_for("label", "x") == np.dtype(object)
+
+    def test_exact_name_wins_over_pattern(self):
+        registry = FeatureRegistry()
+        registry.register(r"n_\w+", np.uint32, pattern=True)
+        registry.register("n_ratio", np.float32)
+        assert registry.dtype_for("n_ratio") == np.dtype(np.float32)
+        assert registry.dtype_for("n_items") == np.dtype(np.uint32)
+
+    def test_schema_records_identifiers(self, hash_schema):
+        assert hash_schema.identifiers == {"md5": 16, "sha256": 32}
+
+    def test_identifier_dtype_is_checked(self):
+        with pytest.raises(ValueError):
+            FeatureSchema([("md5", "S32")], identifiers={"md5": 16})
+
+    def test_with_columns_retyping_drops_identifier(self, hash_schema):
+        updated = hash_schema.with_columns([("md5", object), ("filename", object)])
+        assert updated.identifiers == {"sha256": 32}
+
+
+# ---------------------------------------------------------------------------
+# Empreintes binaires
+# ---------------------------------------------------------------------------
+
+class TestIdentifierColumns:
+    def test_stored_as_raw_bytes(self, hash_schema):
+        batch = ColumnarBatch(hash_schema)
+        batch.append({"file_size": 3, **_digests(b"abc"), "byte_entropy": 1.5})
+        assert batch.column("md5")[0] == hashlib.md5(b"abc").digest().rstrip(b"\x00")
+        assert batch.column("sha256").dtype == np.dtype("S32")
+
+    def test_hex_round_trip(self, hash_schema):
+        samples = [bytes([i]) * i for i in range(50)]
+        batch = ColumnarBatch(hash_schema, capacity=4, flush_rows=7)
+        for data in samples:
+            batch.append({"file_size": len(data), **_digests(data), "byte_entropy": 0.0})
+
+        df = batch.to_frame()
+        assert df["md5"].tolist() == [hashlib.md5(d).hexdigest() for d in samples]
+        assert df["sha256"].tolist() == [hashlib.sha256(d).hexdigest() for d in samples]
+
+    def test_trailing_null_bytes_preserved(self, hash_schema):
+        digest = "ab" + "00" * 15
+        batch = ColumnarBatch(hash_schema)
+        batch.append({"md5": digest, "sha256": "00" * 32})
+        df = batch.to_frame(identifiers="binary")
+        assert df.loc[0, "md5"] == bytes.fromhex(digest)
+        assert batch.to_frame().loc[0, "sha256"] == "00" * 32
+
+    def test_uppercase_hex_accepted(self, hash_schema):
+        digest = hashlib.md5(b"x").hexdigest()
+        batch = ColumnarBatch(hash_schema)
+        batch.append({"md5": digest.upper()})
+        assert batch.to_frame().loc[0, "md5"] == digest
+
+    def test_missing_identifier_is_zero(self, hash_schema):
+        batch = ColumnarBatch(hash_schema)
+        batch.append({"file_size": 1})
+        assert batch.to_frame().loc[0, "md5"] == "0" * 32
+
+    def test_drop_removes_identifiers(self, hash_schema):
+        batch = ColumnarBatch(hash_schema)
+        batch.append({"file_size": 3, **_digests(b"abc"), "byte_entropy": 1.5})
+        assert list(batch.to_frame(identifiers="drop").columns) == ["file_size", "byte_entropy"]
+
+    def test_unknown_mode_rejected(self, hash_schema):
+        with pytest.raises(ValueError):
+            ColumnarBatch(hash_schema).to_frame(identifiers="base64")
+
+    def test_arrow_binary_export(self, hash_schema):
+        pa = pytest.importorskip("pyarrow")
+        batch = ColumnarBatch(hash_schema)
+        batch.append({"file_size": 3, **_digests(b"abc"), "byte_entropy": 1.5})
+        table = batch.to_arrow(identifiers="binary")
+        assert table.schema.field("sha256").type == pa.binary(32)
+        assert table.column("md5").to_pylist() == [hashlib.md5(b"abc").digest()]
+
+
+# ---------------------------------------------------------------------------
+# Extracteur binaire
+# ---------------------------------------------------------------------------
+
+class TestCompactBinaryFeatures:
+    def test_compact_dtypes(self, binary_malware):
+        schema = dict(BinaryFeatureExtractor(include_pe_sections=True).feature_schema())
+        assert schema["signature_is_pe"] == np.dtype(np.uint8)
+        assert schema["unique_bytes_count"] == np.dtype(np.uint32)
+        # Effectifs bornés par la taille du fichier : pas de débordement au-delà de 4 Go
+        for name in ("null_bytes_count", "high_entropy_sections", "repeated_sequences"):
+            assert schema[name] == np.dtype(np.uint64)
+        features = BinaryFeatureExtractor(include_pe_sections=True).extract_all_features(binary_malware)
+        batch = ColumnarBatch(BinaryFeatureExtractor(include_pe_sections=True).feature_schema())
+        batch.append({**features, "null_bytes_count": 5 << 30})
+        assert int(batch.to_frame()["null_bytes_count"].iloc[0]) == 5 << 30
+        assert schema["entropy"] == np.dtype(np.float32)
+        assert schema["is_packed"] == np.dtype(np.uint8)
+        assert all(dtype.itemsize <= 8 or name in ("md5", "sha256") for name, dtype in schema.items())
+
+    def test_batch_without_identifiers(self, tmp_binary_dir):
+        import os
+        paths = sorted(os.path.join(tmp_binary_dir, n) for n in os.listdir(tmp_binary_dir))
+        df = BinaryFeatureExtractor().extract_batch(paths, identifiers="drop")
+        assert "md5" not in df.columns and "sha256" not in df.columns
+        assert df["file_size"].dtype == np.uint64
+
+    def test_values_match_float64(self, binary_malware, binary_benign):
+        extractor = BinaryFeatureExtractor()
+        batch = ColumnarBatch(extractor.feature_schema())
+        samples = [binary_malware, binary_benign]
+        batch.extend(extractor.extract_all_features(d) for d in samples)
+        expected = pd.DataFrame([extractor.extract_all_features(d) for d in samples])
+        pd.testing.assert_frame_equal(batch.to_frame(), expected, check_dtype=False, rtol=1e-6)
+
+    def test_memory_reduction(self, binary_malware):
+        extractor = BinaryFeatureExtractor(include_pe_sections=True)
+        sample = extractor.extract_all_features(binary_malware)
+        wide = FeatureSchema.from_sample(sample).with_columns([("md5", "S32"), ("sha256", "S64")])
+        assert extractor.feature_schema().nbytes_per_row < wide.nbytes_per_row / 2
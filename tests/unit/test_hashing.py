@@ -0,0 +1,101 @@
+"""
+Tests unitaires pour le module d'empreintes (hashing)
+"""
+
+import hashlib
+
+import numpy as np
+
+from my_ml_toolkit.feature_extraction import hashing
+from my_ml_toolkit.feature_extraction.binary_features import BinaryFeatureExtractor
+from my_ml_toolkit.feature_extraction.hashing import ContentHasher, hash_bytes, hash_file
+
+
+def _reference(data: bytes) -> dict:
+    return {
+        'md5': hashlib.md5(data).hexdigest(),
+        'sha256': hashlib.sha256(data).hexdigest(),
+    }
+
+
+# ---------------------------------------------------------------------------
+# ContentHasher / hash_bytes / hash_file
+# ---------------------------------------------------------------------------
+
+class TestContentHasher:
+    def test_hash_bytes_matches_hashlib(self, binary_malware):
+        assert hash_bytes(binary_malware) == _reference(binary_malware)
+
+    def test_empty(self):
+        assert hash_bytes(b'') == _reference(b'')
+
+    def test_small_chunks_identical(self):
+        data = np.random.default_rng(0).integers(0, 256, 10_000, dtype=np.uint8).tobytes()
+        assert hash_bytes(data, chunk_size=7) == _reference(data)
+
+    def test_parallel_path_identical(self):
+        data = np.random.default_rng(1).integers(0, 256, 3 << 20, dtype=np.uint8).tobytes()
+        hasher = ContentHasher(parallel_threshold=1 << 10)
+        hasher.update(data)
+        assert hasher.hexdigests() == _reference(data)
+
+    def test_parallel_path_reuses_one_thread(self, monkeypatch):
+        created = []
+        original = hashing.ThreadPoolExecutor
+        monkeypatch.setattr(hashing, 'ThreadPoolExecutor',
+                            lambda *args, **kwargs: created.append(1) or original(*args, **kwargs))
+        data = np.random.default_rng(2).integers(0, 256, 64 << 10, dtype=np.uint8).tobytes()
+        hasher = ContentHasher(parallel_threshold=1 << 10)
+        for start in range(0, len(data), 4 << 10):
+            hasher.update(data[start:start + (4 << 10)])
+        assert len(created) == 1
+        assert hasher.hexdigests() == _reference(data)
+        assert hasher._executor is None
+
+    def test_accepts_numpy_buffer(self):
+        array = np.arange(1000, dtype=np.uint8)
+        assert hash_bytes(array) == _reference(array.tobytes())
+
+    def test_hash_file(self, tmp_path):
+        data = bytes(range(256)) * 5000
+        path = tmp_path / "sample.bin"
+        path.write_bytes(data)
+        assert hash_file(str(path), chunk_size=4096) == _reference(data)
+
+    def test_fast_hash_optional(self):
+        assert 'fast_hash' not in hash_bytes(b'abc')
+        digests = hash_bytes(b'abc', fast=True)
+        assert len(digests['fast_hash']) == 16
+        assert digests['fast_hash'] != hash_bytes(b'abd', fast=True)['fast_hash']
+
+    def test_fast_hash_fallback_is_blake2b(self, monkeypatch):
+        monkeypatch.setattr(hashing, 'xxhash', None)
+        digests = hash_bytes(b'abc', fast=True)
+        assert digests['fast_hash'] == hashlib.blake2b(b'abc', digest_size=8).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Intégration BinaryFeatureExtractor
+# ---------------------------------------------------------------------------
+
+class TestExtractorHashing:
+    def test_basic_features_unchanged(self, binary_benign):
+        features = BinaryFeatureExtractor().extract_basic_features(binary_benign)
+        assert features == {'file_size': len(binary_benign), **_reference(binary_benign)}
+
+    def test_precomputed_digests_reused(self, binary_benign):
+        digests = {'md5': 'm', 'sha256': 's'}
+        features = BinaryFeatureExtractor().extract_basic_features(binary_benign, digests=digests)
+        assert features['md5'] == 'm'
+        assert features['sha256'] == 's'
+
+    def test_fast_hash_flag(self, binary_malware):
+        extractor = BinaryFeatureExtractor(fast_hash=True)
+        features = extractor.extract_all_features(binary_malware)
+        assert features['fast_hash'] == hash_bytes(binary_malware, fast=True)['fast_hash']
+        assert extractor.config_key != BinaryFeatureExtractor().config_key
+
+    def test_fast_hash_streaming_identical(self, binary_malware):
+        extractor = BinaryFeatureExtractor(fast_hash=True)
+        chunks = [binary_malware[i:i + 100] for i in range(0, len(binary_malware), 100)]
+        assert extractor.extract_stream(chunks) == extractor.extract_all_features(binary_malware)
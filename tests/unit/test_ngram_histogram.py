@@ -0,0 +1,114 @@
+"""
+Tests unitaires pour ByteNgramCounter.
+"""
+
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from my_ml_toolkit.feature_extraction.ngram_histogram import ByteNgramCounter
+from my_ml_toolkit.feature_extraction.binary_features import BinaryFeatureExtractor
+
+
+def _as_array(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+# ---------------------------------------------------------------------------
+# histogram
+# ---------------------------------------------------------------------------
+
+class TestHistogram:
+    def test_bigram_counts_match_counter(self, binary_benign):
+        counter = ByteNgramCounter(n=2)
+        hist = counter.histogram(_as_array(binary_benign))
+        expected = Counter(binary_benign[i:i + 2] for i in range(len(binary_benign) - 1))
+        for ngram, count in expected.items():
+            assert hist[ngram[0] * 256 + ngram[1]] == count
+        assert hist.sum() == len(binary_benign) - 1
+
+    def test_unigram_is_byte_histogram(self, binary_malware):
+        hist = ByteNgramCounter(n=1).histogram(_as_array(binary_malware))
+        np.testing.assert_array_equal(hist, np.bincount(_as_array(binary_malware), minlength=256))
+
+    def test_trigram_hashed_total(self, binary_malware):
+        counter = ByteNgramCounter(n=3, hash_bits=12)
+        hist = counter.histogram(_as_array(binary_malware))
+        assert len(hist) == 4096
+        assert hist.sum() == len(binary_malware) - 2
+
+    def test_blocks_do_not_change_result(self, binary_malware):
+        small = ByteNgramCounter(n=3, block_size=7)
+        large = ByteNgramCounter(n=3)
+        data = _as_array(binary_malware)
+        np.testing.assert_array_equal(small.histogram(data), large.histogram(data))
+
+    def test_input_shorter_than_n(self):
+        hist = ByteNgramCounter(n=4).histogram(_as_array(b"abc"))
+        assert hist.sum() == 0
+
+    def test_invalid_n_raises(self):
+        with pytest.raises(ValueError):
+            ByteNgramCounter(n=9)
+
+
+# ---------------------------------------------------------------------------
+# extract_features
+# ---------------------------------------------------------------------------
+
+class TestNgramFeatures:
+    def test_fixed_column_layout(self, binary_benign, binary_malware):
+        counter = ByteNgramCounter(n=2, num_buckets=32)
+        f1 = counter.extract_features(_as_array(binary_benign))
+        f2 = counter.extract_features(_as_array(binary_malware))
+        assert list(f1) == list(f2) == counter.feature_names
+        assert len(f1) == 32 + 3
+
+    def test_bucket_frequencies_sum_to_one(self, binary_malware):
+        features = ByteNgramCounter(n=2).extract_features(_as_array(binary_malware))
+        buckets = [v for k, v in features.items() if "_bucket_" in k]
+        assert sum(buckets) == pytest.approx(1.0)
+
+    def test_constant_data_single_ngram(self):
+        features = ByteNgramCounter(n=2).extract_features(_as_array(b"\x00" * 100))
+        assert features["ngram2_distinct"] == 1
+        assert features["ngram2_entropy"] == pytest.approx(0.0)
+        assert features["ngram2_top_freq"] == pytest.approx(1.0)
+
+    def test_empty_data_zero_features(self):
+        features = ByteNgramCounter(n=2).extract_features(_as_array(b""))
+        assert all(v == 0 for v in features.values())
+
+
+# ---------------------------------------------------------------------------
+# Intégration avec BinaryFeatureExtractor
+# ---------------------------------------------------------------------------
+
+class TestExtractorIntegration:
+    def test_all_features_include_ngrams(self, binary_benign):
+        features = BinaryFeatureExtractor().extract_all_features(binary_benign)
+        assert "ngram2_bucket_00" in features
+        assert "ngram2_entropy" in features
+
+    def test_ngrams_can_be_disabled(self, binary_benign):
+        extractor = BinaryFeatureExtractor(include_ngrams=False)
+        features = extractor.extract_all_features(binary_benign)
+        assert not any(k.startswith("ngram") for k in features)
+
+    def test_trigram_extractor_columns(self, binary_benign):
+        extractor = BinaryFeatureExtractor(ngram_size=3, ngram_buckets=16)
+        features = extractor.extract_ngram_features(binary_benign)
+        assert len(features) == 16 + 3
+        assert "ngram3_bucket_15" in features
+
+    @pytest.mark.parametrize("call", ["keyword", "positional"])
+    def test_top_n_deprecated_and_ignored(self, binary_benign, call):
+        extractor = BinaryFeatureExtractor()
+        expected = extractor.extract_ngram_features(binary_benign)
+        with pytest.warns(DeprecationWarning, match="top_n"):
+            if call == "keyword":
+                features = extractor.extract_ngram_features(binary_benign, top_n=10)
+            else:
+                features = extractor.extract_ngram_features(binary_benign, 10)
+        assert features == expected
@@ -7,7 +7,7 @@ import pandas as pd
 import pytest
 from sklearn.preprocessing import StandardScaler, MinMaxScaler
 
-from my_ml_toolkit.preprocessing.numeric_prep import NumericPreprocessor
+from my_ml_toolkit.preprocessing.numeric_prep import FrozenPreprocessor, NumericPreprocessor
 
 
 # ---------------------------------------------------------------------------
@@ -196,3 +196,331 @@ class TestPreprocessFull:
         df = sample_df[["age", "category"]].copy()
         X, _ = prep.preprocess_full(df, encode_cat=True)
         assert X["category"].dtype != object
+
+    @pytest.mark.parametrize("method", ["standard", "minmax"])
+    def test_no_column_to_scale(self, sample_df, method):
+        prep = NumericPreprocessor(scaling_method=method)
+        df = sample_df[["category", "label"]]
+        X, y = prep.preprocess_full(df, target_col="label", columns=[], handle_missing=False)
+        assert X.shape == (len(df), 0) and len(y) == len(df)
+        X, _ = prep.preprocess_full(df, columns=[], handle_missing=False, fit=False)
+        assert X.shape == (len(df), 0)
+
+    @pytest.mark.filterwarnings("ignore:Skipping features without any observed values")
+    def test_every_column_dropped_by_imputer(self):
+        df = pd.DataFrame({"empty": [np.nan] * 5})
+        X, _ = NumericPreprocessor().preprocess_full(df)
+        assert X.shape == (5, 0)
+        chunks = list(NumericPreprocessor().fit_stream([df]).transform_stream([df]))
+        assert chunks[0].shape == (5, 0)
+
+
+# ---------------------------------------------------------------------------
+# Apprentissage par blocs
+# ---------------------------------------------------------------------------
+
+def _chunks(df, size):
+    return (df.iloc[start:start + size] for start in range(0, len(df), size))
+
+
+@pytest.fixture
+def numeric_with_nans(sample_df):
+    df = sample_df[["age", "income", "score"]].copy()
+    df.loc[df.index[::7], "income"] = np.nan
+    return df
+
+
+class TestStreamingFit:
+    @pytest.mark.parametrize("method", ["standard", "minmax"])
+    @pytest.mark.parametrize("strategy", ["mean", "most_frequent", "constant"])
+    def test_matches_full_fit(self, numeric_with_nans, method, strategy):
+        full = NumericPreprocessor(scaling_method=method)
+        expected = full.scale_features(full.handle_missing_values(numeric_with_nans, strategy=strategy))
+
+        streamed = NumericPreprocessor(scaling_method=method)
+        streamed.fit_stream(_chunks(numeric_with_nans, 7), strategy=strategy)
+        result = pd.concat(streamed.transform_stream(_chunks(numeric_with_nans, 13)))
+
+        np.testing.assert_allclose(streamed.imputer.statistics_.astype(float),
+                                   full.imputer.statistics_.astype(float))
+        pd.testing.assert_frame_equal(result, expected, rtol=1e-10)
+
+    def test_scaler_attributes(self, sample_df_numeric_only):
+        full = StandardScaler().fit(sample_df_numeric_only)
+        prep = NumericPreprocessor().fit_stream(_chunks(sample_df_numeric_only, 9), handle_missing=False)
+        np.testing.assert_allclose(prep.scaler.mean_, full.mean_)
+        np.testing.assert_allclose(prep.scaler.var_, full.var_)
+        assert prep.scaler.n_samples_seen_ == full.n_samples_seen_
+        assert list(prep.scaler.feature_names_in_) == list(full.feature_names_in_)
+        assert prep.imputer is None
+
+    def test_partial_fit_usable_between_chunks(self, sample_df_numeric_only):
+        prep = NumericPreprocessor()
+        prep.partial_fit(sample_df_numeric_only.iloc[:20])
+        first_mean = prep.scaler.mean_.copy()
+        prep.partial_fit(sample_df_numeric_only.iloc[20:])
+        np.testing.assert_allclose(first_mean, sample_df_numeric_only.iloc[:20].mean())
+        np.testing.assert_allclose(prep.scaler.mean_, sample_df_numeric_only.mean())
+
+    def test_scale_features_fit_false_after_stream(self, sample_df_numeric_only):
+        prep = NumericPreprocessor().fit_stream(_chunks(sample_df_numeric_only, 10))
+        X = prep.scale_features(sample_df_numeric_only, fit=False)
+        np.testing.assert_allclose(X.mean(), 0, atol=1e-10)
+
+    def test_constant_column(self):
+        df = pd.DataFrame({"a": [3.0] * 10, "b": np.arange(10.0)})
+        prep = NumericPreprocessor().fit_stream(_chunks(df, 3))
+        X = pd.concat(prep.transform_stream(_chunks(df, 4)))
+        assert (X["a"] == 0).all()
+
+    @pytest.mark.filterwarnings("ignore:Skipping features without any observed values")
+    @pytest.mark.parametrize("strategy", ["mean", "most_frequent"])
+    def test_all_nan_column_dropped(self, numeric_with_nans, strategy):
+        df = numeric_with_nans.assign(empty=np.nan)
+        full = NumericPreprocessor()
+        expected = full.scale_features(full.handle_missing_values(df, strategy=strategy))
+
+        prep = NumericPreprocessor().fit_stream(_chunks(df, 7), strategy=strategy)
+        result = pd.concat(prep.transform_stream(_chunks(df, 13)))
+        assert list(result.columns) == ["age", "income", "score"]
+        assert list(prep.scaler.feature_names_in_) == ["age", "income", "score"]
+        pd.testing.assert_frame_equal(result, expected, rtol=1e-10)
+
+    def test_column_order_follows_first_chunk(self, sample_df_numeric_only):
+        prep = NumericPreprocessor().fit_stream(_chunks(sample_df_numeric_only, 10))
+        shuffled = sample_df_numeric_only[["f3", "f1", "f2"]]
+        X = next(prep.transform_stream([shuffled]))
+        assert list(X.columns) == ["f1", "f2", "f3"]
+
+    def test_median_not_streamable(self, sample_df_numeric_only):
+        with pytest.raises(ValueError):
+            NumericPreprocessor().fit_stream([sample_df_numeric_only], strategy="median")
+
+    def test_transform_before_fit_raises(self, sample_df_numeric_only):
+        with pytest.raises(ValueError):
+            next(NumericPreprocessor().transform_stream([sample_df_numeric_only]))
+
+    def test_empty_stream_raises(self):
+        with pytest.raises(ValueError):
+            NumericPreprocessor().fit_stream([])
+
+    def test_changed_options_raise(self, sample_df_numeric_only):
+        prep = NumericPreprocessor().partial_fit(sample_df_numeric_only)
+        with pytest.raises(ValueError):
+            prep.partial_fit(sample_df_numeric_only, strategy="constant")
+
+    def test_fit_from_chunked_csv(self, tmp_path, numeric_with_nans):
+        from my_ml_toolkit.data_loader.tabular import TabularLoader
+        path = str(tmp_path / "data.csv")
+        numeric_with_nans.to_csv(path, index=False)
+        loader = TabularLoader()
+        prep = NumericPreprocessor().fit_stream(loader.iter_csv(path, chunksize=8))
+        X = pd.concat(prep.transform_stream(loader.iter_csv(path, chunksize=8)))
+        assert X.isnull().sum().sum() == 0
+        np.testing.assert_allclose(X.mean(), 0, atol=1e-6)
+
+
+# ---------------------------------------------------------------------------
+# preprocess_full : chemin fusionné en place
+# ---------------------------------------------------------------------------
+
+def _unfused(prep, df, target_col=None):
+    """Enchaînement des étapes séparées (une copie par étape)"""
+    X = df.drop(columns=[target_col]) if target_col else df
+    X = prep.encode_categorical(X)
+    X = prep.handle_missing_values(X)
+    return prep.scale_features(X)
+
+
+class TestFusedPreprocess:
+    @pytest.mark.parametrize("method", ["standard", "minmax"])
+    def test_matches_separate_steps(self, sample_df, method):
+        expected = _unfused(NumericPreprocessor(scaling_method=method), sample_df, "label")
+        X, y = NumericPreprocessor(scaling_method=method).preprocess_full(sample_df, target_col="label")
+        pd.testing.assert_frame_equal(X, expected, rtol=1e-10)
+        pd.testing.assert_series_equal(y, sample_df["label"])
+
+    def test_fitted_state_matches(self, sample_df):
+        reference = NumericPreprocessor()
+        _unfused(reference, sample_df)
+        prep = NumericPreprocessor()
+        prep.preprocess_full(sample_df)
+        np.testing.assert_allclose(prep.imputer.statistics_, reference.imputer.statistics_)
+        np.testing.assert_allclose(prep.scaler.mean_, reference.scaler.mean_)
+        np.testing.assert_allclose(prep.scaler.scale_, reference.scaler.scale_)
+        assert prep.label_encoders.keys() == reference.label_encoders.keys()
+        assert prep.scaler.n_samples_seen_ == reference.scaler.n_samples_seen_
+
+    def test_frame_is_view_on_matrix(self, sample_df_numeric_only):
+        X, _ = NumericPreprocessor().preprocess_full(sample_df_numeric_only)
+        values = X.to_numpy()
+        assert np.shares_memory(values, X["f1"].to_numpy())
+        assert values.dtype == np.float64
+
+    def test_input_not_modified(self, sample_df):
+        original = sample_df.copy()
+        NumericPreprocessor().preprocess_full(sample_df)
+        pd.testing.assert_frame_equal(sample_df, original)
+
+    def test_array_output(self, sample_df_numeric_only):
+        X, _ = NumericPreprocessor().preprocess_full(sample_df_numeric_only, as_frame=False)
+        assert isinstance(X, np.ndarray) and X.flags.f_contiguous
+        np.testing.assert_allclose(X.mean(axis=0), 0, atol=1e-10)
+
+    def test_float32(self, sample_df):
+        expected = _unfused(NumericPreprocessor(), sample_df)
+        X, _ = NumericPreprocessor().preprocess_full(sample_df, dtype=np.float32)
+        assert (X.dtypes == np.float32).all()
+        np.testing.assert_allclose(X.to_numpy(), expected.to_numpy(), rtol=1e-4, atol=1e-5)
+
+    def test_imputer_reused_without_fit(self, sample_df):
+        prep = NumericPreprocessor()
+        prep.preprocess_full(sample_df, target_col="label")
+        imputer = prep.imputer
+        prep.preprocess_full(sample_df.iloc[:10], target_col="label", fit=False)
+        assert prep.imputer is imputer
+
+    def test_refit_learns_new_state(self):
+        prep = NumericPreprocessor()
+        prep.preprocess_full(pd.DataFrame({"a": [1.0, np.nan, 3.0], "c": ["x", "y", "x"]}))
+        second = pd.DataFrame({"a": [100.0, np.nan, 300.0], "c": ["u", "v", "u"]})
+        prep.preprocess_full(second)
+        np.testing.assert_allclose(prep.imputer.statistics_, [200.0, 1 / 3])
+        assert list(prep.label_encoders) == ["c"]
+        np.testing.assert_array_equal(prep.categorical.encode("c", second["c"]), [0, 1, 0])
+        np.testing.assert_allclose(prep.scaler.mean_, [200.0, 1 / 3])
+
+    def test_nullable_dtype(self):
+        df = pd.DataFrame({"a": pd.array([1, None, 3], dtype="Int64"), "b": [1.0, 2.0, 3.0]})
+        X, _ = NumericPreprocessor().preprocess_full(df)
+        assert X.isnull().sum().sum() == 0
+
+    def test_peak_memory_about_one_matrix(self):
+        import tracemalloc
+        rng = np.random.default_rng(0)
+        values = rng.normal(size=(50_000, 40))
+        values[rng.random(values.shape) < 0.05] = np.nan
+        df = pd.DataFrame(values, columns=[f"f{i}" for i in range(40)])
+        matrix_bytes = values.nbytes
+
+        tracemalloc.start()
+        X, _ = NumericPreprocessor().preprocess_full(df)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        # Sortie + temporaires de la taille d'une colonne
+        assert peak < 1.3 * matrix_bytes
+
+
+# ---------------------------------------------------------------------------
+# État figé : transform sans réapprentissage
+# ---------------------------------------------------------------------------
+
+def _frozen(df, target_col="label"):
+    prep = NumericPreprocessor()
+    columns = [col for col in df.columns if col != target_col]
+    X, _ = prep.preprocess_full(df, columns=columns)
+    return prep, prep.freeze(columns), X
+
+
+class TestFrozenPreprocessor:
+    def test_transform_matches_fit_output(self, sample_df):
+        _, frozen, X = _frozen(sample_df)
+        pd.testing.assert_frame_equal(frozen.transform(sample_df), X)
+
+    def test_transform_reuses_training_statistics(self, sample_df):
+        _, frozen, _ = _frozen(sample_df)
+        scaler = frozen.preprocessor.scaler
+        mean = scaler.mean_.copy()
+        shifted = sample_df.assign(income=sample_df["income"] + 1e6)
+        X = frozen.transform(shifted.head(3))
+        assert frozen.preprocessor.scaler is scaler
+        np.testing.assert_array_equal(scaler.mean_, mean)
+        # Statistiques de l'apprentissage : la colonne décalée n'est pas recentrée
+        assert (X["income"] > 10).all()
+
+    def test_single_row(self, sample_df):
+        _, frozen, X = _frozen(sample_df)
+        row = frozen.transform(sample_df.iloc[[5]])
+        pd.testing.assert_frame_equal(row, X.iloc[[5]])
+
+    def test_missing_values_use_training_means(self, sample_df):
+        _, frozen, _ = _frozen(sample_df)
+        row = sample_df.iloc[[0]].assign(score=np.nan)
+        X = frozen.transform(row)
+        # Moyenne d'apprentissage imputée puis centrée : 0
+        assert X["score"].iloc[0] == pytest.approx(0.0, abs=1e-12)
+
+    def test_extra_columns_ignored(self, sample_df):
+        _, frozen, X = _frozen(sample_df)
+        extended = sample_df.assign(filename="a.exe")
+        pd.testing.assert_frame_equal(frozen.transform(extended), X)
+
+    def test_missing_column_raises(self, sample_df):
+        _, frozen, _ = _frozen(sample_df)
+        with pytest.raises(ValueError):
+            frozen.transform(sample_df.drop(columns=["income"]))
+
+    def test_unseen_categorical_column_raises(self, sample_df_numeric_only):
+        prep = NumericPreprocessor()
+        prep.preprocess_full(sample_df_numeric_only)
+        with pytest.raises(ValueError):
+            prep.preprocess_full(sample_df_numeric_only.assign(f1="x"), fit=False)
+
+    def test_independent_of_later_fit(self, sample_df):
+        prep, frozen, X = _frozen(sample_df)
+        prep.preprocess_full(sample_df.assign(income=sample_df["income"] * 3), target_col="label")
+        pd.testing.assert_frame_equal(frozen.transform(sample_df), X)
+
+    def test_is_immutable(self, sample_df):
+        _, frozen, _ = _frozen(sample_df)
+        with pytest.raises(AttributeError):
+            frozen.columns = ("age",)
+
+    def test_unfitted_raises(self, sample_df_numeric_only):
+        with pytest.raises(ValueError):
+            NumericPreprocessor().preprocess_full(sample_df_numeric_only, fit=False)
+        with pytest.raises(ValueError):
+            NumericPreprocessor().preprocess_full(sample_df_numeric_only, handle_missing=False, fit=False)
+
+    def test_pickle_roundtrip(self, sample_df):
+        import pickle
+        _, frozen, X = _frozen(sample_df)
+        restored = pickle.loads(pickle.dumps(frozen))
+        assert isinstance(restored, FrozenPreprocessor)
+        assert restored.columns == frozen.columns
+        pd.testing.assert_frame_equal(restored.transform(sample_df), X)
+
+
+# ---------------------------------------------------------------------------
+# Précision float32
+# ---------------------------------------------------------------------------
+
+class TestFloat32Mode:
+    def test_invalid_dtype_raises(self):
+        with pytest.raises(ValueError):
+            NumericPreprocessor(dtype="float16")
+
+    def test_preprocess_full_defaults_to_preprocessor_dtype(self, sample_df):
+        prep = NumericPreprocessor(dtype="float32")
+        X, _ = prep.preprocess_full(sample_df, target_col="label")
+        assert (X.dtypes == np.float32).all()
+        assert prep.scaler.mean_.dtype == np.float32 and prep.scaler.scale_.dtype == np.float32
+        expected, _ = NumericPreprocessor().preprocess_full(sample_df, target_col="label")
+        np.testing.assert_allclose(X.to_numpy(), expected.to_numpy(), rtol=1e-4, atol=1e-5)
+
+    def test_separate_steps(self, sample_df):
+        prep = NumericPreprocessor(dtype="float32")
+        X = prep.handle_missing_values(sample_df[["age", "income", "score"]])
+        assert (X.dtypes == np.float32).all()
+        assert (prep.scale_features(X).dtypes == np.float32).all()
+
+    def test_stream(self, numeric_with_nans):
+        prep = NumericPreprocessor(dtype="float32").fit_stream(_chunks(numeric_with_nans, 10))
+        X = pd.concat(prep.transform_stream(_chunks(numeric_with_nans, 10)))
+        assert (X.dtypes == np.float32).all()
+        np.testing.assert_allclose(X.mean(), 0, atol=1e-5)
+
+    def test_float64_mode_unchanged(self, sample_df_numeric_only):
+        df = sample_df_numeric_only.astype(np.float32)
+        X = NumericPreprocessor().scale_features(df)
+        assert (X.dtypes == np.float32).all()
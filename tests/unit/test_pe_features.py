@@ -0,0 +1,186 @@
+"""
+Tests unitaires pour PEFileFeatureExtractor, PEHeaderReader et les features par section.
+"""
+
+import sys
+
+import numpy as np
+import pytest
+
+from my_ml_toolkit.feature_extraction.binary_features import BinaryFeatureExtractor, PEFileFeatureExtractor
+from my_ml_toolkit.feature_extraction.pe_header import PEFormatError, PEHeaderReader
+from my_ml_toolkit.feature_extraction.pe_sections import EMPTY_SECTION_FEATURES
+from tests.conftest import build_pe
+
+
+@pytest.fixture
+def struct_extractor(monkeypatch):
+    """Extracteur forcé sur le lecteur struct (comme sans pefile)."""
+    monkeypatch.setitem(sys.modules, "pefile", None)
+    return PEFileFeatureExtractor()
+
+
+# ---------------------------------------------------------------------------
+# PEHeaderReader
+# ---------------------------------------------------------------------------
+
+class TestPEHeaderReader:
+    def test_headers(self, binary_pe):
+        reader = PEHeaderReader(binary_pe)
+        assert reader.machine == 0x14C
+        assert reader.num_sections == 3
+        assert reader.timestamp == 0x5F000000
+        assert not reader.is_64bit
+        assert reader.entry_point == 0x1000
+
+    def test_sections(self, binary_pe):
+        sections = PEHeaderReader(binary_pe).sections
+        assert [s.name for s in sections] == [".text", ".data", ".idata"]
+        assert sections[1].raw_offset == 0x400
+        assert sections[1].raw_size == 0x200
+
+    def test_rva_to_offset(self, binary_pe):
+        reader = PEHeaderReader(binary_pe)
+        assert reader.rva_to_offset(0x2010) == 0x410
+        assert reader.rva_to_offset(0x40) == 0x40
+        assert reader.rva_to_offset(0x9000) is None
+
+    def test_directories_on_demand(self, binary_pe):
+        reader = PEHeaderReader(binary_pe)
+        assert reader._import_dlls is None
+        assert reader.import_dlls() == ["KERNEL32.dll", "ws2_32.dll"]
+        assert reader.export_count() == 0
+        assert not reader.has_debug()
+
+    def test_accepts_memoryview(self, binary_pe):
+        assert PEHeaderReader(memoryview(binary_pe)).num_sections == 3
+
+    @pytest.mark.parametrize("data", [b"", b"MZ" + b"\x00" * 10, b"ELF" + b"\x00" * 100])
+    def test_not_a_pe(self, data):
+        with pytest.raises(PEFormatError):
+            PEHeaderReader(data)
+
+    def test_truncated_headers(self, binary_pe):
+        with pytest.raises(PEFormatError):
+            PEHeaderReader(binary_pe[:0x60])
+
+    def test_bogus_section_count_is_capped(self, binary_pe):
+        data = bytearray(binary_pe)
+        data[0x46:0x48] = (0xFFFF).to_bytes(2, "little")
+        reader = PEHeaderReader(bytes(data))
+        assert len(reader.sections) <= 96
+
+
+# ---------------------------------------------------------------------------
+# PEFileFeatureExtractor
+# ---------------------------------------------------------------------------
+
+class TestPEFileFeatureExtractor:
+    def test_struct_fallback_without_pefile(self, struct_extractor, binary_pe, capsys):
+        assert not struct_extractor.pe_available
+        features = struct_extractor.extract_pe_features(binary_pe)
+        assert "Warning" not in capsys.readouterr().out
+        assert features["pe_num_sections"] == 3
+        assert features["pe_num_imports"] == 2
+        assert features["pe_imports_ws2_32.dll"] == 1
+        assert features["pe_parse_truncated"] == 0
+
+    def test_pefile_matches_struct(self, binary_pe):
+        pytest.importorskip("pefile")
+        fallback = PEFileFeatureExtractor()
+        fallback.pe_available = False
+        expected = fallback.extract_pe_features(binary_pe)
+        assert PEFileFeatureExtractor(fast=True).extract_pe_features(binary_pe) == expected
+        assert PEFileFeatureExtractor(fast=False).extract_pe_features(binary_pe) == expected
+
+    def test_non_pe_returns_empty(self, binary_malware, binary_elf, capsys):
+        extractor = PEFileFeatureExtractor()
+        assert extractor.extract_pe_features(binary_malware) == {}
+        assert extractor.extract_pe_features(binary_elf) == {}
+        assert capsys.readouterr().out == ""
+
+    def test_malformed_pe_returns_empty(self, struct_extractor, binary_benign, capsys):
+        assert struct_extractor.extract_pe_features(binary_benign) == {}
+        assert "Erreur extraction PE" in capsys.readouterr().out
+
+    def test_timeout_skips_directories(self, struct_extractor, binary_pe):
+        struct_extractor.timeout = -1.0
+        features = struct_extractor.extract_pe_features(binary_pe)
+        assert features["pe_parse_truncated"] == 1
+        assert features["pe_num_imports"] == 0
+        assert features["pe_num_sections"] == 3
+
+    def test_timeout_with_pefile(self, binary_pe):
+        pytest.importorskip("pefile")
+        features = PEFileFeatureExtractor(timeout=-1.0).extract_pe_features(binary_pe)
+        assert features["pe_parse_truncated"] == 1
+        assert features["pe_num_imports"] == 0
+
+    def test_size_cap(self, struct_extractor):
+        data = build_pe() + b"\x00" * 10_000
+        struct_extractor.max_bytes = 0x600
+        features = struct_extractor.extract_pe_features(data)
+        # La section .idata est au-delà du plafond : imports invisibles
+        assert features["pe_num_sections"] == 3
+        assert features["pe_num_imports"] == 0
+
+    def test_no_suspicious_dll(self, struct_extractor):
+        features = struct_extractor.extract_pe_features(build_pe(dlls=("KERNEL32.dll",)))
+        assert not any(key.startswith("pe_imports_") for key in features)
+
+
+# ---------------------------------------------------------------------------
+# Features par section
+# ---------------------------------------------------------------------------
+
+def _random_bytes(size: int, seed: int = 0) -> bytes:
+    return np.random.default_rng(seed).integers(0, 256, size, dtype=np.uint8).tobytes()
+
+
+class TestSectionFeatures:
+    def test_plain_pe(self, binary_pe):
+        features = PEFileFeatureExtractor().extract_section_features(binary_pe)
+        assert features["num_sections"] == 3
+        assert features["num_executable_sections"] == 1
+        assert features["code_section_entropy"] == 0.0          # .text = NOP + zéros
+        assert features["is_packed"] == 0
+        assert features["executable_size_ratio"] == pytest.approx(0x200 / len(binary_pe))
+        assert features["section_raw_virtual_ratio_min"] == 1.0
+
+    def test_section_entropy_matches_slice(self):
+        text = _random_bytes(0x200)
+        data = build_pe(text=text)
+        features = PEFileFeatureExtractor().extract_section_features(data)
+        expected = BinaryFeatureExtractor()._calculate_entropy(np.frombuffer(text, dtype=np.uint8))
+        assert features["code_section_entropy"] == pytest.approx(expected)
+        assert features["section_entropy_max"] == pytest.approx(expected)
+        assert features["is_packed"] == 1
+
+    def test_packer_section_name(self):
+        data = bytearray(build_pe())
+        section_table = 0x58 + 0xE0
+        data[section_table:section_table + 8] = b"UPX0\x00\x00\x00\x00"
+        features = PEFileFeatureExtractor().extract_section_features(bytes(data))
+        assert features["is_packed"] == 1
+
+    def test_non_pe_gives_zeros(self, binary_malware):
+        features = PEFileFeatureExtractor().extract_section_features(binary_malware)
+        assert features == EMPTY_SECTION_FEATURES
+
+    def test_sections_beyond_file_are_clipped(self, binary_pe):
+        features = PEFileFeatureExtractor().extract_section_features(binary_pe[:0x500])
+        assert features["num_sections"] == 3
+        assert features["executable_size_ratio"] == pytest.approx(0x200 / 0x500)
+
+    def test_extractor_block_and_streaming(self):
+        data = build_pe(text=_random_bytes(0x200, seed=1))
+        extractor = BinaryFeatureExtractor(include_pe_sections=True)
+        features = extractor.extract_all_features(data)
+        assert list(features)[-len(EMPTY_SECTION_FEATURES):] == list(EMPTY_SECTION_FEATURES)
+        chunks = [data[i:i + 97] for i in range(0, len(data), 97)]
+        assert extractor.extract_stream(chunks) == features
+
+    def test_fixed_schema_across_files(self, binary_pe, binary_benign):
+        extractor = BinaryFeatureExtractor(include_pe_sections=True)
+        assert list(extractor.extract_all_features(binary_pe)) == \
+            list(extractor.extract_all_features(binary_benign))
@@ -0,0 +1,176 @@
+"""
+Tests unitaires pour la lecture anticipée (PrefetchReader) et l'extraction
+alimentée par ses lectures (iter_prefetch_batch).
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from my_ml_toolkit.data_loader.binary import BinaryLoader
+from my_ml_toolkit.data_loader.prefetch import ByteBudget, IngestionStats, PrefetchReader
+from my_ml_toolkit.feature_extraction.binary_features import BinaryFeatureExtractor
+
+
+@pytest.fixture
+def sample_paths(tmp_path):
+    paths = []
+    for i in range(20):
+        path = tmp_path / f"sample_{i:02d}.bin"
+        path.write_bytes(bytes([i]) * (1000 + 100 * i))
+        paths.append(str(path))
+    return paths
+
+
+class SlowLoader(BinaryLoader):
+    """Lectures avec latence (stockage réseau simulé) et suivi de la concurrence"""
+
+    def __init__(self, delay=0.02, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def load_file(self, filepath, mmap=False):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            return super().load_file(filepath, mmap=mmap)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+# ---------------------------------------------------------------------------
+# ByteBudget / IngestionStats
+# ---------------------------------------------------------------------------
+
+class TestByteBudget:
+    def test_oversized_item_accepted_when_empty(self):
+        budget = ByteBudget(10)
+        assert budget.acquire(100)
+        assert budget.used == 100
+
+    def test_blocks_until_release(self):
+        budget = ByteBudget(10)
+        budget.acquire(8)
+        acquired = threading.Event()
+        thread = threading.Thread(target=lambda: budget.acquire(5) and acquired.set())
+        thread.start()
+        assert not acquired.wait(0.05)
+        budget.release(8)
+        assert acquired.wait(1)
+        thread.join()
+
+    def test_close_unblocks(self):
+        budget = ByteBudget(10)
+        budget.acquire(10)
+        results = []
+        thread = threading.Thread(target=lambda: results.append(budget.acquire(5)))
+        thread.start()
+        budget.close()
+        thread.join(1)
+        assert results == [False]
+
+    def test_stats_track_peak(self):
+        stats = IngestionStats()
+        budget = ByteBudget(100, stats=stats)
+        budget.acquire(40)
+        budget.acquire(50)
+        budget.release(90)
+        assert stats.buffered_bytes == 0 and stats.max_buffered_bytes == 90
+
+
+# ---------------------------------------------------------------------------
+# PrefetchReader
+# ---------------------------------------------------------------------------
+
+class TestPrefetchReader:
+    def test_files_in_order(self, sample_paths):
+        files = list(PrefetchReader(max_in_flight=4).iter_files(sample_paths))
+        assert [path for path, _ in files] == sample_paths
+        for path, data in files:
+            with open(path, "rb") as f:
+                assert data == f.read()
+
+    def test_reads_overlap(self, sample_paths):
+        loader = SlowLoader()
+        list(PrefetchReader(loader, max_in_flight=4).iter_files(sample_paths))
+        assert loader.peak > 1
+
+    def test_buffered_bytes_bounded(self, sample_paths):
+        budget = 5000
+        reader = PrefetchReader(SlowLoader(delay=0.001), max_in_flight=8, max_buffered_bytes=budget)
+        for _ in reader.iter_files(sample_paths):
+            time.sleep(0.002)
+        # Au plus un fichier (≤ 2900 bytes) peut dépasser le budget, quand il est seul retenu
+        assert reader.stats.max_buffered_bytes <= budget
+        assert reader.stats.buffered_bytes == 0
+
+    def test_counters(self, sample_paths):
+        reader = PrefetchReader(max_in_flight=3)
+        list(reader.iter_files(sample_paths))
+        stats = reader.stats.snapshot()
+        assert stats["files_read"] == len(sample_paths)
+        assert stats["bytes_read"] == sum(os.path.getsize(p) for p in sample_paths)
+        assert 1 <= stats["max_in_flight"] <= 3
+        assert stats["max_queue_depth"] >= 1
+        assert stats["bytes_per_second"] > 0
+        assert stats["in_flight"] == 0
+
+    def test_binary_entries_skip_stat(self, tmp_binary_dir):
+        entries = list(BinaryLoader().iter_directory(tmp_binary_dir, read=False))
+        files = list(PrefetchReader().iter_files(entries))
+        assert [path for path, _ in files] == [entry.path for entry in entries]
+
+    def test_max_bytes_respected(self, sample_paths):
+        files = list(PrefetchReader(BinaryLoader(max_bytes=10)).iter_files(sample_paths))
+        assert all(len(data) == 10 for _, data in files)
+
+    def test_errors_reported(self, sample_paths, tmp_path):
+        errors = []
+        paths = [sample_paths[0], str(tmp_path / "missing.bin"), sample_paths[1]]
+        reader = PrefetchReader()
+        files = list(reader.iter_files(paths, on_error=lambda p, e: errors.append(p)))
+        assert [path for path, _ in files] == [sample_paths[0], sample_paths[1]]
+        assert errors == [paths[1]] and reader.stats.read_errors == 1
+
+    def test_early_stop_releases_threads(self, sample_paths):
+        reader = PrefetchReader(SlowLoader(delay=0.001), max_in_flight=2, max_buffered_bytes=3000)
+        files = reader.iter_files(sample_paths)
+        next(files)
+        files.close()
+        assert not any(t.name == "prefetch-producer" for t in threading.enumerate())
+
+
+# ---------------------------------------------------------------------------
+# Extraction alimentée par les lectures anticipées
+# ---------------------------------------------------------------------------
+
+class TestPrefetchExtraction:
+    def test_matches_iter_batch(self, tmp_binary_dir):
+        paths = sorted(os.path.join(tmp_binary_dir, n) for n in os.listdir(tmp_binary_dir))
+        extractor = BinaryFeatureExtractor()
+        assert list(extractor.iter_prefetch_batch(paths)) == list(extractor.iter_batch(paths))
+
+    def test_parallel_matches_serial(self, sample_paths):
+        extractor = BinaryFeatureExtractor()
+        reader = PrefetchReader(max_in_flight=4, max_buffered_bytes=8000)
+        parallel = list(extractor.iter_prefetch_batch(sample_paths, n_jobs=2, reader=reader))
+        assert parallel == list(extractor.iter_prefetch_batch(sample_paths))
+        assert reader.stats.files_extracted == len(sample_paths)
+        assert reader.stats.buffered_bytes == 0 and reader.stats.extracting == 0
+
+    def test_errors_reported(self, sample_paths, tmp_path):
+        errors = []
+        paths = sample_paths[:2] + [str(tmp_path / "missing.bin")]
+        results = list(BinaryFeatureExtractor().iter_prefetch_batch(
+            paths, on_error=lambda p, e: errors.append((p, e))
+        ))
+        assert [path for path, _ in results] == sample_paths[:2]
+        assert errors[0][0] == paths[2] and "FileNotFoundError" in errors[0][1]
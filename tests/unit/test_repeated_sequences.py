@@ -0,0 +1,101 @@
+"""
+Tests unitaires pour RepeatedSequenceCounter.
+"""
+
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from my_ml_toolkit.feature_extraction.repeated_sequences import RepeatedSequenceCounter
+
+
+def _as_array(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+def _reference(data: bytes, length: int, aligned: bool, min_repeats: int = 3) -> dict:
+    step = length if aligned else 1
+    counts = Counter(data[i:i + length] for i in range(0, len(data) - length + 1, step))
+    repeated = [c for c in counts.values() if c >= min_repeats]
+    total = sum(counts.values())
+    return {
+        'distinct': len(repeated),
+        'max_count': max(counts.values(), default=0),
+        'coverage': sum(repeated) / total if total else 0.0,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Comptage
+# ---------------------------------------------------------------------------
+
+class TestRepeatedSequenceCounter:
+    @pytest.mark.parametrize("length", [1, 2, 3, 4, 5, 8])
+    @pytest.mark.parametrize("aligned", [True, False])
+    def test_matches_dict_reference(self, binary_malware, length, aligned):
+        counter = RepeatedSequenceCounter(lengths=(length,), aligned=aligned)
+        features = counter.extract_features(_as_array(binary_malware))
+        expected = _reference(binary_malware, length, aligned)
+        assert features['repeated_sequences'] == expected['distinct']
+        assert features[f'repeat{length}_max_count'] == expected['max_count']
+        assert features[f'repeat{length}_coverage'] == pytest.approx(expected['coverage'])
+
+    def test_small_blocks_identical(self, binary_benign):
+        data = _as_array(binary_benign)
+        for aligned in (True, False):
+            reference = RepeatedSequenceCounter(lengths=(3, 4), aligned=aligned)
+            blocked = RepeatedSequenceCounter(lengths=(3, 4), aligned=aligned, block_size=10)
+            assert blocked.extract_features(data) == reference.extract_features(data)
+
+    @pytest.mark.parametrize("length", [2, 3, 5])
+    @pytest.mark.parametrize("aligned", [True, False])
+    def test_merged_tables_match_reference(self, length, aligned):
+        # Assez de séquences distinctes pour plusieurs fusions de tables
+        data = np.random.default_rng(length).integers(0, 24, 400_000, dtype=np.uint8).tobytes()
+        counter = RepeatedSequenceCounter(lengths=(length,), aligned=aligned, block_size=4096)
+        features = counter.extract_features(_as_array(data))
+        expected = _reference(data, length, aligned)
+        assert features['repeated_sequences'] == expected['distinct']
+        assert features[f'repeat{length}_max_count'] == expected['max_count']
+        assert features[f'repeat{length}_coverage'] == pytest.approx(expected['coverage'])
+
+    def test_multiple_lengths_in_one_call(self):
+        data = _as_array(b"ABCDEFGH" * 50)
+        counter = RepeatedSequenceCounter(lengths=(2, 4, 8))
+        features = counter.extract_features(data)
+        assert list(features) == counter.feature_names
+        assert features['repeat8_distinct'] == 1
+        assert features['repeat8_max_count'] == 50
+        assert features['repeat8_coverage'] == 1.0
+        assert features['repeated_sequences'] == (
+            features['repeat2_distinct'] + features['repeat4_distinct'] + features['repeat8_distinct']
+        )
+
+    def test_random_data_has_no_repeats(self):
+        data = np.random.default_rng(0).integers(0, 256, 4000, dtype=np.uint8)
+        features = RepeatedSequenceCounter().extract_features(data)
+        assert features['repeated_sequences'] == 0
+        assert features['repeat4_coverage'] == 0.0
+
+    def test_empty_and_short_inputs(self):
+        counter = RepeatedSequenceCounter()
+        for data in (b"", b"abc"):
+            features = counter.extract_features(_as_array(data))
+            assert features == {'repeated_sequences': 0, 'repeat4_max_count': 0, 'repeat4_coverage': 0.0}
+
+    def test_chunked_accumulator_identical(self, binary_malware):
+        data = _as_array(binary_malware)
+        for aligned in (True, False):
+            counter = RepeatedSequenceCounter(lengths=(3, 4, 8), aligned=aligned)
+            accumulator = counter.accumulator()
+            for start in range(0, len(data), 5):
+                accumulator.update(data[start:start + 5])
+            assert accumulator.result() == counter.extract_features(data)
+
+    @pytest.mark.parametrize("kwargs", [
+        {'lengths': ()}, {'lengths': (0,)}, {'lengths': (9,)}, {'lengths': (4, 4)}, {'min_repeats': 1},
+    ])
+    def test_invalid_parameters(self, kwargs):
+        with pytest.raises(ValueError):
+            RepeatedSequenceCounter(**kwargs)
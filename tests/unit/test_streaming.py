@@ -0,0 +1,94 @@
+"""
+Tests unitaires pour l'extraction en streaming (BinaryFeatureStream).
+"""
+
+import numpy as np
+import pytest
+
+from my_ml_toolkit.data_loader.binary import BinaryLoader
+from my_ml_toolkit.feature_extraction.binary_features import BinaryFeatureExtractor
+
+
+def _chunks(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.fixture
+def large_mixed():
+    """Fichier de ~1.2 MB : en-tête PE, zone texte, zone aléatoire, padding."""
+    rng = np.random.default_rng(3)
+    return (
+        b"MZ" + b"\x00" * 300
+        + b"Normal executable code " * 2000
+        + rng.integers(0, 256, size=1_100_000, dtype=np.uint8).tobytes()
+        + b"\x90" * 4097
+    )
+
+
+# ---------------------------------------------------------------------------
+# Équivalence avec le chemin en mémoire
+# ---------------------------------------------------------------------------
+
+class TestStreamEquivalence:
+    @pytest.mark.parametrize("chunk_size", [1, 3, 255, 4096])
+    def test_small_chunks_identical(self, binary_benign, chunk_size):
+        extractor = BinaryFeatureExtractor()
+        expected = extractor.extract_all_features(binary_benign)
+        streamed = extractor.extract_stream(_chunks(binary_benign, chunk_size))
+        assert streamed == expected
+        assert list(streamed) == list(expected)
+
+    @pytest.mark.parametrize("chunk_size", [1000, 65536, 1 << 20])
+    def test_large_file_identical(self, large_mixed, chunk_size):
+        extractor = BinaryFeatureExtractor()
+        expected = extractor.extract_all_features(large_mixed)
+        assert extractor.extract_stream(_chunks(large_mixed, chunk_size)) == expected
+
+    def test_overlapping_windows_and_trigrams(self, large_mixed):
+        extractor = BinaryFeatureExtractor(ngram_size=3, entropy_window=200, entropy_step=70)
+        expected = extractor.extract_all_features(large_mixed)
+        assert extractor.extract_stream(_chunks(large_mixed, 9999)) == expected
+
+    @pytest.mark.parametrize("step", [300, 1000])
+    @pytest.mark.parametrize("chunk_size", [1, 97, 4099])
+    def test_step_larger_than_window(self, large_mixed, step, chunk_size):
+        data = large_mixed[40_000:60_000]  # transition texte -> aléatoire
+        extractor = BinaryFeatureExtractor(entropy_window=256, entropy_step=step)
+        expected = extractor.extract_all_features(data)
+        assert extractor.extract_stream(_chunks(data, chunk_size)) == expected
+
+    def test_without_ngrams(self, binary_malware):
+        extractor = BinaryFeatureExtractor(include_ngrams=False)
+        expected = extractor.extract_all_features(binary_malware)
+        assert extractor.extract_stream(_chunks(binary_malware, 100)) == expected
+
+    def test_empty_stream(self):
+        extractor = BinaryFeatureExtractor()
+        assert extractor.extract_stream([]) == extractor.extract_all_features(b"")
+
+    @pytest.mark.parametrize("aligned", [True, False])
+    def test_multiple_sequence_lengths_identical(self, binary_malware, aligned):
+        extractor = BinaryFeatureExtractor(sequence_lengths=(3, 4, 8), sequence_aligned=aligned)
+        expected = extractor.extract_all_features(binary_malware)
+        assert extractor.extract_stream(_chunks(binary_malware, 7)) == expected
+
+
+# ---------------------------------------------------------------------------
+# BinaryLoader.iter_chunks
+# ---------------------------------------------------------------------------
+
+class TestIterChunks:
+    def test_chunks_reassemble_file(self, tmp_binary_file, binary_benign):
+        chunks = list(BinaryLoader().iter_chunks(tmp_binary_file, chunk_size=64))
+        assert b"".join(chunks) == binary_benign
+        assert all(len(c) <= 64 for c in chunks)
+
+    def test_max_bytes_respected(self, tmp_binary_file):
+        chunks = list(BinaryLoader(max_bytes=100).iter_chunks(tmp_binary_file, chunk_size=64))
+        assert sum(len(c) for c in chunks) == 100
+
+    def test_stream_from_file(self, tmp_binary_file, binary_benign):
+        loader = BinaryLoader()
+        extractor = BinaryFeatureExtractor()
+        features = extractor.extract_stream(loader.iter_chunks(tmp_binary_file, chunk_size=50))
+        assert features == extractor.extract_all_features(binary_benign)
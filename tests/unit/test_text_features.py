@@ -167,3 +167,12 @@ class TestTfIdf:
         extractor.fit_tfidf(sample_texts)
         result = extractor.transform_tfidf([sample_texts[0]])
         assert result.shape[0] == 1
+
+    def test_float32_vectors(self, sample_texts):
+        extractor = TextFeatureExtractor(max_features=50, dtype="float32")
+        extractor.fit_tfidf(sample_texts)
+        result = extractor.transform_tfidf(sample_texts)
+        reference = TextFeatureExtractor(max_features=50)
+        reference.fit_tfidf(sample_texts)
+        assert result.dtype == np.float32
+        np.testing.assert_allclose(result, reference.transform_tfidf(sample_texts), atol=1e-6)